@@ -3,6 +3,7 @@ Base settings to build other settings files upon.
 """
 
 import environ
+from celery.schedules import crontab
 
 ROOT_DIR = (environ.Path(__file__) - 3)  # (read_comics/config/settings/base.py - 3 = read_comics/)
 APPS_DIR = ROOT_DIR.path("read_comics")
@@ -94,6 +95,10 @@ LOCAL_APPS = [
     # Your stuff: custom apps go here
     "read_comics.publishers.apps.PublishersConfig",
     "read_comics.people.apps.PeopleConfig",
+    "read_comics.characters.apps.CharactersConfig",
+    "read_comics.sync.apps.SyncConfig",
+    "read_comics.search.apps.SearchConfig",
+    "read_comics.images.apps.ImagesConfig",
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS + ["django_cleanup.apps.CleanupConfig"]
@@ -152,7 +157,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     'django_magnificent_messages.middleware.MessageMiddleware',
     'users.middleware.LastActiveMiddleware',
-    'watson.middleware.SearchContextMiddleware',
+    'read_comics.search.middleware.SearchContextMiddleware',
 ]
 
 # STATIC
@@ -331,6 +336,26 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 CELERY_TASK_SOFT_TIME_LIMIT = 60
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# http://docs.celeryproject.org/en/latest/userguide/periodic-tasks.html#beat-entries
+CELERY_BEAT_SCHEDULE = {
+    "comicvine-incremental-sync": {
+        "task": "read_comics.sync.tasks.start_sync",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    "comicvine-reconcile": {
+        "task": "read_comics.sync.tasks.reconcile_all",
+        "schedule": crontab(hour=4, minute=0, day_of_week="sunday"),
+    },
+    # Safety net for flushes lost with dead workers
+    "search-index-flush": {
+        "task": "read_comics.search.tasks.flush_search_index",
+        "schedule": crontab(minute="*/5"),
+    },
+    "image-proxy-evict": {
+        "task": "read_comics.images.tasks.evict_images",
+        "schedule": crontab(minute=30),
+    },
+}
 
 # django-allauth
 # ------------------------------------------------------------------------------
@@ -388,3 +413,60 @@ SOCIALACCOUNT_PROVIDERS = {
 # Your stuff...
 
 LAST_ACTIVE_TIMEOUT = int(env("LAST_ACTIVE_TIMEOUT", default=60))
+
+# Comicvine
+# ------------------------------------------------------------------------------
+COMICVINE_API_URL = env("COMICVINE_API_URL", default="https://comicvine.gamespot.com/api/")
+COMICVINE_API_KEY = env("COMICVINE_API_KEY", default="")
+# Comicvine returns naive datetimes in its server time zone
+COMICVINE_TIME_ZONE = "America/Los_Angeles"
+COMICVINE_PAGE_SIZE = 100
+# Upstream quota is per resource per hour
+COMICVINE_REQUESTS_PER_HOUR = int(env("COMICVINE_REQUESTS_PER_HOUR", default=200))
+COMICVINE_CONCURRENCY = int(env("COMICVINE_CONCURRENCY", default=4))
+# Failed requests are retried after 1, 2, 4... seconds
+COMICVINE_RETRIES = 3
+COMICVINE_RETRY_BACKOFF = 1.0
+# Fetched pages are written to database in batches of this size
+COMICVINE_WRITE_BATCH_SIZE = 500
+# Parallel sync splits upstream listing into shards of this many entities (multiple of page size)
+COMICVINE_SHARD_SIZE = 10000
+# Sync tasks run much longer than regular ones
+COMICVINE_SYNC_TIME_LIMIT = int(env("COMICVINE_SYNC_TIME_LIMIT", default=6 * 60 * 60))
+# Reconciliation refuses to soft delete larger share of rows, as upstream listing is likely broken then
+COMICVINE_TOMBSTONE_MAX_RATIO = 0.05
+
+# Search
+# ------------------------------------------------------------------------------
+# "sync" updates search entries right after save, "deferred" queues them for Celery worker
+SEARCH_INDEX_MODE = env("SEARCH_INDEX_MODE", default="sync")
+# Seconds to collect queued updates before flushing them in one batch
+SEARCH_INDEX_FLUSH_DELAY = 10
+# Search results cache, invalidated by per-model generation counters
+SEARCH_CACHE_ALIAS = "default"
+SEARCH_CACHE_TTL = int(env("SEARCH_CACHE_TTL", default=10 * 60))
+# Relative weights of matches in search entry fields for weighted ranking
+SEARCH_RANK_WEIGHTS = {"title": 1.0, "description": 0.4, "content": 0.1}
+
+# Images
+# ------------------------------------------------------------------------------
+# Uploaded and fetched images with more pixels are refused before decoding
+IMAGE_MAX_PIXELS = 40 * 1000 * 1000
+# Uploaded image files larger than this are refused before they are stored
+IMAGE_MAX_UPLOAD_BYTES = int(env("IMAGE_MAX_UPLOAD_BYTES", default=10 * 1024 ** 2))
+# Remote images are proxied only from these hosts
+IMAGE_PROXY_ALLOWED_HOSTS = env.list("IMAGE_PROXY_ALLOWED_HOSTS",
+                                     default=["comicvine.gamespot.com", "static.comicvine.com"])
+# Widths of stored copies, requested width is rounded up to one of them
+IMAGE_PROXY_WIDTHS = (100, 200, 400, 800)
+# Stored copies size cap, least recently used images are evicted above it
+IMAGE_PROXY_MAX_BYTES = int(env("IMAGE_PROXY_MAX_BYTES", default=5 * 1024 ** 3))
+IMAGE_PROXY_MAX_SOURCE_BYTES = 20 * 1024 ** 2
+IMAGE_PROXY_TIMEOUT = 30
+IMAGE_PROXY_MAX_AGE = 30 * 24 * 60 * 60
+
+# MongoDB
+# ------------------------------------------------------------------------------
+# Raw Comicvine documents staging. Staging is off if url is empty
+MONGODB_URL = env("MONGODB_URL", default="")
+MONGODB_DATABASE = env("MONGODB_DATABASE", default="read_comics")
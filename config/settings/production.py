@@ -191,3 +191,5 @@ LOGGING = {
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Search entries are refreshed by Celery worker, so bulk writes don't index inline
+SEARCH_INDEX_MODE = env("SEARCH_INDEX_MODE", default="deferred")
@@ -49,3 +49,9 @@ EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# No upstream quota for stub servers
+COMICVINE_REQUESTS_PER_HOUR = 3600 * 1000
+# Search entries are expected right after save
+SEARCH_INDEX_MODE = "sync"
+# Synced catalog thumbnails are not fetched, proxy tests allow their local origin
+IMAGE_PROXY_ALLOWED_HOSTS = []
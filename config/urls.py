@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.urls import include, path
 from django.conf.urls.static import static
-from django.contrib import admin  # noqa
+from django.contrib import admin
 from django.views.generic import TemplateView
 from django.views import defaults as default_views
 
@@ -11,10 +11,13 @@ urlpatterns = [
     #     "about/", TemplateView.as_view(template_name="pages/about.html"), name="about"
     # ),
     # Django Admin, use {% url 'admin:index' %}
-    # path(settings.ADMIN_URL, admin.site.urls),
+    path(settings.ADMIN_URL, admin.site.urls),
     # User management
     path("users/", include("read_comics.users.urls", namespace="users")),
     path("accounts/", include("allauth.urls")),
+    path("search/", include("read_comics.search.urls", namespace="search")),
+    path("images/", include("read_comics.images.urls", namespace="images")),
+    path("publishers/", include("read_comics.publishers.urls", namespace="publishers")),
     # Your stuff: custom urls includes go here
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
@@ -4,13 +4,13 @@ from watson import search as watson
 from . import search_adapters
 
 
-class PublishersConfig(AppConfig):
+class CharactersConfig(AppConfig):
     name = 'read_comics.characters'
 
     def ready(self):
-        publisher_model = self.get_model('Publisher')
+        character_model = self.get_model('Character')
         watson.register(
-            publisher_model,
-            search_adapters.PublisherSearchAdapter,
+            character_model.objects.live(),
+            search_adapters.CharacterSearchAdapter,
             store=('name', 'short_description', 'thumb_url')
         )
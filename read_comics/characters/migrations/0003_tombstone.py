@@ -0,0 +1,23 @@
+# Generated by Django 3.0.2 on 2026-10-18 14:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('characters', '0002_character_sync_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='character',
+            name='deleted_dt',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='character',
+            name='is_deleted',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+    ]
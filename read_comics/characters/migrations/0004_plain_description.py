@@ -0,0 +1,25 @@
+# Generated by Django 3.0.2 on 2026-10-18 14:42
+
+from django.db import migrations, models
+
+from utils.html import fill_plain_descriptions
+
+
+def fill_character_plain_descriptions(apps, schema_editor):
+    fill_plain_descriptions(apps.get_model('characters', 'Character'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('characters', '0003_tombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='character',
+            name='plain_description',
+            field=models.TextField(null=True),
+        ),
+        migrations.RunPython(fill_character_plain_descriptions, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,28 @@
 from django.db import models
-from utils.models import ComicvineSyncModel
+from django_extensions.db.fields import AutoSlugField
+
+from utils.models import ComicvineSyncModel, slugify_function
 
 
 class Character(ComicvineSyncModel):
     name = models.TextField()
-    aliases = models.TextField()
-    short_description = models.TextField()
-    html_description = models.TextField()
+    aliases = models.TextField(null=True)
+    short_description = models.TextField(null=True)
+    html_description = models.TextField(null=True)
+    # Derived from html_description on write
+    plain_description = models.TextField(null=True)
+
+    thumb_url = models.URLField(max_length=1000, null=True)
+    image_url = models.URLField(max_length=1000, null=True)
+    # Intrinsic size and placeholder of thumb_url image, filled when image proxy fetches it
+    image_width = models.PositiveIntegerField(null=True)
+    image_height = models.PositiveIntegerField(null=True)
+    image_placeholder = models.TextField(blank=True, default="")
+
+    slug = AutoSlugField(populate_from=["name"], slugify_function=slugify_function)
+
+    class Meta:
+        ordering = ("name",)
 
-    thumb_url = models.URLField(max_length=1000)
-    image_url = models.URLField(max_length=1000)
+    def __str__(self):
+        return "[Character] %s (%d)" % (self.name, self.pk)
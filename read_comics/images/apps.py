@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ImagesConfig(AppConfig):
+    name = 'read_comics.images'
+    verbose_name = "Images"
+
+    def ready(self):
+        import read_comics.images.signals  # noqa F401
@@ -0,0 +1,84 @@
+import multiprocessing
+import resource
+import tracemalloc
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+
+from utils.fields import render_thumbnails
+
+MemoryReport = namedtuple("MemoryReport", ["width", "height", "upload_bytes", "path", "rss_bytes", "traced_bytes"])
+
+
+def make_upload(width, height):
+    """
+    JPEG photo-like upload: noise compresses about as badly as real photos
+    """
+    img = Image.merge("RGB", [Image.effect_noise((width, height), 64) for _ in range(3)])
+    buffer = BytesIO()
+    img.save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def full_decode_thumbnails(data, sizes):
+    """
+    Thumbnails the way they were rendered before: full size decode, resize, copy of encoded bytes
+    """
+    img = Image.open(BytesIO(data))
+    image_format = img.format
+    img.load()
+    for width, height in sizes:
+        if width and height:
+            thumb = img.copy()
+            thumb.thumbnail((width, height), Image.LANCZOS)
+        elif width:
+            thumb = img.resize((width, int(width * img.height / img.width)), Image.LANCZOS)
+        else:
+            thumb = img.resize((int(height * img.width / img.height), height), Image.LANCZOS)
+        buffer = BytesIO()
+        thumb.save(buffer, image_format)
+        buffer.getvalue()
+
+
+def bounded_thumbnails(data, sizes):
+    for _ in render_thumbnails(data, sizes):
+        pass
+
+
+PATHS = {
+    "full": full_decode_thumbnails,
+    "bounded": bounded_thumbnails,
+}
+
+
+def _get_rss():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize()
+
+
+def _measure(path, data, sizes):
+    # Runs in fresh process, so its peak RSS is not shadowed by earlier runs
+    baseline = _get_rss()
+    tracemalloc.start()
+    PATHS[path](data, sizes)
+    _, traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return max(peak - baseline, 0), traced
+
+
+def measure_memory(width, height, sizes, paths=tuple(PATHS)):
+    """
+    Peak memory of rendering thumbnails of ``width`` x ``height`` JPEG upload by each path, each run in
+    its own forked process. Returns list of MemoryReport: RSS growth covers Pillow buffers,
+    traced bytes only Python allocations (Linux only).
+    """
+    data = make_upload(width, height)
+    reports = []
+    for path in paths:
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("fork")) as pool:
+            rss, traced = pool.submit(_measure, path, data, sizes).result()
+        reports.append(MemoryReport(width, height, len(data), path, rss, traced))
+    return reports
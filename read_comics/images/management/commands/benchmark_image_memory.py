@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from read_comics.images.benchmark import measure_memory
+
+
+class Command(BaseCommand):
+    help = "Records peak memory of rendering avatar thumbnails per upload size, full decode against bounded path."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 4000, 6000], metavar="WIDTH",
+                            help="Upload widths, uploads are 4:3")
+        parser.add_argument("--thumb-widths", type=int, nargs="+", default=[40, 80])
+
+    def handle(self, *args, **options):
+        sizes = [(width, None) for width in options["thumb_widths"]]
+        for width in options["sizes"]:
+            for report in measure_memory(width, width * 3 // 4, sizes):
+                self.stdout.write("%dx%d (%.1f MB) %s: peak RSS +%.1f MB, traced %.1f MB" % (
+                    report.width, report.height, report.upload_bytes / 1024 ** 2, report.path,
+                    report.rss_bytes / 1024 ** 2, report.traced_bytes / 1024 ** 2,
+                ))
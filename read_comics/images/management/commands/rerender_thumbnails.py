@@ -0,0 +1,33 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+
+from read_comics.images.rendering import (
+    RERENDER_CHUNK_SIZE, get_field_label, get_thumbnail_fields, rerender_thumbnails
+)
+
+
+class Command(BaseCommand):
+    help = "Re-renders thumbnails of ThumbnailImageFields not matching their current sizes and formats."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--field", action="append", dest="fields", metavar="LABEL",
+                            help="Re-render only given field, e.g. users.User._user_image")
+        parser.add_argument("--workers", type=int, help="Worker processes, CPU count by default")
+        parser.add_argument("--chunk-size", type=int, default=RERENDER_CHUNK_SIZE)
+        parser.add_argument("--force", action="store_true", help="Re-render matching thumbnails too, from first row")
+        parser.add_argument("--restart", action="store_true", help="Ignore checkpoints and start from first row")
+
+    def handle(self, *args, **options):
+        try:
+            fields = get_thumbnail_fields(options["fields"])
+        except (LookupError, ValueError, FieldDoesNotExist) as e:
+            raise CommandError(e)
+        results = rerender_thumbnails(fields, options["workers"], options["chunk_size"], options["force"],
+                                      options["restart"])
+        for field in fields:
+            label = get_field_label(field)
+            field_results = [result for result in results if result.field == label]
+            self.stdout.write("%s: %d rendered, %d skipped, %d failed" % (
+                label, sum(result.rendered for result in field_results),
+                sum(result.skipped for result in field_results), sum(result.failed for result in field_results),
+            ))
@@ -0,0 +1,31 @@
+# Generated by Django 3.0.2 on 2026-10-18 14:53
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProxiedImage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_hash', models.CharField(max_length=40, unique=True)),
+                ('url', models.URLField(max_length=1000)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('digest', models.CharField(blank=True, max_length=40)),
+                ('extension', models.CharField(blank=True, max_length=10)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('created_dt', models.DateTimeField(auto_now_add=True)),
+                ('fetched_dt', models.DateTimeField(null=True)),
+                ('accessed_dt', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
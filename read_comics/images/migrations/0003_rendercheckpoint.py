@@ -0,0 +1,23 @@
+# Generated by Django 3.0.2 on 2026-10-18 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0002_storedfile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderCheckpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=255, unique=True)),
+                ('spec', models.TextField(blank=True)),
+                ('last_pk', models.BigIntegerField(default=0)),
+                ('modified_dt', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.0.2 on 2026-10-18 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0003_rendercheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proxiedimage',
+            name='height',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='proxiedimage',
+            name='placeholder',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='proxiedimage',
+            name='width',
+            field=models.PositiveIntegerField(null=True),
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ProxiedImage(models.Model):
+    """
+    Remote image fetched once and stored in resized copies, one per ``IMAGE_PROXY_WIDTHS`` width.
+    ``accessed_dt`` orders least recently used images for eviction.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        READY = 'ready', 'Ready'
+        FAILED = 'failed', 'Failed'
+
+    url_hash = models.CharField(max_length=40, unique=True)
+    url = models.URLField(max_length=1000)
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    error = models.TextField(blank=True)
+    # SHA-1 of source bytes, base of copies ETags
+    digest = models.CharField(max_length=40, blank=True)
+    extension = models.CharField(max_length=10, blank=True)
+    # Intrinsic size of source image and its placeholder data URI
+    width = models.PositiveIntegerField(null=True)
+    height = models.PositiveIntegerField(null=True)
+    placeholder = models.TextField(blank=True)
+    # Total bytes of stored copies
+    size = models.PositiveIntegerField(default=0)
+
+    created_dt = models.DateTimeField(auto_now_add=True)
+    fetched_dt = models.DateTimeField(null=True)
+    accessed_dt = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return "[ProxiedImage] %s (%s)" % (self.url, self.status)
+
+
+class StoredFile(models.Model):
+    """
+    File of content addressed storage with count of field values referencing it
+    """
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveIntegerField()
+    refcount = models.PositiveIntegerField(default=1)
+
+    created_dt = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return "[StoredFile] %s (%d)" % (self.name, self.refcount)
+
+
+class RenderCheckpoint(models.Model):
+    """
+    Primary key up to which thumbnails of ThumbnailImageField (``app.Model.field``) were re-rendered
+    for thumbnail spec ``spec``
+    """
+    field = models.CharField(max_length=255, unique=True)
+    spec = models.TextField(blank=True)
+    last_pk = models.BigIntegerField(default=0)
+
+    modified_dt = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return "[RenderCheckpoint] %s (%d)" % (self.field, self.last_pk)
@@ -0,0 +1,182 @@
+import datetime
+import hashlib
+from collections import namedtuple
+from io import BytesIO
+from urllib.parse import urlsplit
+
+import requests
+from PIL import Image
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db.models import Sum
+from django.utils import timezone
+
+from utils import logging
+from utils.images import ImageTooLargeError, encode_image, get_placeholder, open_image, resize_image
+from .models import ProxiedImage
+
+logger = logging.getLogger(__name__)
+
+FETCH_SCHEDULED_KEY = "images:fetch:%s"
+FETCH_SCHEDULED_TIMEOUT = 60
+# Pillow formats stored as they are with their extensions, others are converted to PNG
+STORED_FORMATS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+CONTENT_TYPES = {"jpg": "image/jpeg", "png": "image/png", "gif": "image/gif", "webp": "image/webp"}
+# Eviction frees some room below the cap, so it doesn't run after every fetch
+EVICT_TARGET_RATIO = 0.9
+# Last access time is only written when older than this, not on every request
+TOUCH_INTERVAL = datetime.timedelta(hours=1)
+
+RenderedImage = namedtuple("RenderedImage", ["extension", "width", "height", "placeholder", "copies"])
+
+
+class ProxyError(Exception):
+    pass
+
+
+def get_url_hash(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def is_allowed(url):
+    parts = urlsplit(url)
+    return parts.scheme in ("http", "https") and parts.hostname in settings.IMAGE_PROXY_ALLOWED_HOSTS
+
+
+def get_width(requested=None):
+    """
+    Smallest configured copy width not less than requested one, the largest one if none is
+    """
+    widths = sorted(settings.IMAGE_PROXY_WIDTHS)
+    if requested:
+        for width in widths:
+            if width >= requested:
+                return width
+    return widths[-1]
+
+
+def get_copy_name(image, width):
+    return "image_proxy/%s/%s/%d.%s" % (image.url_hash[:2], image.url_hash, width, image.extension)
+
+
+def get_etag(image, width):
+    return '"%s-%d"' % (image.digest, width)
+
+
+def get_content_type(image):
+    return CONTENT_TYPES[image.extension]
+
+
+def download(url):
+    with requests.get(url, stream=True, timeout=settings.IMAGE_PROXY_TIMEOUT,
+                      headers={"User-Agent": "read_comics"}) as response:
+        response.raise_for_status()
+        data = BytesIO()
+        for chunk in response.iter_content(64 * 1024):
+            data.write(chunk)
+            if data.tell() > settings.IMAGE_PROXY_MAX_SOURCE_BYTES:
+                raise ProxyError("%s is larger than %d bytes" % (url, settings.IMAGE_PROXY_MAX_SOURCE_BYTES))
+    data.seek(0)
+    return data
+
+
+def render_copies(fileobj, widths):
+    """
+    RenderedImage of image file with intrinsic size, placeholder and dict of width -> encoded copy buffer,
+    from one decode at reduced scale. Images are never upscaled.
+    """
+    # JPEG draft shrinks decoded size, intrinsic one is read from header first
+    width, height = Image.open(fileobj).size
+    fileobj.seek(0)
+    img = open_image(fileobj, [(copy_width, None) for copy_width in widths])
+    image_format = img.format
+    img.load()
+    extension = STORED_FORMATS.get(image_format)
+    if extension is None:
+        image_format, extension = "PNG", "png"
+    copies = {
+        copy_width: encode_image(resize_image(img, copy_width) if img.width > copy_width else img, image_format)
+        for copy_width in widths
+    }
+    return RenderedImage(extension, width, height, get_placeholder(img), copies)
+
+
+def delete_copies(image):
+    for width in settings.IMAGE_PROXY_WIDTHS:
+        name = get_copy_name(image, width)
+        if default_storage.exists(name):
+            default_storage.delete(name)
+
+
+@logging.logged(logger)
+def fetch_image(url):
+    """
+    Downloads remote image once and stores its copies of all ``IMAGE_PROXY_WIDTHS``.
+    Returns ProxiedImage, failed if image could not be fetched or decoded.
+    """
+    image, _ = ProxiedImage.objects.get_or_create(url_hash=get_url_hash(url), defaults={"url": url})
+    # Images fetched before placeholders were added are fetched again once
+    if image.status == ProxiedImage.Status.READY and image.placeholder:
+        return image
+    try:
+        data = download(url)
+        rendered = render_copies(data, settings.IMAGE_PROXY_WIDTHS)
+    except (requests.RequestException, ProxyError, ImageTooLargeError, OSError, Image.DecompressionBombError) as e:
+        logger.warning("Failed to fetch %s: %s" % (url, e))
+        image.status = ProxiedImage.Status.FAILED
+        image.error = str(e)
+        image.save()
+        return image
+
+    image.digest = hashlib.sha1(data.getbuffer()).hexdigest()
+    image.extension = rendered.extension
+    image.width, image.height, image.placeholder = rendered.width, rendered.height, rendered.placeholder
+    for width, copy in rendered.copies.items():
+        name = get_copy_name(image, width)
+        # Leftover copy would make storage pick another name
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        default_storage.save(name, File(copy, name))
+    image.size = sum(copy.getbuffer().nbytes for copy in rendered.copies.values())
+    image.status = ProxiedImage.Status.READY
+    image.error = ""
+    image.fetched_dt = image.accessed_dt = timezone.now()
+    image.save()
+    return image
+
+
+def evict(max_bytes=None):
+    """
+    Deletes least recently used images once their copies take more than ``IMAGE_PROXY_MAX_BYTES``.
+    Returns count of evicted images. Periodic task runs it, as it sums sizes of all images.
+    """
+    max_bytes = settings.IMAGE_PROXY_MAX_BYTES if max_bytes is None else max_bytes
+    ready = ProxiedImage.objects.filter(status=ProxiedImage.Status.READY)
+    total = ready.aggregate(total=Sum("size"))["total"] or 0
+    if total <= max_bytes:
+        return 0
+    evicted = 0
+    for image in ready.order_by("accessed_dt").iterator():
+        if total <= max_bytes * EVICT_TARGET_RATIO:
+            break
+        delete_copies(image)
+        image.delete()
+        total -= image.size
+        evicted += 1
+    logger.info("%d images evicted, %d bytes left" % (evicted, total))
+    return evicted
+
+
+def touch(image):
+    now = timezone.now()
+    if image.accessed_dt < now - TOUCH_INTERVAL:
+        ProxiedImage.objects.filter(pk=image.pk).update(accessed_dt=now)
+
+
+def schedule_fetch(url):
+    if cache.add(FETCH_SCHEDULED_KEY % get_url_hash(url), True, FETCH_SCHEDULED_TIMEOUT):
+        from .tasks import prefetch_image
+
+        prefetch_image.delay(url)
@@ -0,0 +1,149 @@
+import json
+import os
+from collections import namedtuple
+
+from PIL import Image
+from django.apps import apps
+from django.db.models import Exists, OuterRef
+
+from read_comics.search.indexing import get_pk_ranges
+from utils import logging
+from utils.fields import ThumbnailImageField
+from utils.images import ImageTooLargeError, get_target_size
+from utils.processes import run_chunks
+from .models import RenderCheckpoint
+
+logger = logging.getLogger(__name__)
+
+RERENDER_CHUNK_SIZE = 500
+
+RangeResult = namedtuple("RangeResult", ["field", "low", "high", "worker", "rendered", "skipped", "failed"])
+
+
+def get_thumbnail_fields(labels=None):
+    """
+    ThumbnailImageFields of installed models, or of given ``app.Model.field`` labels
+    """
+    if labels:
+        fields = []
+        for label in labels:
+            model_label, field_name = label.rsplit(".", 1)
+            field = apps.get_model(model_label)._meta.get_field(field_name)
+            if not isinstance(field, ThumbnailImageField):
+                raise ValueError("%s is not ThumbnailImageField" % label)
+            fields.append(field)
+        return fields
+    return [field for model in apps.get_models() for field in model._meta.get_fields()
+            if isinstance(field, ThumbnailImageField)]
+
+
+def get_field_label(field):
+    return "%s.%s" % (field.model._meta.label, field.name)
+
+
+def get_spec(field):
+    """
+    Thumbnail sizes and formats field renders now, checkpoints of other specs are stale
+    """
+    return json.dumps({"sizes": field.thumb_sizes, "formats": field.output_formats})
+
+
+def thumbs_match(file):
+    """
+    Whether all thumbnails of field file are stored in current formats and sizes. Only image headers are read.
+    """
+    storage = file.field.thumb_storage
+    if not all(storage.exists(name) for name in file.thumb_names):
+        return False
+    with file.storage.open(file.name) as original:
+        width, height = Image.open(original).size
+    for index, size in enumerate(file.field.thumb_sizes):
+        with storage.open(file.get_thumb_name(index)) as thumb:
+            if Image.open(thumb).size != get_target_size(width, height, *size):
+                return False
+    return True
+
+
+def rerender_range(field_label, low, high, force=False):
+    """
+    Renders thumbnails of files whose first row has primary key in ``[low, high)`` and whose thumbnails
+    don't match field spec, all of them if ``force``, and fills ready flags and placeholders of all their rows.
+    Files shared by rows of other ranges are left to range of their first row, so each is rendered once.
+    """
+    model_label, field_name = field_label.rsplit(".", 1)
+    model = apps.get_model(model_label)
+    rows = model._default_manager.exclude(**{field_name: ""}).exclude(**{"%s__isnull" % field_name: True})
+    first_rows = rows.filter(pk__gte=low, pk__lt=high).filter(
+        ~Exists(rows.filter(pk__lt=OuterRef("pk"), **{field_name: OuterRef(field_name)}))
+    ).order_by("pk")
+    rendered, skipped, failed = 0, 0, 0
+    for instance in first_rows.iterator():
+        file = getattr(instance, field_name)
+        try:
+            if not force and thumbs_match(file):
+                skipped += 1
+            else:
+                with file.storage.open(file.name) as original:
+                    file.save_thumbnails(original.read())
+                rendered += 1
+            values = file.get_ready_values()
+        except (OSError, ImageTooLargeError, Image.DecompressionBombError) as e:
+            logger.warning("Failed to render thumbnails of %s %s: %s" % (field_label, instance.pk, e))
+            failed += 1
+            continue
+        # Rows sharing the file, only those with other ready flag or placeholder
+        if values:
+            rows.filter(**{field_name: file.name}).exclude(**values).update(**values)
+    return RangeResult(field_label, low, high, os.getpid(), rendered, skipped, failed)
+
+
+class CheckpointTracker:
+    """
+    Moves RenderCheckpoint over ranges finished in any order, only as far as all preceding ranges are finished
+    """
+
+    def __init__(self, checkpoint, ranges):
+        self.checkpoint = checkpoint
+        self.pending = [high for _, high in ranges]
+        self.finished = set()
+
+    def finish(self, high):
+        self.finished.add(high)
+        last_pk = None
+        while self.pending and self.pending[0] in self.finished:
+            last_pk = self.pending.pop(0) - 1
+        if last_pk is not None:
+            self.checkpoint.last_pk = last_pk
+            self.checkpoint.save()
+
+
+@logging.logged(logger)
+def rerender_thumbnails(fields=None, workers=None, chunk_size=RERENDER_CHUNK_SIZE, force=False, restart=False):
+    """
+    Re-renders stale thumbnails of ThumbnailImageFields in primary key chunks, in a pool of ``workers``
+    processes (CPU count by default, 0 renders in current process). Returns list of RangeResult.
+
+    Each field resumes after its RenderCheckpoint unless ``restart`` or ``force`` is set or field spec
+    changed since.
+    """
+    fields = list(fields or get_thumbnail_fields())
+    chunks, checkpoints = [], {}
+    for field in fields:
+        label, spec = get_field_label(field), get_spec(field)
+        checkpoint, _ = RenderCheckpoint.objects.get_or_create(field=label)
+        if restart or force or checkpoint.spec != spec:
+            checkpoint.spec, checkpoint.last_pk = spec, 0
+            checkpoint.save()
+        ranges = get_pk_ranges(field.model._default_manager.filter(pk__gt=checkpoint.last_pk), chunk_size)
+        checkpoints[label] = CheckpointTracker(checkpoint, ranges)
+        chunks += [(label, low, high, force) for low, high in ranges]
+
+    return [_finish(result, checkpoints) for result in run_chunks(rerender_range, chunks, workers)]
+
+
+def _finish(result, checkpoints):
+    checkpoints[result.field].finish(result.high)
+    logger.info("%s [%d, %d): %d rendered, %d skipped, %d failed by worker %d" % (
+        result.field, result.low, result.high, result.rendered, result.skipped, result.failed, result.worker
+    ))
+    return result
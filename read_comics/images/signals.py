@@ -0,0 +1,21 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import receiver
+
+from utils.models import _batches
+from utils.signals import bulk_synced
+from .tasks import PREFETCH_BATCH_SIZE, prefetch_placeholders
+
+
+@receiver(bulk_synced)
+def prefetch_on_sync(sender, pks, **kwargs):
+    """
+    Fetches thumbnails of synced catalog rows through image proxy once rows are committed, and stores their
+    size and placeholder in rows. Nothing is fetched while proxy allows no hosts.
+    """
+    if not settings.IMAGE_PROXY_ALLOWED_HOSTS or not hasattr(sender, "image_placeholder"):
+        return
+    for batch in _batches(pks, PREFETCH_BATCH_SIZE):
+        transaction.on_commit(partial(prefetch_placeholders.delay, sender._meta.label, batch))
@@ -0,0 +1,87 @@
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import Storage, default_storage
+from django.db import transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+from .models import StoredFile
+
+
+@deconstructible
+class ContentAddressedStorage(Storage):
+    """
+    Storage on top of default one naming files by SHA-256 of their content, so the same content is stored once.
+    StoredFile rows count references: saving known content adds one without upload, deleting removes one and
+    deletes the file with the last one. Names of files it didn't save are passed to default storage as is.
+    """
+
+    def __init__(self, location="cas"):
+        self.location = location
+
+    @property
+    def backend(self):
+        return default_storage
+
+    def get_content_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        digest = digest.hexdigest()
+        return "%s/%s/%s%s" % (self.location, digest[:2], digest, os.path.splitext(name)[1].lower())
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.get_content_name(name, content)
+        with transaction.atomic():
+            stored, created = StoredFile.objects.select_for_update().get_or_create(
+                name=name, defaults={"size": content.size}
+            )
+            if not created:
+                StoredFile.objects.filter(pk=stored.pk).update(refcount=F("refcount") + 1)
+            # File may be left by upload whose transaction was rolled back
+            elif not self.backend.exists(name):
+                self.backend.save(name, content)
+        return name
+
+    def delete(self, name):
+        with transaction.atomic():
+            stored = StoredFile.objects.select_for_update().filter(name=name).first()
+            if stored is not None:
+                if stored.refcount > 1:
+                    StoredFile.objects.filter(pk=stored.pk).update(refcount=F("refcount") - 1)
+                    return
+                stored.delete()
+        self.backend.delete(name)
+
+    def release(self, name):
+        """
+        Drops reference taken by saving content which the field already referenced
+        """
+        self.delete(name)
+
+    def get_refcount(self, name):
+        return StoredFile.objects.filter(name=name).values_list("refcount", flat=True).first() or 0
+
+    def _open(self, name, mode="rb"):
+        return self.backend.open(name, mode)
+
+    def exists(self, name):
+        return self.backend.exists(name)
+
+    def url(self, name):
+        return self.backend.url(name)
+
+    def size(self, name):
+        return self.backend.size(name)
+
+    def path(self, name):
+        return self.backend.path(name)
+
+    def listdir(self, path):
+        return self.backend.listdir(path)
@@ -0,0 +1,56 @@
+from django.apps import apps
+from django.conf import settings
+
+from config import celery_app
+from .models import ProxiedImage
+from .proxy import evict, fetch_image, get_url_hash, is_allowed
+
+# Each prefetched image may take a few download timeouts, so batches are small and bounded in time
+PREFETCH_BATCH_SIZE = 5
+PREFETCH_TIME_LIMITS = {
+    "soft_time_limit": PREFETCH_BATCH_SIZE * settings.IMAGE_PROXY_TIMEOUT * 2,
+    "time_limit": PREFETCH_BATCH_SIZE * settings.IMAGE_PROXY_TIMEOUT * 2 + 60,
+}
+
+
+@celery_app.task()
+def prefetch_image(url):
+    """Stores resized copies of remote image for image proxy."""
+    return fetch_image(url).status
+
+
+@celery_app.task()
+def prefetch_images(urls):
+    """Stores resized copies of remote images which are not stored yet."""
+    urls = {get_url_hash(url): url for url in urls if url and is_allowed(url)}
+    stored = set(ProxiedImage.objects.filter(url_hash__in=urls.keys()).exclude(
+        status=ProxiedImage.Status.PENDING
+    ).values_list("url_hash", flat=True))
+    for url_hash, url in urls.items():
+        if url_hash not in stored:
+            fetch_image(url)
+
+
+@celery_app.task(**PREFETCH_TIME_LIMITS)
+def prefetch_placeholders(model_label, pks):
+    """
+    Stores resized copies of catalog rows thumbnails and copies their intrinsic size and placeholder into rows,
+    called after sync in batches of ``PREFETCH_BATCH_SIZE`` rows.
+    Rows without proxied thumbnail get them cleared.
+    """
+    model = apps.get_model(model_label)
+    rows = model._default_manager.filter(pk__in=pks)
+    for pk, url in rows.values_list("pk", "thumb_url"):
+        image = fetch_image(url) if url and is_allowed(url) else None
+        if image is not None and image.status == ProxiedImage.Status.READY:
+            values = {"image_width": image.width, "image_height": image.height, "image_placeholder": image.placeholder}
+        else:
+            values = {"image_width": None, "image_height": None, "image_placeholder": ""}
+        # Thumbnail may have changed while image was fetched
+        rows.filter(pk=pk, thumb_url=url).update(**values)
+
+
+@celery_app.task()
+def evict_images():
+    """Deletes least recently used proxied images over the size cap. Hourly job runs it."""
+    return evict()
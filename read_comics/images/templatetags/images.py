@@ -0,0 +1,38 @@
+from urllib.parse import urlencode
+
+from django import template
+from django.urls import reverse
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from read_comics.images.proxy import is_allowed
+
+register = template.Library()
+
+
+@register.filter
+def proxied(url, width=None):
+    """
+    Image proxy url of remote image, e.g. ``{{ character.thumb_url|proxied:200 }}``
+    """
+    if not url or not is_allowed(url):
+        return url
+    params = {"url": url}
+    if width:
+        params["w"] = width
+    return "%s?%s" % (reverse("images:proxy"), urlencode(params))
+
+
+@register.simple_tag
+def placeholder_attrs(obj, dimensions=True):
+    """
+    ``width`` and ``height`` (unless ``dimensions`` is false) and placeholder background ``style`` attributes
+    of ``<img>`` of object image, so layout doesn't jump while it loads, e.g.
+    ``<img src="{{ person.thumb_url|proxied:200 }}" {% placeholder_attrs person %}>``
+    """
+    attrs = []
+    if dimensions and obj.image_width and obj.image_height:
+        attrs.append(format_html('width="{}" height="{}"', obj.image_width, obj.image_height))
+    if obj.image_placeholder:
+        attrs.append(format_html('style="background: url({}) center / cover no-repeat"', obj.image_placeholder))
+    return mark_safe(" ".join(attrs))
@@ -0,0 +1,10 @@
+from read_comics.images.benchmark import measure_memory
+
+
+def test_measure_memory():
+    reports = measure_memory(400, 300, [(40, None)])
+
+    assert [(report.path, report.width, report.height) for report in reports] == [
+        ("full", 400, 300), ("bounded", 400, 300)
+    ]
+    assert all(report.upload_bytes > 0 and report.rss_bytes >= 0 for report in reports)
@@ -0,0 +1,177 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+from read_comics.images.models import ProxiedImage
+from read_comics.images.proxy import evict, fetch_image, get_copy_name, get_width
+from read_comics.images.tasks import prefetch_placeholders
+from read_comics.images.templatetags.images import placeholder_attrs, proxied
+from read_comics.publishers.models import Publisher
+from read_comics.utils.tests.factories import image_bytes, publisher_record
+
+pytestmark = pytest.mark.django_db
+
+
+class OriginHandler(BaseHTTPRequestHandler):
+    files = {
+        "/wide.jpg": image_bytes(1000, 500, "JPEG"),
+        "/small.png": image_bytes(150, 150),
+        "/broken.jpg": b"not an image",
+    }
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        data = self.files.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def origin(settings):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OriginHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.IMAGE_PROXY_ALLOWED_HOSTS = ["127.0.0.1"]
+    settings.IMAGE_PROXY_WIDTHS = (100, 200, 400)
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    cache.clear()
+    server.url = "http://127.0.0.1:%d" % server.server_address[1]
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_width(origin):
+    assert get_width(1) == 100
+    assert get_width(150) == 200
+    assert get_width(5000) == 400
+    assert get_width() == 400
+
+
+def test_fetch_image(origin):
+    url = origin.url + "/wide.jpg"
+
+    image = fetch_image(url)
+
+    assert image.status == ProxiedImage.Status.READY
+    assert image.extension == "jpg"
+    sizes = [Image.open(default_storage.open(get_copy_name(image, width))).size for width in (100, 200, 400)]
+    assert sizes == [(100, 50), (200, 100), (400, 200)]
+    assert (image.width, image.height) == (1000, 500)
+    assert image.placeholder.startswith("data:image/")
+    assert image.size == sum(default_storage.size(get_copy_name(image, width)) for width in (100, 200, 400))
+
+    assert fetch_image(url) == image
+    assert origin.requests == ["/wide.jpg"]
+
+
+def test_fetch_image_never_upscales(origin):
+    image = fetch_image(origin.url + "/small.png")
+
+    assert Image.open(default_storage.open(get_copy_name(image, 400))).size == (150, 150)
+
+
+@pytest.mark.parametrize("path", ["/missing.jpg", "/broken.jpg"])
+def test_fetch_image_failed(origin, path):
+    image = fetch_image(origin.url + path)
+
+    assert image.status == ProxiedImage.Status.FAILED
+    assert image.error
+
+
+def test_evict(origin, monkeypatch):
+    monkeypatch.setattr("read_comics.images.proxy.EVICT_TARGET_RATIO", 1)
+    first = fetch_image(origin.url + "/wide.jpg")
+    second = fetch_image(origin.url + "/small.png")
+    ProxiedImage.objects.filter(pk=second.pk).update(accessed_dt=first.accessed_dt.replace(year=2000))
+
+    assert evict(max_bytes=first.size) == 1
+
+    assert list(ProxiedImage.objects.all()) == [first]
+    assert not default_storage.exists(get_copy_name(second, 100))
+    assert evict(max_bytes=first.size) == 0
+
+
+def test_image_proxy_view(client, origin):
+    url = origin.url + "/wide.jpg"
+
+    response = client.get(reverse("images:proxy"), {"url": url, "w": 150})
+
+    assert response.status_code == 302
+    assert response["Location"] == url
+    assert ProxiedImage.objects.get().status == ProxiedImage.Status.READY
+
+    response = client.get(reverse("images:proxy"), {"url": url, "w": 150})
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/jpeg"
+    assert Image.open(BytesIO(b"".join(response.streaming_content))).size == (200, 100)
+    assert "max-age=2592000" in response["Cache-Control"]
+    etag = response["ETag"]
+
+    response = client.get(reverse("images:proxy"), {"url": url, "w": 150}, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert client.get(reverse("images:proxy"), {"url": url, "w": 400})["ETag"] != etag
+    assert origin.requests == ["/wide.jpg"]
+
+
+def test_image_proxy_view_rejects_hosts(client, origin):
+    response = client.get(reverse("images:proxy"), {"url": "http://example.com/image.jpg"})
+
+    assert response.status_code == 400
+
+
+def test_proxied(origin):
+    assert proxied(origin.url + "/wide.jpg", 200).startswith(reverse("images:proxy") + "?url=http")
+    assert proxied("http://example.com/image.jpg", 200) == "http://example.com/image.jpg"
+    assert proxied(None) is None
+
+
+def test_prefetch_placeholders(origin):
+    Publisher.bulk_sync([
+        publisher_record(1, thumb_url=origin.url + "/wide.jpg"),
+        publisher_record(2, thumb_url="http://example.com/image.jpg"),
+    ])
+    Publisher.objects.filter(comicvine_id=2).update(image_width=1, image_height=1, image_placeholder="stale")
+
+    prefetch_placeholders("publishers.Publisher", list(Publisher.objects.values_list("pk", flat=True)))
+
+    first, second = Publisher.objects.order_by("comicvine_id")
+    assert (first.image_width, first.image_height) == (1000, 500)
+    assert first.image_placeholder == ProxiedImage.objects.get().placeholder
+    assert (second.image_width, second.image_height, second.image_placeholder) == (None, None, "")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sync_fills_placeholders(origin):
+    Publisher.bulk_sync([publisher_record(1, thumb_url=origin.url + "/wide.jpg")])
+
+    publisher = Publisher.objects.get()
+    assert (publisher.image_width, publisher.image_height) == (1000, 500)
+    assert publisher.image_placeholder.startswith("data:image/")
+
+
+def test_placeholder_attrs():
+    publisher = Publisher(image_width=1000, image_height=500, image_placeholder="data:image/webp;base64,AAAA")
+
+    assert placeholder_attrs(publisher) == (
+        'width="1000" height="500" style="background: url(data:image/webp;base64,AAAA) center / cover no-repeat"'
+    )
+    assert placeholder_attrs(publisher, dimensions=False).startswith("style=")
+    assert placeholder_attrs(Publisher()) == ""
@@ -0,0 +1,97 @@
+from io import StringIO
+
+import pytest
+from PIL import Image
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+
+from read_comics.images.models import RenderCheckpoint
+from read_comics.images.rendering import get_spec, get_thumbnail_fields, rerender_thumbnails, thumbs_match
+from read_comics.users.models import User
+from read_comics.users.tests.factories import UserFactory
+from read_comics.utils.tests.factories import image_bytes
+
+
+@pytest.fixture
+def users(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
+    users = []
+    for color in ("red", "green", "blue"):
+        user = UserFactory()
+        user._user_image.save("avatar.png", ContentFile(image_bytes(color=color)))
+        user.refresh_from_db()
+        users.append(user)
+    UserFactory()
+    return users
+
+
+@pytest.fixture
+def field(monkeypatch):
+    field = User._meta.get_field("_user_image")
+    monkeypatch.setattr(field, "thumb_sizes", [(50, None), (80, None)])
+    return field
+
+
+def thumb_size(user):
+    image = user._user_image
+    return Image.open(image.storage.open(image.get_thumb_name(0))).size
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rerender_thumbnails(users, field):
+    assert field in get_thumbnail_fields()
+    assert not thumbs_match(users[0]._user_image)
+
+    results = rerender_thumbnails([field], workers=0, chunk_size=2)
+
+    assert sum(result.rendered for result in results) == 3
+    assert all(thumb_size(user) == (50, 25) for user in users)
+    assert RenderCheckpoint.objects.get(field="users.User._user_image").last_pk == User.objects.latest("pk").pk
+    # Resumes after checkpoint
+    assert rerender_thumbnails([field], workers=0) == []
+    # Matching thumbnails are skipped
+    results = rerender_thumbnails([field], workers=0, restart=True)
+    assert [(result.rendered, result.skipped) for result in results] == [(0, 3)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rerender_thumbnails_renders_shared_file_once(users, field, monkeypatch):
+    sharing = UserFactory()
+    sharing._user_image.save("avatar.png", ContentFile(image_bytes()))
+    User.objects.filter(pk__in=[users[0].pk, sharing.pk]).update(_user_image_placeholder="")
+    rendered = []
+    save_thumbnails = type(users[0]._user_image).save_thumbnails
+    monkeypatch.setattr(type(users[0]._user_image), "save_thumbnails",
+                        lambda self, data: rendered.append(self.name) or save_thumbnails(self, data))
+
+    results = rerender_thumbnails([field], workers=0, chunk_size=1)
+
+    assert sorted(rendered) == sorted(user._user_image.name for user in users)
+    assert sum(result.rendered for result in results) == 3
+    sharing.refresh_from_db()
+    assert sharing._user_image.name == users[0]._user_image.name
+    assert sharing.image_placeholder.startswith("data:image/")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rerender_thumbnails_resumes(users, field):
+    RenderCheckpoint.objects.create(field="users.User._user_image", spec=get_spec(field), last_pk=users[0].pk)
+
+    rerender_thumbnails([field], workers=0)
+
+    assert [thumb_size(user) for user in users] == [(40, 20), (50, 25), (50, 25)]
+    results = rerender_thumbnails([field], workers=0, force=True)
+    assert sum(result.rendered for result in results) == 3
+    assert thumb_size(users[0]) == (50, 25)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rerender_thumbnails_command(users, field):
+    out = StringIO()
+
+    call_command("rerender_thumbnails", "--field", "users.User._user_image", "--workers", "0", stdout=out)
+
+    assert out.getvalue() == "users.User._user_image: 3 rendered, 0 skipped, 0 failed\n"
+    with pytest.raises(CommandError):
+        call_command("rerender_thumbnails", "--field", "users.User.username")
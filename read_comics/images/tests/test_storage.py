@@ -0,0 +1,68 @@
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from read_comics.images.models import StoredFile
+from read_comics.images.storage import ContentAddressedStorage
+from read_comics.users.tests.factories import UserFactory
+from read_comics.utils.tests.factories import image_bytes
+
+
+@pytest.mark.django_db
+def test_save_deduplicates():
+    storage = ContentAddressedStorage()
+
+    name = storage.save("first.PNG", ContentFile(b"content"))
+
+    assert name.startswith("cas/") and name.endswith(".png")
+    assert storage.save("second.png", ContentFile(b"content")) == name
+    assert storage.get_refcount(name) == 2
+    assert storage.save("other.png", ContentFile(b"other")) != name
+
+    storage.delete(name)
+    assert storage.exists(name)
+    storage.delete(name)
+    assert not storage.exists(name)
+    assert not StoredFile.objects.filter(name=name).exists()
+
+
+@pytest.fixture
+def eager(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
+
+
+@pytest.mark.django_db(transaction=True)
+def test_user_images_share_file(eager, monkeypatch):
+    first, second = UserFactory(), UserFactory()
+    first._user_image.save("a.png", ContentFile(image_bytes()))
+    first.refresh_from_db()
+    name = first._user_image.name
+    thumb_names = first._user_image.thumb_names
+    rendered = []
+    monkeypatch.setattr("read_comics.utils.fields.ThumbnailImageFieldFile.save_thumbnails",
+                        lambda self, data: rendered.append(self.name))
+
+    second._user_image.save("b.png", ContentFile(image_bytes()))
+    second.refresh_from_db()
+
+    assert second._user_image.name == name
+    assert second._user_image_thumbs_ready
+    assert second.image_placeholder == first.image_placeholder != ""
+    assert rendered == []
+    assert StoredFile.objects.get(name=name).refcount == 2
+    assert all(default_storage.exists(thumb_name) for thumb_name in thumb_names)
+
+    # Same content uploaded again by the same user doesn't take another reference
+    second._user_image.save("c.png", ContentFile(image_bytes()))
+    assert StoredFile.objects.get(name=name).refcount == 2
+
+    # django_cleanup releases replaced image
+    second._user_image.save("d.png", ContentFile(image_bytes(color="blue")))
+    assert StoredFile.objects.get(name=name).refcount == 1
+    assert default_storage.exists(name)
+
+    first.delete()
+    assert not StoredFile.objects.filter(name=name).exists()
+    assert not default_storage.exists(name)
+    assert not any(default_storage.exists(thumb_name) for thumb_name in thumb_names)
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from read_comics.images.views import image_proxy_view
+
+app_name = "images"
+urlpatterns = [
+    path("proxy/", view=image_proxy_view, name="proxy"),
+]
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponseNotModified, HttpResponseRedirect, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.views import View
+
+from .models import ProxiedImage
+from .proxy import get_content_type, get_copy_name, get_etag, get_url_hash, get_width, is_allowed, schedule_fetch, touch
+
+
+class ImageProxyView(View):
+    """
+    Serves stored copy of remote image of requested width. Images not stored yet are fetched in
+    background and meanwhile redirected to.
+    """
+
+    def get(self, request):
+        url = request.GET.get("url", "")
+        if not is_allowed(url):
+            return JsonResponse(data={"error": "Image host is not allowed"}, status=400)
+        try:
+            width = get_width(int(request.GET["w"]) if request.GET.get("w") else None)
+        except ValueError as e:
+            return JsonResponse(data={"error": str(e)}, status=400)
+
+        image = ProxiedImage.objects.filter(url_hash=get_url_hash(url), status=ProxiedImage.Status.READY).first()
+        if image is not None:
+            etag = get_etag(image, width)
+            if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+                response = HttpResponseNotModified()
+            else:
+                try:
+                    response = FileResponse(default_storage.open(get_copy_name(image, width)),
+                                            content_type=get_content_type(image))
+                except OSError:
+                    # Evicted meanwhile
+                    image = None
+        if image is None:
+            schedule_fetch(url)
+            response = HttpResponseRedirect(url)
+            patch_cache_control(response, no_cache=True)
+            return response
+
+        touch(image)
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=settings.IMAGE_PROXY_MAX_AGE)
+        return response
+
+
+image_proxy_view = ImageProxyView.as_view()
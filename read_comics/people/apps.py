@@ -10,7 +10,7 @@ class PeopleConfig(AppConfig):
     def ready(self):
         person_model = self.get_model('Person')
         watson.register(
-            person_model,
+            person_model.objects.live(),
             search_adapters.PersonSearchAdapter,
             store=('name', 'short_description', 'thumb_url', 'birth_date', 'death_date', 'hometown', 'country')
         )
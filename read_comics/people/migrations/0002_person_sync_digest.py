@@ -0,0 +1,18 @@
+# Generated by Django 3.0.2 on 2026-10-18 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='sync_digest',
+            field=models.CharField(db_index=True, default='', max_length=40),
+        ),
+    ]
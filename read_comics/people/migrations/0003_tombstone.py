@@ -0,0 +1,23 @@
+# Generated by Django 3.0.2 on 2026-10-18 14:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0002_person_sync_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='deleted_dt',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='is_deleted',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+    ]
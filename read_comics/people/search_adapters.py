@@ -1,14 +1,13 @@
 from watson import search as watson
-from django.utils.html import strip_tags
 
 
 class PersonSearchAdapter(watson.SearchAdapter):
 
     def get_title(self, obj):
-        return obj.name + "\n" + obj.aliases
+        return "\n".join(filter(None, (obj.name, obj.aliases)))
 
     def get_description(self, obj):
-        return obj.short_description
+        return obj.short_description or ""
 
     def get_content(self, obj):
-        return strip_tags(obj.html_description)
+        return obj.plain_description or ""
@@ -10,7 +10,7 @@ class PublishersConfig(AppConfig):
     def ready(self):
         publisher_model = self.get_model('Publisher')
         watson.register(
-            publisher_model,
+            publisher_model.objects.live(),
             search_adapters.PublisherSearchAdapter,
             store=('name', 'short_description', 'thumb_url')
         )
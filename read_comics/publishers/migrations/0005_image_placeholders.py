@@ -0,0 +1,28 @@
+# Generated by Django 3.0.2 on 2026-10-18 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publishers', '0004_plain_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publisher',
+            name='image_height',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='publisher',
+            name='image_placeholder',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='publisher',
+            name='image_width',
+            field=models.PositiveIntegerField(null=True),
+        ),
+    ]
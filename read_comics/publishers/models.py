@@ -9,9 +9,15 @@ class Publisher(ComicvineSyncModel):
     aliases = models.TextField(null=True)
     short_description = models.TextField(null=True)
     html_description = models.TextField(null=True)
+    # Derived from html_description on write
+    plain_description = models.TextField(null=True)
 
     thumb_url = models.URLField(max_length=1000, null=True)
     image_url = models.URLField(max_length=1000, null=True)
+    # Intrinsic size and placeholder of thumb_url image, filled when image proxy fetches it
+    image_width = models.PositiveIntegerField(null=True)
+    image_height = models.PositiveIntegerField(null=True)
+    image_placeholder = models.TextField(blank=True, default="")
 
     slug = AutoSlugField(populate_from=["name"], slugify_function=slugify_function)
 
@@ -0,0 +1,21 @@
+import pytest
+from django.urls import reverse
+
+from read_comics.publishers.models import Publisher
+from read_comics.utils.tests.factories import publisher_record
+
+pytestmark = pytest.mark.django_db
+
+
+def test_publisher_list_view(client):
+    Publisher.bulk_sync([publisher_record(1, name="Marvel", thumb_url="https://cv/marvel.png"),
+                         publisher_record(2, name="DC Comics")])
+    Publisher.objects.filter(comicvine_id=1).update(image_width=200, image_height=100,
+                                                    image_placeholder="data:image/webp;base64,AAAA")
+
+    response = client.get(reverse("publishers:list"))
+
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert 'width="200" height="100" style="background: url(data:image/webp;base64,AAAA)' in content
+    assert "DC Comics" in content
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from read_comics.publishers.views import publisher_list_view
+
+app_name = "publishers"
+urlpatterns = [
+    path("", view=publisher_list_view, name="list"),
+]
@@ -1,3 +1,14 @@
-from django.shortcuts import render  # noqa
+from django.urls import reverse_lazy
+from django.views.generic import ListView
 
-# Create your views here.
+from utils.view_mixins import BreadcrumbMixin
+from .models import Publisher
+
+
+class PublisherListView(BreadcrumbMixin, ListView):
+    queryset = Publisher.objects.live()
+    paginate_by = 48
+    breadcrumb = [{'url': reverse_lazy("publishers:list"), 'text': "Publishers"}]
+
+
+publisher_list_view = PublisherListView.as_view()
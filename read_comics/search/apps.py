@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    name = 'read_comics.search'
+    verbose_name = "Search"
+
+    def ready(self):
+        import read_comics.search.signals  # noqa F401
@@ -0,0 +1,89 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from read_comics.sync.matching import normalize_name
+from utils import logging
+from utils.models import _batches
+from .indexing import get_index_queryset
+from .models import AutocompleteEntry
+
+logger = logging.getLogger(__name__)
+
+AUTOCOMPLETE_BATCH_SIZE = 1000
+# Suggestions for words inside of long names are not worth their index rows
+MAX_WORD_SUFFIXES = 5
+TERM_MAX_LENGTH = AutocompleteEntry._meta.get_field("term").max_length
+
+
+def get_terms(name, aliases):
+    """
+    Normalized name and aliases with their word suffixes, so "man" suggests "Spider-Man"
+    """
+    terms = set()
+    for text in [name] + (aliases or "").split("\n"):
+        words = normalize_name(text or "").split()
+        for i in range(min(len(words), MAX_WORD_SUFFIXES)):
+            terms.add(" ".join(words[i:])[:TERM_MAX_LENGTH])
+    return terms
+
+
+def build_entries(model, queryset):
+    content_type = ContentType.objects.get_for_model(model)
+    rows = queryset.values_list("pk", "name", "aliases", "slug", "thumb_url").iterator()
+    for pk, name, aliases, slug, thumb_url in rows:
+        for term in get_terms(name, aliases):
+            yield AutocompleteEntry(content_type=content_type, object_id=pk, term=term, name=name or "", slug=slug,
+                                    thumb_url=thumb_url)
+
+
+def update_autocomplete(model, pks):
+    """
+    Replaces entries of given rows, rows which are gone or not live just lose their entries
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    for batch in _batches(pks, AUTOCOMPLETE_BATCH_SIZE):
+        with transaction.atomic():
+            AutocompleteEntry.objects.filter(content_type=content_type, object_id__in=batch).delete()
+            AutocompleteEntry.objects.bulk_create(
+                build_entries(model, get_index_queryset(model).filter(pk__in=batch)), batch_size=AUTOCOMPLETE_BATCH_SIZE
+            )
+
+
+@logging.logged(logger)
+def rebuild_autocomplete(model):
+    content_type = ContentType.objects.get_for_model(model)
+    with transaction.atomic():
+        AutocompleteEntry.objects.filter(content_type=content_type).delete()
+        AutocompleteEntry.objects.bulk_create(
+            build_entries(model, get_index_queryset(model)), batch_size=AUTOCOMPLETE_BATCH_SIZE
+        )
+
+
+def suggest(prefix, models=None, limit=10):
+    """
+    Up to ``limit`` distinct rows whose name, alias or their word starts with prefix, as dicts of
+    model label, id, name, slug and thumb_url
+    """
+    term = normalize_name(prefix)[:TERM_MAX_LENGTH]
+    if not term:
+        return []
+    entries = AutocompleteEntry.objects.filter(term__startswith=term).order_by("term")
+    if models:
+        entries = entries.filter(content_type__in=ContentType.objects.get_for_models(*models).values())
+    suggestions = {}
+    # Rows may match with several terms, so some extra entries are fetched
+    for content_type_id, object_id, name, slug, thumb_url in entries.values_list(
+        "content_type_id", "object_id", "name", "slug", "thumb_url"
+    )[:limit * 3]:
+        key = (content_type_id, object_id)
+        if key not in suggestions:
+            suggestions[key] = {
+                "model": ContentType.objects.get_for_id(content_type_id).model_class()._meta.label,
+                "id": object_id,
+                "name": name,
+                "slug": slug,
+                "thumb_url": thumb_url,
+            }
+        if len(suggestions) == limit:
+            break
+    return list(suggestions.values())
@@ -0,0 +1,211 @@
+import random
+import time
+from collections import namedtuple
+
+from django.db import connections, router
+from watson.models import SearchEntry
+
+from read_comics.characters.models import Character
+from read_comics.people.models import Person
+from read_comics.publishers.models import Publisher
+from read_comics.sync.telemetry import percentile
+from utils import logging
+from utils.models import _batches
+from utils.search import remove_from_search_index
+from .cache import search
+from .indexing import rebuild_index
+
+logger = logging.getLogger(__name__)
+
+# Far above real Comicvine ids, so synthetic rows never clash with synced ones
+SYNTHETIC_ID_BASE = 1000000000
+GENERATE_BATCH_SIZE = 2000
+
+# Shares of catalog rows, close to Comicvine proportions
+CATALOG_SHARES = (
+    (Publisher, 0.05),
+    (Person, 0.45),
+    (Character, 0.5),
+)
+
+SYLLABLES = (
+    "ka", "ro", "mi", "tan", "vel", "dor", "shi", "bra", "zo", "len", "cor", "ith", "mar", "ver", "qua", "ny",
+    "sto", "rek", "al", "fen", "gri", "mo", "tha", "ux", "bel", "dra", "kin", "sol", "nor", "ja",
+)
+TITLES = ("Captain", "Doctor", "Mister", "Lady", "Professor", "Agent", "Baron", "Kid", "Iron", "Black", "Silver",
+          "Night", "Star", "Shadow", "Golden", "Red")
+NOUNS = ("Man", "Woman", "Hawk", "Knight", "Wolf", "Storm", "Fist", "Ghost", "Flame", "Arrow", "Spider", "Lantern",
+         "Witch", "Blade", "Comet", "Tiger")
+PUBLISHER_SUFFIXES = ("Comics", "Press", "Publishing", "Entertainment", "Studios", "Books")
+WORDS = ("the", "of", "and", "in", "a", "was", "first", "appeared", "issue", "series", "team", "powers", "city",
+         "origin", "battle", "secret", "identity", "villain", "hero", "universe", "writer", "artist", "created",
+         "later", "joined", "after", "years", "world", "against", "story", "arc", "cover", "edition", "volume")
+
+# Fixed query mix: frequent and rare words, multi-word names and queries without matches
+QUERY_MIX = (
+    "man",
+    "captain",
+    "spider woman",
+    "doctor storm",
+    "shadow knight",
+    "comics",
+    "press",
+    "origin",
+    "secret identity",
+    "karo",
+    "velmi",
+    "zo dor",
+    "nonexistent query",
+    "xyzzy",
+)
+
+BenchmarkReport = namedtuple("BenchmarkReport", ["rows", "entries", "index_bytes", "queries", "p50", "p95", "p99"])
+
+
+def _word(rng, min_syllables=2, max_syllables=3):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(min_syllables, max_syllables))).capitalize()
+
+
+def _hero_name(rng):
+    if rng.random() < 0.5:
+        return "%s %s" % (rng.choice(TITLES), rng.choice(NOUNS))
+    return "%s%s" % (_word(rng, 1, 2), rng.choice(NOUNS).lower())
+
+
+def _sentence(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(6, 18))]
+    words[0] = words[0].capitalize()
+    return " ".join(words) + "."
+
+
+def _html_description(rng):
+    # Description lengths are heavy-tailed: most are a couple of paragraphs, some are long articles
+    size = min(int(rng.lognormvariate(7, 1)), 60000)
+    parts = []
+    length = 0
+    while length < size:
+        if rng.random() < 0.15:
+            part = "<h2>%s</h2>" % " ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(1, 3)))
+        else:
+            part = "<p>%s</p>" % " ".join(_sentence(rng) for _ in range(rng.randint(2, 6)))
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+
+def _aliases(rng, name_function):
+    count = rng.choice((0, 0, 0, 1, 1, 2, 3, 5))
+    return "\n".join(name_function(rng) for _ in range(count))
+
+
+def _person_name(rng):
+    return "%s %s" % (_word(rng), _word(rng, 2, 4))
+
+
+def _publisher_name(rng):
+    return "%s %s" % (_word(rng), rng.choice(PUBLISHER_SUFFIXES))
+
+
+NAME_FUNCTIONS = {
+    Publisher: _publisher_name,
+    Person: _person_name,
+    Character: _hero_name,
+}
+
+
+def synthetic_record(model, number, seed=0):
+    """
+    Record of ``number``-th synthetic row of model, the same for the same seed
+    """
+    rng = random.Random("%s:%s:%d" % (seed, model._meta.label, number))
+    name_function = NAME_FUNCTIONS[model]
+    comicvine_id = SYNTHETIC_ID_BASE + number
+    return {
+        "comicvine_id": comicvine_id,
+        "comicvine_url": "https://comicvine.gamespot.com/%s/4000-%d/" % (model._meta.model_name, comicvine_id),
+        "name": name_function(rng),
+        "aliases": _aliases(rng, name_function),
+        "short_description": _sentence(rng),
+        "html_description": _html_description(rng),
+    }
+
+
+def get_synthetic_queryset(model):
+    return model._default_manager.filter(comicvine_id__gte=SYNTHETIC_ID_BASE)
+
+
+@logging.logged(logger)
+def generate_catalog(total, seed=0, workers=None, batch_size=GENERATE_BATCH_SIZE):
+    """
+    Grows synthetic catalog to ``total`` rows split between models by ``CATALOG_SHARES``, then rebuilds
+    search index. Rows are numbered, so generating bigger catalog with the same seed only adds rows.
+    Returns dict of model label -> created rows count.
+    """
+    created = {}
+    for model, share in CATALOG_SHARES:
+        target = int(total * share)
+        existing = get_synthetic_queryset(model).count()
+        records = (synthetic_record(model, number, seed) for number in range(existing, target))
+        result = model.bulk_sync(records, batch_size=batch_size, index=False)
+        created[model._meta.label] = result.inserted
+        logger.info("%s: %d synthetic rows created" % (model._meta.label, result.inserted))
+    if any(created.values()):
+        rebuild_index([model for model, _ in CATALOG_SHARES], workers=workers)
+    return created
+
+
+@logging.logged(logger)
+def delete_catalog(batch_size=GENERATE_BATCH_SIZE):
+    """
+    Deletes synthetic rows with their search and autocomplete entries. Returns dict of model label -> deleted
+    rows count.
+    """
+    deleted = {}
+    for model, _ in CATALOG_SHARES:
+        pks = list(get_synthetic_queryset(model).values_list("pk", flat=True))
+        for batch in _batches(pks, batch_size):
+            model._default_manager.filter(pk__in=batch).delete()
+        remove_from_search_index(model, pks)
+        deleted[model._meta.label] = len(pks)
+    return deleted
+
+
+def get_index_size(using=None):
+    """
+    Count of search entries and size of their table with indexes in bytes (None if not known for backend)
+    """
+    using = using or router.db_for_read(SearchEntry)
+    entries = SearchEntry.objects.using(using).count()
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return entries, None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_total_relation_size(%s)", [SearchEntry._meta.db_table])
+        return entries, cursor.fetchone()[0]
+
+
+@logging.logged(logger)
+def benchmark_search(queries=QUERY_MIX, repeat=5, limit=20):
+    """
+    Runs every query of the mix ``repeat`` times through uncached watson search after one warm-up pass.
+    Returns BenchmarkReport with latency percentiles in seconds.
+    """
+    for query in queries:
+        search(query, limit=limit)
+    latencies = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.monotonic()
+            search(query, limit=limit)
+            latencies.append(time.monotonic() - started)
+    rows = sum(model._default_manager.live().count() for model, _ in CATALOG_SHARES)
+    entries, index_bytes = get_index_size()
+    return BenchmarkReport(
+        rows=rows,
+        entries=entries,
+        index_bytes=index_bytes,
+        queries=len(latencies),
+        p50=percentile(latencies, 50),
+        p95=percentile(latencies, 95),
+        p99=percentile(latencies, 99),
+    )
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from watson import search as watson
+
+GENERATION_KEY = "search:generation:%s"
+RESULTS_KEY = "search:results:%s"
+HITS_KEY = "search:stats:hits"
+MISSES_KEY = "search:stats:misses"
+
+
+def get_cache():
+    return caches[settings.SEARCH_CACHE_ALIAS]
+
+
+def normalize_query(query):
+    return " ".join(query.lower().split())
+
+
+def _incr(cache, key, initial=0):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, initial, timeout=None)
+        return cache.incr(key)
+
+
+def bump_generation(model):
+    """
+    Makes all cached results including model rows stale
+    """
+    # Evicted counter starts from current time, so it never returns to already used values
+    _incr(get_cache(), GENERATION_KEY % model._meta.label, initial=int(time.time() * 1000))
+
+
+def get_generations(models):
+    cache = get_cache()
+    keys = [GENERATION_KEY % model._meta.label for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, int(time.time() * 1000), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def get_search_key(query, models, *params):
+    """
+    Key of normalized query, searched models, other params (e.g. limit and cursor) and current
+    generations of searched models
+    """
+    models = sorted(models, key=lambda model: model._meta.label)
+    labels = [model._meta.label for model in models]
+    generations = get_generations(models)
+    data = json.dumps([normalize_query(query), labels, list(params), generations])
+    return RESULTS_KEY % hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def get_result(entry):
+    return {
+        "model": entry.content_type.model_class()._meta.label,
+        "pk": entry.object_id_int,
+        "title": entry.title,
+        "description": entry.description,
+        "url": entry.url,
+        "meta": entry.meta,
+    }
+
+
+def search(query, models=None, limit=20, offset=0):
+    """
+    Full-text search results as list of dicts (model label, object pk, title, description, url and stored meta)
+    """
+    entries = watson.search(normalize_query(query), models=tuple(models or ()))
+    return [get_result(entry) for entry in entries.select_related("content_type")[offset:offset + limit]]
+
+
+def get_cached(key, compute):
+    """
+    Value cached under ``key`` for ``SEARCH_CACHE_TTL`` seconds, ``compute()`` fills it on miss.
+    Hits and misses are counted for ``search_cache_stats``.
+    """
+    cache = get_cache()
+    value = cache.get(key)
+    if value is not None:
+        _incr(cache, HITS_KEY)
+        return value
+    _incr(cache, MISSES_KEY)
+    value = compute()
+    cache.set(key, value, settings.SEARCH_CACHE_TTL)
+    return value
+
+
+def get_stats():
+    cache = get_cache()
+    stats = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits, misses = stats.get(HITS_KEY, 0), stats.get(MISSES_KEY, 0)
+    return {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else 0}
+
+
+def reset_stats():
+    get_cache().delete_many([HITS_KEY, MISSES_KEY])
@@ -0,0 +1,142 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from watson import search as watson
+
+from utils import logging
+from utils.search import refresh_search_entries, remove_from_search_index
+from .models import PendingSearchUpdate
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 500
+FLUSH_SCHEDULED_KEY = "search:flush-scheduled"
+
+_context = threading.local()
+
+
+def is_deferred():
+    return settings.SEARCH_INDEX_MODE == "deferred"
+
+
+def is_collecting():
+    """
+    Whether saves are collected by deferred context now
+    """
+    return bool(_get_stack())
+
+
+def mark_dirty(model, pks, using=None):
+    """
+    Queues search entries of given rows for refresh. Flush task is scheduled once per
+    ``SEARCH_INDEX_FLUSH_DELAY`` seconds, so a burst of writes is indexed in one go.
+    """
+    content_type = ContentType.objects.db_manager(using).get_for_model(model)
+    pks = set(pks)
+    if not pks:
+        return
+    # Already queued rows get newer version, so flush reading the older one keeps them queued
+    PendingSearchUpdate.objects.using(using).filter(content_type=content_type, object_id__in=pks).update(
+        version=F("version") + 1
+    )
+    updates = [PendingSearchUpdate(content_type=content_type, object_id=pk) for pk in pks]
+    PendingSearchUpdate.objects.using(using).bulk_create(updates, batch_size=FLUSH_BATCH_SIZE,
+                                                         ignore_conflicts=True)
+    transaction.on_commit(schedule_flush, using=using)
+
+
+def schedule_flush():
+    delay = settings.SEARCH_INDEX_FLUSH_DELAY
+    if cache.add(FLUSH_SCHEDULED_KEY, True, delay):
+        from .tasks import flush_search_index
+
+        flush_search_index.apply_async(countdown=delay)
+
+
+def _get_stack():
+    if not hasattr(_context, "stack"):
+        _context.stack = []
+    return _context.stack
+
+
+def collect_saved(sender, instance, **kwargs):
+    """
+    Collects saved rows of registered models while deferred context is active, called on post_save
+    """
+    stack = _get_stack()
+    if stack and watson.default_search_engine.is_registered(sender):
+        stack[-1]["objects"][sender].add(instance.pk)
+
+
+def invalidate():
+    """
+    Discards rows collected by current deferred context, e.g. when request failed and its transaction
+    was rolled back
+    """
+    stack = _get_stack()
+    if stack:
+        stack[-1]["invalid"] = True
+
+
+@contextmanager
+def defer_index_update():
+    """
+    Saves of registered models inside block are queued for indexing instead of indexed inline
+    """
+    stack = _get_stack()
+    stack.append({"objects": defaultdict(set), "invalid": False})
+    # Watson context collects the same saves, it is discarded so watson doesn't index them
+    watson.search_context_manager.start()
+    try:
+        yield
+    except Exception:
+        invalidate()
+        raise
+    finally:
+        watson.search_context_manager.invalidate()
+        watson.search_context_manager.end()
+        context = stack.pop()
+        if not context["invalid"]:
+            for model, pks in context["objects"].items():
+                mark_dirty(model, pks)
+
+
+@logging.logged(logger)
+def flush_pending(batch_size=FLUSH_BATCH_SIZE):
+    """
+    Refreshes search entries of queued rows in batches and returns count of refreshed rows.
+    Entries of rows which are gone or not live anymore are removed. Updates queued again while
+    their batch was indexed have newer version and stay queued.
+    """
+    flushed = 0
+    while True:
+        with transaction.atomic():
+            # Concurrent flushes take different batches
+            batch = list(PendingSearchUpdate.objects.select_for_update(skip_locked=True).order_by("pk")[:batch_size])
+            if not batch:
+                return flushed
+            pks = defaultdict(set)
+            for update in batch:
+                pks[update.content_type_id].add(update.object_id)
+            for content_type_id, model_pks in pks.items():
+                model = ContentType.objects.get_for_id(content_type_id).model_class()
+                if model is None or not watson.default_search_engine.is_registered(model):
+                    continue
+                queryset = watson.default_search_engine.get_adapter(model).get_live_queryset()
+                if queryset is None:
+                    queryset = model._default_manager.all()
+                live = set(queryset.filter(pk__in=model_pks).values_list("pk", flat=True))
+                refresh_search_entries(model, live)
+                remove_from_search_index(model, model_pks - live)
+            versions = defaultdict(list)
+            for update in batch:
+                versions[update.version].append(update.pk)
+            for version, update_pks in versions.items():
+                PendingSearchUpdate.objects.filter(pk__in=update_pks, version=version).delete()
+        flushed += len(batch)
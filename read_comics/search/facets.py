@@ -0,0 +1,70 @@
+import hashlib
+import json
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+from watson import search as watson
+
+from read_comics.people.models import Person
+from .cache import get_cache, get_generations, normalize_query, search
+
+FACETS_KEY = "search:facets:%s"
+PERSON_FACETS = ("country", "hometown", "decade")
+FACET_LIMIT = 20
+
+
+def filter_people(queryset, country=None, hometown=None, decade=None):
+    if country:
+        queryset = queryset.filter(country=country)
+    if hometown:
+        queryset = queryset.filter(hometown=hometown)
+    if decade is not None:
+        queryset = queryset.filter(birth_date__year__gte=decade, birth_date__year__lt=decade + 10)
+    return queryset
+
+
+def count_person_facets(queryset, limit=FACET_LIMIT):
+    """
+    Counts of rows per country, hometown and birth decade, from one grouped query.
+    Facet values are ordered by count, rows with unknown value are not counted.
+    """
+    counters = {name: Counter() for name in PERSON_FACETS}
+    rows = queryset.order_by().values("country", "hometown", birth_year=ExtractYear("birth_date")).annotate(
+        count=Count("pk")
+    )
+    for row in rows:
+        if row["country"]:
+            counters["country"][row["country"]] += row["count"]
+        if row["hometown"]:
+            counters["hometown"][row["hometown"]] += row["count"]
+        if row["birth_year"] is not None:
+            counters["decade"][row["birth_year"] // 10 * 10] += row["count"]
+    return {
+        name: [
+            {"value": value, "count": count}
+            for value, count in sorted(counter.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        ]
+        for name, counter in counters.items()
+    }
+
+
+def faceted_person_search(query, country=None, hometown=None, decade=None, limit=20, offset=0):
+    """
+    People search results with facet counts of all matching people, narrowed by given facet values.
+    Cached by query and filters until people rows change.
+    """
+    query = normalize_query(query)
+    cache = get_cache()
+    data = json.dumps([query, country, hometown, decade, limit, offset, get_generations([Person])])
+    key = FACETS_KEY % hashlib.sha1(data.encode("utf-8")).hexdigest()
+    response = cache.get(key)
+    if response is None:
+        queryset = filter_people(Person.objects.live(), country, hometown, decade)
+        response = {
+            "results": search(query, [queryset], limit, offset),
+            "facets": count_person_facets(watson.filter(queryset, query, ranking=False)),
+        }
+        cache.set(key, response, settings.SEARCH_CACHE_TTL)
+    return response
@@ -0,0 +1,125 @@
+import os
+import time
+from collections import namedtuple
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Max, Min
+from watson import search as watson
+from watson.models import SearchEntry, has_int_pk
+
+from utils import logging
+from utils.processes import run_chunks
+from utils.signals import search_entries_changed
+
+logger = logging.getLogger(__name__)
+
+REBUILD_CHUNK_SIZE = 2000
+INSERT_BATCH_SIZE = 500
+
+ChunkResult = namedtuple("ChunkResult", ["model", "worker", "rows", "seconds"])
+
+
+def get_index_queryset(model, since=None):
+    """
+    Rows of model that belong to search index, optionally only modified since given datetime
+    """
+    queryset = watson.default_search_engine.get_adapter(model).get_live_queryset()
+    if queryset is None:
+        queryset = model._default_manager.all()
+    if since is not None:
+        queryset = queryset.filter(modified_dt__gte=since)
+    return queryset
+
+
+def get_entries_queryset(model):
+    engine = watson.default_search_engine
+    return SearchEntry.objects.filter(engine_slug=engine._engine_slug,
+                                      content_type=ContentType.objects.get_for_model(model))
+
+
+def get_pk_ranges(queryset, chunk_size=REBUILD_CHUNK_SIZE):
+    """
+    Half-open ``[low, high)`` primary key ranges covering queryset
+    """
+    bounds = queryset.aggregate(low=Min("pk"), high=Max("pk"))
+    if bounds["low"] is None:
+        return []
+    end = bounds["high"] + 1
+    return [(low, min(low + chunk_size, end)) for low in range(bounds["low"], end, chunk_size)]
+
+
+def build_search_entries(model, objects):
+    """
+    Unsaved search entries of objects, same as watson builds them one by one on save
+    """
+    engine = watson.default_search_engine
+    adapter = engine.get_adapter(model)
+    content_type = ContentType.objects.get_for_model(model)
+    for obj in objects:
+        yield SearchEntry(
+            engine_slug=engine._engine_slug,
+            content_type=content_type,
+            object_id=str(obj.pk),
+            object_id_int=obj.pk,
+            title=adapter.get_title(obj),
+            description=adapter.get_description(obj),
+            content=adapter.get_content(obj),
+            url=adapter.get_url(obj),
+            meta_encoded=adapter.serialize_meta(obj),
+        )
+
+
+def reindex_range(model_label, low, high, since=None):
+    """
+    Replaces search entries of model rows with primary keys in ``[low, high)``.
+    Full rebuild (no ``since``) also drops entries of rows which are gone or not live anymore.
+    """
+    started = time.monotonic()
+    model = apps.get_model(model_label)
+    objects = list(get_index_queryset(model, since).filter(pk__gte=low, pk__lt=high))
+    entries = list(build_search_entries(model, objects))
+    with transaction.atomic():
+        stale = get_entries_queryset(model)
+        if since is None:
+            stale = stale.filter(object_id_int__gte=low, object_id_int__lt=high)
+        else:
+            stale = stale.filter(object_id_int__in=[obj.pk for obj in objects])
+        stale.delete()
+        SearchEntry.objects.bulk_create(entries, batch_size=INSERT_BATCH_SIZE)
+    return ChunkResult(model_label, os.getpid(), len(objects), time.monotonic() - started)
+
+
+@logging.logged(logger)
+def rebuild_index(models=None, since=None, workers=None, chunk_size=REBUILD_CHUNK_SIZE):
+    """
+    Rebuilds watson entries of registered models in primary key chunks, in a pool of ``workers``
+    processes (CPU count by default, 0 builds in current process). Returns list of ChunkResult.
+    """
+    models = list(models or watson.default_search_engine.get_registered_models())
+    for model in models:
+        if not has_int_pk(model):
+            raise ValueError("%s has no integer primary key" % model._meta.label)
+
+    chunks, reindexed = [], {}
+    for model in models:
+        ranges = get_pk_ranges(get_index_queryset(model, since), chunk_size)
+        if since is not None:
+            # Partial rebuild reports its rows, so listeners don't rebuild everything they keep of the model
+            reindexed[model] = list(get_index_queryset(model, since).values_list("pk", flat=True))
+        else:
+            # Entries of rows outside of current primary key span
+            stale = get_entries_queryset(model)
+            if ranges:
+                stale = stale.exclude(object_id_int__gte=ranges[0][0], object_id_int__lt=ranges[-1][1])
+            stale.delete()
+        chunks += [(model._meta.label, low, high, since) for low, high in ranges]
+
+    results = []
+    for result in run_chunks(reindex_range, chunks, workers):
+        logger.info("%s: %d rows indexed by worker %d" % (result.model, result.rows, result.worker))
+        results.append(result)
+    for model in models:
+        search_entries_changed.send(sender=model, pks=reindexed.get(model))
+    return results
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from read_comics.search.benchmark import benchmark_search, delete_catalog, generate_catalog
+
+
+def format_size(value):
+    if value is None:
+        return "n/a"
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return "%.1f %s" % (value, unit)
+        value /= 1024
+    return "%.1f GB" % value
+
+
+class Command(BaseCommand):
+    help = "Reports watson search latency percentiles and index size for a fixed query mix."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", metavar="ROWS",
+                            help="Grow synthetic catalog to each size in turn and benchmark it, "
+                                 "e.g. --sizes 10000 100000 1000000")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs of query mix per benchmark")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--workers", type=int, help="Search index rebuild processes, CPU count by default")
+
+    def handle(self, *args, **options):
+        # Synthetic rows are committed, as index rebuild workers use their own connections, so they are
+        # deleted afterwards even if benchmark fails
+        try:
+            for size in sorted(options["sizes"] or [None]):
+                if size is not None:
+                    generate_catalog(size, options["seed"], options["workers"])
+                report = benchmark_search(repeat=options["repeat"])
+                self.stdout.write(
+                    "%d rows, %d entries, index %s: %d queries, p50 %.1fms, p95 %.1fms, p99 %.1fms" % (
+                        report.rows, report.entries, format_size(report.index_bytes), report.queries,
+                        report.p50 * 1000, report.p95 * 1000, report.p99 * 1000,
+                    )
+                )
+        finally:
+            if options["sizes"]:
+                delete_catalog()
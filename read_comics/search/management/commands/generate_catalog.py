@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from read_comics.search.benchmark import GENERATE_BATCH_SIZE, generate_catalog
+
+
+class Command(BaseCommand):
+    help = "Grows synthetic catalog of publishers, people and characters to given rows count, without network."
+
+    def add_arguments(self, parser):
+        parser.add_argument("count", type=int, help="Total synthetic rows")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--workers", type=int, help="Search index rebuild processes, CPU count by default")
+        parser.add_argument("--batch-size", type=int, default=GENERATE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        created = generate_catalog(options["count"], options["seed"], options["workers"], options["batch_size"])
+        for label, count in created.items():
+            self.stdout.write("%s: %d rows created" % (label, count))
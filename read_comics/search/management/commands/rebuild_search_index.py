@@ -0,0 +1,50 @@
+import datetime
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from read_comics.search.indexing import REBUILD_CHUNK_SIZE, rebuild_index
+
+
+def parse_since(value):
+    since = parse_datetime(value)
+    if since is None:
+        date = parse_date(value)
+        if date is None:
+            raise CommandError("Invalid --since value: %s" % value)
+        since = datetime.datetime.combine(date, datetime.time())
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+class Command(BaseCommand):
+    help = "Rebuilds watson search index in parallel primary key chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", action="append", dest="models", metavar="LABEL",
+                            help="Rebuild only given model, e.g. people.Person")
+        parser.add_argument("--since", help="Reindex only rows with modified_dt since given date or datetime")
+        parser.add_argument("--workers", type=int, help="Worker processes, CPU count by default")
+        parser.add_argument("--chunk-size", type=int, default=REBUILD_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        models = [apps.get_model(label) for label in options["models"]] if options["models"] else None
+        since = parse_since(options["since"]) if options["since"] else None
+
+        started = time.monotonic()
+        results = rebuild_index(models, since, options["workers"], options["chunk_size"])
+        seconds = time.monotonic() - started
+
+        workers = defaultdict(lambda: [0, 0.0])
+        for result in results:
+            workers[result.worker][0] += result.rows
+            workers[result.worker][1] += result.seconds
+        for worker, (rows, busy) in sorted(workers.items()):
+            self.stdout.write("Worker %d: %d rows, %.0f rows/s" % (worker, rows, rows / busy if busy else 0))
+        rows = sum(result.rows for result in results)
+        self.stdout.write("Total: %d rows in %.1fs, %.0f rows/s" % (rows, seconds, rows / seconds if seconds else 0))
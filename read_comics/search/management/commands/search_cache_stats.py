@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from read_comics.search.cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = "Shows search result cache hits and misses."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", default=False, help="Reset counters after showing")
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        self.stdout.write("Hits: %(hits)d, misses: %(misses)d, hit rate: %(hit_rate).1f%%" % dict(
+            stats, hit_rate=stats["hit_rate"] * 100
+        ))
+        if options["reset"]:
+            reset_stats()
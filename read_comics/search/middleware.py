@@ -0,0 +1,26 @@
+from watson.search import search_context_manager
+
+from .deferred import defer_index_update, invalidate, is_deferred
+
+
+class SearchContextMiddleware:
+    """
+    Replacement of watson middleware. Rows saved during request are indexed after response in sync
+    ``SEARCH_INDEX_MODE`` (as watson does) or queued for Celery worker in deferred mode.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if is_deferred():
+            with defer_index_update():
+                return self.get_response(request)
+        with search_context_manager.update_index():
+            return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if is_deferred():
+            invalidate()
+        else:
+            search_context_manager.invalidate()
@@ -0,0 +1,35 @@
+# Generated by Django 3.0.2 on 2026-10-18 14:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutocompleteEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('term', models.CharField(max_length=255)),
+                ('name', models.TextField()),
+                ('slug', models.CharField(max_length=255)),
+                ('thumb_url', models.URLField(max_length=1000, null=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.ContentType')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='autocompleteentry',
+            index=models.Index(fields=['term'], name='search_autocomplete_term', opclasses=['text_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='autocompleteentry',
+            index=models.Index(fields=['content_type', 'object_id'], name='search_autocomplete_object'),
+        ),
+    ]
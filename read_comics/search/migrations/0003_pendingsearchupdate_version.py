@@ -0,0 +1,18 @@
+# Generated by Django 3.0.2 on 2026-10-18 15:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_autocompleteentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pendingsearchupdate',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
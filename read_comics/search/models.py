@@ -0,0 +1,44 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class PendingSearchUpdate(models.Model):
+    """
+    Row whose search entry must be refreshed by deferred indexing. Repeated edits of the same row
+    collapse into one pending update, each of them bumps its ``version``.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    version = models.PositiveIntegerField(default=0)
+
+    created_dt = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("content_type", "object_id")
+
+    def __str__(self):
+        return "[PendingSearchUpdate] %s %d" % (self.content_type_id, self.object_id)
+
+
+class AutocompleteEntry(models.Model):
+    """
+    Prefix index entry: normalized name, alias or their word suffix of a catalog row with data
+    to render the suggestion without loading the row
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    term = models.CharField(max_length=255)
+
+    name = models.TextField()
+    slug = models.CharField(max_length=255)
+    thumb_url = models.URLField(max_length=1000, null=True)
+
+    class Meta:
+        indexes = [
+            # Lets LIKE 'prefix%' use the index regardless of database collation
+            models.Index(fields=["term"], name="search_autocomplete_term", opclasses=["text_pattern_ops"]),
+            models.Index(fields=["content_type", "object_id"], name="search_autocomplete_object"),
+        ]
+
+    def __str__(self):
+        return "[AutocompleteEntry] %s" % self.term
@@ -0,0 +1,87 @@
+import base64
+import json
+from collections import namedtuple
+from functools import partial
+
+from django.conf import settings
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from watson import search as watson
+from watson.backends import PostgresSearchBackend, regex_from_word
+
+from .cache import get_cached, get_result, get_search_key, normalize_query
+
+RankedPage = namedtuple("RankedPage", ["results", "next_cursor"])
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(rank, pk):
+    return base64.urlsafe_b64encode(json.dumps([rank, pk]).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        rank, pk = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(rank), int(pk)
+    except (ValueError, TypeError) as e:
+        raise CursorError("Invalid cursor: %s" % cursor) from e
+
+
+def get_rank_expression(query, backend=None):
+    """
+    Rank of search entry by ``SEARCH_RANK_WEIGHTS`` of fields matching query words
+    """
+    backend = backend or watson.get_backend()
+    weights = settings.SEARCH_RANK_WEIGHTS
+    if isinstance(backend, PostgresSearchBackend):
+        # Watson stores title with weight A, description with C and content with D, ts_rank_cd takes {D, C, B, A}
+        # Double precision rank survives cursor round trip exactly
+        return RawSQL(
+            "ts_rank_cd(%s::real[], watson_searchentry.search_tsv, to_tsquery(%s::regconfig, %s))::float8",
+            ([weights["content"], weights["description"], 0, weights["title"]], backend.search_config,
+             backend.escape_postgres_query(query)),
+            output_field=FloatField()
+        )
+    rank = Value(0.0, output_field=FloatField())
+    for word in query.split():
+        regex = regex_from_word(word)
+        for field, weight in weights.items():
+            rank = rank + Case(When(**{"%s__iregex" % field: regex, "then": Value(weight)}),
+                               default=Value(0.0), output_field=FloatField())
+    return rank
+
+
+def ranked_search(query, models=None, limit=20, cursor=None):
+    """
+    Search results ordered by weighted rank, title matches first, then description and content ones.
+
+    Pages are fetched after ``(rank, entry id)`` keyset ``cursor`` instead of offset, so deep pages don't
+    read and drop all preceding results. Returns RankedPage, ``next_cursor`` is None on the last page.
+    """
+    query = normalize_query(query)
+    models = tuple(models or watson.default_search_engine.get_registered_models())
+    entries = watson.search(query, models=models, ranking=False).annotate(
+        rank=get_rank_expression(query)
+    ).order_by("-rank", "-pk")
+    if cursor:
+        rank, pk = decode_cursor(cursor)
+        entries = entries.filter(Q(rank__lt=rank) | Q(rank=rank, pk__lt=pk))
+    page = list(entries.select_related("content_type")[:limit + 1])
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1].rank, page[-1].pk)
+    return RankedPage([dict(get_result(entry), rank=entry.rank) for entry in page], next_cursor)
+
+
+def cached_ranked_search(query, models=None, limit=20, cursor=None):
+    """
+    ``ranked_search`` page cached by query, models, limit and cursor. Saves and bulk syncs of any
+    searched model bump its generation, so cached pages become unreachable at once.
+    """
+    models = list(models or watson.default_search_engine.get_registered_models())
+    key = get_search_key(query, models, limit, cursor)
+    return get_cached(key, partial(ranked_search, query, models, limit, cursor))
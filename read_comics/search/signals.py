@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from utils.models import ComicvineSyncModel
+from utils.signals import bulk_synced, search_entries_changed
+from .autocomplete import rebuild_autocomplete, update_autocomplete
+from .cache import bump_generation
+from .deferred import collect_saved, is_collecting, is_deferred, mark_dirty
+
+
+@receiver(post_save, dispatch_uid="read_comics.search.collect_saved")
+def collect_saved_receiver(sender, **kwargs):
+    collect_saved(sender, **kwargs)
+
+
+@receiver(post_save, dispatch_uid="read_comics.search.bump_on_save")
+def bump_on_save(sender, **kwargs):
+    # Bumped before commit, the new generation could be cached with rows other connections don't see yet
+    if issubclass(sender, ComicvineSyncModel):
+        transaction.on_commit(lambda: bump_generation(sender))
+
+
+@receiver(bulk_synced, dispatch_uid="read_comics.search.bump_on_bulk_sync")
+@receiver(search_entries_changed, dispatch_uid="read_comics.search.bump_on_index_change")
+def bump_on_bulk_change(sender, **kwargs):
+    bump_generation(sender)
+
+
+@receiver(post_save, dispatch_uid="read_comics.search.autocomplete_on_save")
+def autocomplete_on_save(sender, instance, **kwargs):
+    if not issubclass(sender, ComicvineSyncModel):
+        return
+    # Deferred flush updates autocomplete along with search entries, saves of deferred context are queued already
+    if is_deferred():
+        if not is_collecting():
+            mark_dirty(sender, [instance.pk])
+    else:
+        update_autocomplete(sender, [instance.pk])
+
+
+@receiver(search_entries_changed, dispatch_uid="read_comics.search.autocomplete_on_index_change")
+def autocomplete_on_index_change(sender, pks, **kwargs):
+    """Autocomplete follows search index, so it skips the same rows (not live ones)"""
+    if not issubclass(sender, ComicvineSyncModel):
+        return
+    if pks is None:
+        rebuild_autocomplete(sender)
+    else:
+        update_autocomplete(sender, pks)
@@ -0,0 +1,12 @@
+from django.core.cache import cache
+
+from config import celery_app
+from .deferred import FLUSH_SCHEDULED_KEY, flush_pending
+
+
+@celery_app.task()
+def flush_search_index():
+    """Refreshes search entries of rows queued by deferred indexing."""
+    # Writes from now on schedule next flush
+    cache.delete(FLUSH_SCHEDULED_KEY)
+    return flush_pending()
@@ -0,0 +1,82 @@
+import pytest
+from django.urls import reverse
+
+from read_comics.characters.models import Character
+from read_comics.publishers.models import Publisher
+from read_comics.search.autocomplete import get_terms, rebuild_autocomplete, suggest
+from read_comics.search.deferred import flush_pending
+from read_comics.search.models import AutocompleteEntry
+from read_comics.sync.reconcile import tombstone
+from read_comics.utils.tests.factories import publisher_record
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def catalog():
+    Publisher.bulk_sync([publisher_record(1, name="Marvel", aliases="Marvel Comics")])
+    Character.bulk_sync([
+        publisher_record(10, name="Spider-Man", aliases="Spidey\nPeter Parker", thumb_url="https://cv/spider.png"),
+        publisher_record(11, name="Man-Thing"),
+    ])
+
+
+def test_get_terms():
+    assert get_terms("Spider-Man", "Spidey") == {"spider man", "man", "spidey"}
+    assert get_terms(None, None) == set()
+
+
+def test_suggest(catalog):
+    spider_man = Character.objects.get(comicvine_id=10)
+
+    assert suggest("Spi") == [{"model": "characters.Character", "id": spider_man.pk, "name": "Spider-Man",
+                               "slug": "Spider-Man", "thumb_url": "https://cv/spider.png"}]
+    assert [s["name"] for s in suggest("man")] == ["Spider-Man", "Man-Thing"]
+    assert [s["name"] for s in suggest("marv")] == ["Marvel"]
+    assert suggest("marv", models=[Character]) == []
+    assert suggest("  ") == []
+
+
+def test_index_follows_changes(catalog):
+    Publisher.bulk_sync([publisher_record(1, name="Timely")])
+    assert [s["name"] for s in suggest("tim")] == ["Timely"]
+    assert suggest("marv") == []
+
+    character = Character.objects.get(comicvine_id=11)
+    character.name = "Swamp Thing"
+    character.save()
+    assert [s["name"] for s in suggest("swamp")] == ["Swamp Thing"]
+
+    tombstone(Character, [11])
+    assert suggest("swamp") == []
+
+
+def test_deferred_save(catalog, settings):
+    settings.SEARCH_INDEX_MODE = "deferred"
+    character = Character.objects.get(comicvine_id=11)
+    character.name = "Swamp Thing"
+    character.save()
+
+    assert suggest("swamp") == []
+
+    flush_pending()
+    assert [s["name"] for s in suggest("swamp")] == ["Swamp Thing"]
+
+
+def test_rebuild(catalog):
+    AutocompleteEntry.objects.all().delete()
+
+    rebuild_autocomplete(Character)
+
+    assert [s["name"] for s in suggest("peter")] == ["Spider-Man"]
+
+
+def test_autocomplete_view(client, catalog):
+    response = client.get(reverse("search:autocomplete"), {"q": "spi", "model": "characters.Character"})
+
+    assert response.status_code == 200
+    assert [s["name"] for s in response.json()["results"]] == ["Spider-Man"]
+    assert "max-age=60" in response["Cache-Control"]
+    assert client.get(reverse("search:autocomplete"), {"q": "spi", "limit": "x"}).status_code == 400
+    assert client.get(reverse("search:autocomplete"), {"q": "spi", "limit": "0"}).status_code == 400
+    assert client.get(reverse("search:autocomplete"), {"q": "spi", "limit": "-1"}).status_code == 400
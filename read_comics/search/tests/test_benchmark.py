@@ -0,0 +1,61 @@
+import pytest
+from django.core.management import call_command
+
+from read_comics.characters.models import Character
+from read_comics.people.models import Person
+from read_comics.publishers.models import Publisher
+from read_comics.search.benchmark import benchmark_search, delete_catalog, generate_catalog, synthetic_record
+from read_comics.search.indexing import get_entries_queryset
+from read_comics.utils.tests.factories import publisher_record
+
+pytestmark = pytest.mark.django_db
+
+
+def test_synthetic_record_is_reproducible():
+    assert synthetic_record(Character, 7) == synthetic_record(Character, 7)
+    assert synthetic_record(Character, 7) != synthetic_record(Character, 7, seed=1)
+    assert synthetic_record(Character, 7)["html_description"].startswith("<")
+
+
+def test_generate_catalog_grows():
+    assert generate_catalog(100, workers=0) == {
+        "publishers.Publisher": 5, "people.Person": 45, "characters.Character": 50
+    }
+    first = Character.objects.order_by("comicvine_id").values_list("name", flat=True)[0]
+
+    assert generate_catalog(200, workers=0) == {
+        "publishers.Publisher": 5, "people.Person": 45, "characters.Character": 50
+    }
+    assert Character.objects.order_by("comicvine_id").values_list("name", flat=True)[0] == first
+    assert Publisher.objects.count() + Person.objects.count() + Character.objects.count() == 200
+    assert get_entries_queryset(Person).count() == 90
+
+
+def test_benchmark_search():
+    generate_catalog(40, workers=0)
+
+    report = benchmark_search(queries=("man", "xyzzy"), repeat=3)
+
+    assert report.rows == 40
+    assert report.entries == 40
+    assert report.queries == 6
+    assert 0 < report.p50 <= report.p95 <= report.p99
+
+
+def test_delete_catalog():
+    Publisher.bulk_sync([publisher_record(1)])
+    generate_catalog(40, workers=0)
+
+    assert delete_catalog() == {"publishers.Publisher": 2, "people.Person": 18, "characters.Character": 20}
+
+    assert list(Publisher.objects.values_list("comicvine_id", flat=True)) == [1]
+    assert Person.objects.count() == Character.objects.count() == 0
+    assert get_entries_queryset(Publisher).count() == 1
+    assert get_entries_queryset(Character).count() == 0
+
+
+def test_benchmark_search_command(capsys):
+    call_command("benchmark_search", "--sizes", "20", "--repeat", "1", "--workers", "0")
+
+    assert "20 rows, 20 entries" in capsys.readouterr().out
+    assert not Character.objects.exists()
@@ -0,0 +1,70 @@
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+
+from read_comics.people.models import Person
+from read_comics.publishers.models import Publisher
+from read_comics.search.cache import get_generations, get_stats, normalize_query
+from read_comics.search.ranking import cached_ranked_search
+from read_comics.utils.tests.factories import publisher_record
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def test_normalize_query():
+    assert normalize_query("  Spider   MAN ") == "spider man"
+
+
+def test_cached_search_hits():
+    Publisher.bulk_sync([publisher_record(1, name="Marvel")])
+
+    first = cached_ranked_search("Marvel")
+    second = cached_ranked_search(" marvel ")
+
+    assert [result["title"] for result in first.results] == ["Marvel"]
+    assert second == first
+    assert get_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_bulk_sync_invalidates():
+    Publisher.bulk_sync([publisher_record(1, name="Marvel")])
+    assert len(cached_ranked_search("Marvel").results) == 1
+
+    Publisher.bulk_sync([publisher_record(2, name="Marvel UK")])
+
+    assert len(cached_ranked_search("Marvel").results) == 2
+    assert get_stats()["hits"] == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_save_invalidates_only_its_model():
+    Publisher.bulk_sync([publisher_record(1, name="Marvel")])
+    cached_ranked_search("Marvel", models=[Publisher])
+    cached_ranked_search("Marvel", models=[Person])
+
+    publisher = Publisher.objects.get()
+    publisher.name = "Marvel Comics"
+    publisher.save()
+
+    cached_ranked_search("Marvel", models=[Person])
+    assert cached_ranked_search("Marvel", models=[Publisher]).results[0]["title"] == "Marvel Comics"
+    assert get_stats()["hits"] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_save_invalidates_on_commit():
+    Publisher.bulk_sync([publisher_record(1, name="Marvel")])
+    generations = get_generations([Publisher])
+    publisher = Publisher.objects.get()
+
+    with transaction.atomic():
+        publisher.name = "Marvel Comics"
+        publisher.save()
+        assert get_generations([Publisher]) == generations
+
+    assert get_generations([Publisher]) != generations
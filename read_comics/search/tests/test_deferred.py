@@ -0,0 +1,114 @@
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from watson import search as watson
+
+from read_comics.publishers.models import Publisher
+from read_comics.search import deferred as deferred_module
+from read_comics.search.deferred import defer_index_update, flush_pending, mark_dirty
+from read_comics.search.middleware import SearchContextMiddleware
+from read_comics.search.models import PendingSearchUpdate
+from read_comics.utils.tests.factories import publisher_record
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def deferred(settings):
+    settings.SEARCH_INDEX_MODE = "deferred"
+    return settings
+
+
+@pytest.fixture
+def publisher():
+    Publisher.bulk_sync([publisher_record(1)])
+    flush_pending()
+    return Publisher.objects.get(comicvine_id=1)
+
+
+def test_repeated_edits_are_coalesced(deferred, publisher):
+    with defer_index_update():
+        publisher.name = "Marvel"
+        publisher.save()
+        publisher.name = "Marvel Comics"
+        publisher.save()
+
+    assert PendingSearchUpdate.objects.count() == 1
+    assert not watson.filter(Publisher, "Marvel").exists()
+
+    assert flush_pending() == 1
+    assert watson.filter(Publisher, "Comics").exists()
+    assert not PendingSearchUpdate.objects.exists()
+
+
+def test_edit_during_flush_stays_queued(deferred, publisher, monkeypatch):
+    refresh = deferred_module.refresh_search_entries
+
+    refreshed = []
+
+    def refresh_and_edit(model, pks):
+        refresh(model, pks)
+        refreshed.append(Publisher.objects.get(pk=publisher.pk).name)
+        if len(refreshed) == 1:
+            # Row is edited after flush read it
+            Publisher.objects.filter(pk=publisher.pk).update(name="Renamed")
+            mark_dirty(Publisher, [publisher.pk])
+
+    mark_dirty(Publisher, [publisher.pk])
+    monkeypatch.setattr(deferred_module, "refresh_search_entries", refresh_and_edit)
+
+    assert flush_pending() == 2
+    assert refreshed == [publisher.name, "Renamed"]
+    assert watson.filter(Publisher, "Renamed").exists()
+    assert not PendingSearchUpdate.objects.exists()
+
+
+def test_bulk_sync_is_deferred(deferred):
+    Publisher.bulk_sync([publisher_record(1), publisher_record(2)])
+
+    assert PendingSearchUpdate.objects.count() == 2
+    assert not watson.filter(Publisher, "Publisher").exists()
+    flush_pending(batch_size=1)
+    assert watson.filter(Publisher, "Publisher").count() == 2
+
+
+def test_flush_removes_entries_of_deleted_rows(deferred, publisher):
+    Publisher.bulk_sync([publisher_record(2)])
+    flush_pending()
+    Publisher.objects.filter(comicvine_id=2).update(is_deleted=True)
+    Publisher.bulk_sync([publisher_record(1, name="Renamed")])
+    PendingSearchUpdate.objects.create(content_type=PendingSearchUpdate.objects.get().content_type,
+                                       object_id=Publisher.objects.get(comicvine_id=2).pk)
+
+    flush_pending()
+
+    assert watson.filter(Publisher, "Renamed").exists()
+    assert not watson.filter(Publisher, "Publisher 2").exists()
+
+
+def test_middleware(deferred, publisher):
+    def view(request):
+        publisher.name = "Marvel"
+        publisher.save()
+        return HttpResponse()
+
+    SearchContextMiddleware(view)(RequestFactory().get("/"))
+    assert PendingSearchUpdate.objects.count() == 1
+
+    deferred.SEARCH_INDEX_MODE = "sync"
+    SearchContextMiddleware(view)(RequestFactory().get("/"))
+    assert watson.filter(Publisher, "Marvel").exists()
+
+
+def test_failed_request_is_not_queued(deferred, publisher):
+    middleware = SearchContextMiddleware(None)
+
+    def view(request):
+        publisher.save()
+        middleware.process_exception(request, ValueError())
+        return HttpResponse(status=500)
+
+    middleware.get_response = view
+    middleware(RequestFactory().get("/"))
+
+    assert not PendingSearchUpdate.objects.exists()
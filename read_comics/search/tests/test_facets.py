@@ -0,0 +1,79 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from watson import search as watson
+
+from read_comics.people.models import Person
+from read_comics.search.facets import count_person_facets, faceted_person_search
+
+
+def person_record(comicvine_id, name, country=None, hometown=None, birth_date=None):
+    return {
+        "comicvine_id": comicvine_id,
+        "comicvine_url": "https://comicvine.gamespot.com/person/4040-%d/" % comicvine_id,
+        "name": name,
+        "country": country,
+        "hometown": hometown,
+        "birth_date": birth_date,
+    }
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def people():
+    cache.clear()
+    Person.bulk_sync([
+        person_record(1, "Stan Lee", "United States", "New York", datetime.date(1922, 12, 28)),
+        person_record(2, "Jack Kirby", "United States", "New York", datetime.date(1917, 8, 28)),
+        person_record(3, "Steve Ditko", "United States", "Johnstown", datetime.date(1927, 11, 2)),
+        person_record(4, "Alan Moore", "United Kingdom", "Northampton", datetime.date(1953, 11, 18)),
+        person_record(5, "Stan Sakai", "Japan"),
+    ])
+
+
+def test_count_person_facets(people, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        facets = count_person_facets(watson.filter(Person.objects.live(), "stan", ranking=False))
+
+    assert facets == {
+        "country": [{"value": "Japan", "count": 1}, {"value": "United States", "count": 1}],
+        "hometown": [{"value": "New York", "count": 1}],
+        "decade": [{"value": 1920, "count": 1}],
+    }
+
+
+def test_faceted_person_search(people, django_assert_num_queries):
+    response = faceted_person_search("stan")
+
+    assert {result["title"] for result in response["results"]} == {"Stan Lee", "Stan Sakai"}
+    assert response["facets"]["decade"] == [{"value": 1920, "count": 1}]
+
+    response = faceted_person_search("s", country="United States")
+
+    assert {result["title"] for result in response["results"]} == {"Stan Lee", "Steve Ditko"}
+    assert response["facets"]["hometown"] == [{"value": "Johnstown", "count": 1}, {"value": "New York", "count": 1}]
+
+    with django_assert_num_queries(0):
+        assert faceted_person_search(" S ", country="United States") == response
+
+
+def test_faceted_person_search_invalidation(people):
+    assert faceted_person_search("moore")["facets"]["country"] == [{"value": "United Kingdom", "count": 1}]
+
+    Person.bulk_sync([person_record(4, "Alan Moore", "England", "Northampton", datetime.date(1953, 11, 18))])
+
+    assert faceted_person_search("moore")["facets"]["country"] == [{"value": "England", "count": 1}]
+
+
+def test_person_search_view(client, people):
+    response = client.get(reverse("search:people"), {"q": "stan", "decade": "1920"})
+
+    assert response.status_code == 200
+    assert [result["title"] for result in response.json()["results"]] == ["Stan Lee"]
+    assert client.get(reverse("search:people"), {"q": "stan", "decade": "x"}).status_code == 400
+    assert client.get(reverse("search:people"), {"q": "stan", "limit": "-1"}).status_code == 400
+    assert client.get(reverse("search:people"), {"q": "stan", "limit": "0"}).status_code == 400
@@ -0,0 +1,56 @@
+import pytest
+from django.core.management import call_command
+from watson import search as watson
+
+from read_comics.publishers.models import Publisher
+from read_comics.search.autocomplete import suggest
+from read_comics.search.indexing import get_entries_queryset, get_pk_ranges, rebuild_index
+from read_comics.utils.tests.factories import publisher_record
+
+pytestmark = pytest.mark.django_db
+
+
+def test_get_pk_ranges():
+    Publisher.bulk_sync([publisher_record(i) for i in range(1, 6)])
+    low = Publisher.objects.order_by("pk").first().pk
+
+    assert get_pk_ranges(Publisher.objects.all(), 2) == [(low, low + 2), (low + 2, low + 4), (low + 4, low + 5)]
+    assert get_pk_ranges(Publisher.objects.none(), 2) == []
+
+
+def test_rebuild_index_replaces_entries():
+    Publisher.bulk_sync([publisher_record(i) for i in range(1, 6)])
+    entries = get_entries_queryset(Publisher)
+    entries.delete()
+    Publisher.objects.filter(comicvine_id=5).update(is_deleted=True)
+
+    results = rebuild_index([Publisher], workers=0, chunk_size=2)
+
+    assert sum(result.rows for result in results) == 4
+    assert entries.count() == 4
+    assert watson.filter(Publisher, "Publisher 1").exists()
+    assert not watson.filter(Publisher, "Publisher 5").exists()
+
+
+def test_rebuild_index_since():
+    Publisher.bulk_sync([publisher_record(1), publisher_record(2)])
+    since = Publisher.objects.get(comicvine_id=2).modified_dt
+    Publisher.objects.filter(comicvine_id=1).update(name="Renamed", modified_dt=since.replace(year=2000))
+    Publisher.objects.filter(comicvine_id=2).update(name="Marvel")
+
+    results = rebuild_index([Publisher], since=since, workers=0)
+
+    assert [result.rows for result in results] == [1]
+    assert watson.filter(Publisher, "Marvel").exists()
+    assert not watson.filter(Publisher, "Renamed").exists()
+    # Autocomplete of reindexed rows only is updated, not rebuilt
+    assert [s["name"] for s in suggest("marv")] == ["Marvel"]
+    assert suggest("renamed") == []
+
+
+def test_rebuild_search_index_command(capsys):
+    Publisher.bulk_sync([publisher_record(1)])
+
+    call_command("rebuild_search_index", "--model", "publishers.Publisher", "--workers", "0")
+
+    assert "Total: 1 rows" in capsys.readouterr().out
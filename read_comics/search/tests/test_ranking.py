@@ -0,0 +1,82 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from read_comics.characters.models import Character
+from read_comics.publishers.models import Publisher
+from read_comics.search import ranking
+from read_comics.search.ranking import CursorError, decode_cursor, encode_cursor, ranked_search
+from read_comics.utils.tests.factories import publisher_record
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def catalog():
+    Publisher.bulk_sync([
+        publisher_record(1, name="Marvel"),
+        publisher_record(2, name="Timely", short_description="Became Marvel"),
+        publisher_record(3, name="Atlas", html_description="<p>Marvel predecessor</p>"),
+    ])
+    Character.bulk_sync([
+        {"comicvine_id": i, "comicvine_url": "https://comicvine.gamespot.com/character/4005-%d/" % i,
+         "name": "Marvel Boy %d" % i}
+        for i in range(1, 4)
+    ])
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(0.1, 42)) == (0.1, 42)
+    with pytest.raises(CursorError):
+        decode_cursor("garbage")
+
+
+def test_ranked_search_weights_title(catalog):
+    results = ranked_search("marvel", limit=10).results
+
+    assert [result["title"] for result in results[-2:]] == ["Timely", "Atlas"]
+    assert {result["model"] for result in results[:4]} == {"publishers.Publisher", "characters.Character"}
+    assert results[0]["rank"] > results[4]["rank"] > results[5]["rank"]
+
+
+def test_ranked_search_pages(catalog):
+    expected = [(result["model"], result["pk"]) for result in ranked_search("marvel", limit=10).results]
+
+    seen = []
+    cursor = None
+    while True:
+        page = ranked_search("marvel", limit=4, cursor=cursor)
+        seen += [(result["model"], result["pk"]) for result in page.results]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == expected
+    assert ranked_search("marvel", models=[Character], limit=10).next_cursor is None
+
+
+def test_search_view(client, catalog):
+    response = client.get(reverse("search:search"), {"q": "marvel", "limit": 5})
+
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 5
+    next_page = client.get(reverse("search:search"), {"q": "marvel", "cursor": response.json()["next"]}).json()
+    assert [result["title"] for result in next_page["results"]] == ["Atlas"]
+    assert next_page["next"] is None
+    assert client.get(reverse("search:search"), {"q": "marvel", "cursor": "x"}).status_code == 400
+    assert client.get(reverse("search:search"), {"q": "marvel", "limit": "0"}).status_code == 400
+    assert client.get(reverse("search:search"), {"q": "marvel", "limit": "-1"}).status_code == 400
+
+
+def test_search_view_caches_pages(client, catalog, monkeypatch):
+    cache.clear()
+    params = {"q": "marvel", "limit": 2}
+    first = client.get(reverse("search:search"), params).json()
+    params["cursor"] = first["next"]
+    second = client.get(reverse("search:search"), params).json()
+    calls = []
+    monkeypatch.setattr(ranking, "ranked_search", lambda *args: calls.append(args))
+
+    assert client.get(reverse("search:search"), params).json() == second
+    assert second != first
+    assert calls == []
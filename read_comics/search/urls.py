@@ -0,0 +1,10 @@
+from django.urls import path
+
+from read_comics.search.views import autocomplete_view, person_search_view, search_view
+
+app_name = "search"
+urlpatterns = [
+    path("", view=search_view, name="search"),
+    path("autocomplete/", view=autocomplete_view, name="autocomplete"),
+    path("people/", view=person_search_view, name="people"),
+]
@@ -0,0 +1,68 @@
+from django.apps import apps
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.cache import cache_control
+
+from .autocomplete import suggest
+from .facets import faceted_person_search
+from .ranking import cached_ranked_search
+
+AUTOCOMPLETE_MAX_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+
+def get_limit(request, default, max_limit):
+    limit = int(request.GET.get("limit", default))
+    if limit < 1:
+        raise ValueError("limit must be positive: %d" % limit)
+    return min(limit, max_limit)
+
+
+@method_decorator(cache_control(public=True, max_age=60), name="dispatch")
+class AutocompleteView(View):
+    def get(self, request):
+        try:
+            limit = get_limit(request, 10, AUTOCOMPLETE_MAX_LIMIT)
+            models = [apps.get_model(label) for label in request.GET.getlist("model")]
+        except (ValueError, LookupError) as e:
+            return JsonResponse(data={"error": str(e)}, status=400)
+        return JsonResponse(data={"results": suggest(request.GET.get("q", ""), models, limit)})
+
+
+autocomplete_view = AutocompleteView.as_view()
+
+
+class PersonSearchView(View):
+    def get(self, request):
+        try:
+            limit = get_limit(request, 20, SEARCH_MAX_LIMIT)
+            offset = max(int(request.GET.get("offset", 0)), 0)
+            decade = int(request.GET["decade"]) if request.GET.get("decade") else None
+        except ValueError as e:
+            return JsonResponse(data={"error": str(e)}, status=400)
+        return JsonResponse(data=faceted_person_search(
+            request.GET.get("q", ""),
+            country=request.GET.get("country") or None,
+            hometown=request.GET.get("hometown") or None,
+            decade=decade,
+            limit=limit,
+            offset=offset,
+        ))
+
+
+person_search_view = PersonSearchView.as_view()
+
+
+class SearchView(View):
+    def get(self, request):
+        try:
+            limit = get_limit(request, 20, SEARCH_MAX_LIMIT)
+            models = [apps.get_model(label) for label in request.GET.getlist("model")]
+            page = cached_ranked_search(request.GET.get("q", ""), models, limit, request.GET.get("cursor") or None)
+        except (ValueError, LookupError) as e:
+            return JsonResponse(data={"error": str(e)}, status=400)
+        return JsonResponse(data={"results": page.results, "next": page.next_cursor})
+
+
+search_view = SearchView.as_view()
@@ -0,0 +1,57 @@
+from django.contrib import admin
+
+from .models import SyncRun, SyncShard, SyncStage, SyncWatermark
+from .tasks import retry_shard
+
+
+@admin.register(SyncWatermark)
+class SyncWatermarkAdmin(admin.ModelAdmin):
+    list_display = ["resource", "last_updated", "modified_dt"]
+
+
+@admin.register(SyncShard)
+class SyncShardAdmin(admin.ModelAdmin):
+    list_display = ["resource", "index", "status", "fetched", "inserted", "updated", "unchanged",
+                    "first_comicvine_id", "last_comicvine_id", "started_dt", "finished_dt", "run_id"]
+    list_filter = ["status", "resource", "full"]
+    search_fields = ["run_id"]
+    exclude = ["api_latencies"]
+    actions = ["retry"]
+
+    def retry(self, request, queryset):
+        for shard in queryset:
+            retry_shard.delay(shard.pk)
+        self.message_user(request, "%d shard(s) queued for retry" % len(queryset))
+
+    retry.short_description = "Retry selected shards"
+
+
+STAGE_FIELDS = ["resource", "fetched", "inserted", "updated", "unchanged", "seconds", "rows_per_second", "requests",
+                "api_seconds", "api_p50", "api_p95", "api_p99", "db_seconds", "started_dt", "finished_dt"]
+
+
+class SyncStageInline(admin.TabularInline):
+    model = SyncStage
+    fields = STAGE_FIELDS
+    readonly_fields = STAGE_FIELDS
+    extra = 0
+    can_delete = False
+
+
+@admin.register(SyncRun)
+class SyncRunAdmin(admin.ModelAdmin):
+    list_display = ["run_id", "status", "full", "sharded", "started_dt", "finished_dt", "seconds"]
+    list_filter = ["status", "full", "sharded"]
+    search_fields = ["run_id"]
+    readonly_fields = ["run_id", "full", "sharded", "status", "error", "started_dt", "finished_dt"]
+    inlines = [SyncStageInline]
+
+
+@admin.register(SyncStage)
+class SyncStageAdmin(admin.ModelAdmin):
+    """Stages of all runs, so throughput of one resource may be compared across deploys"""
+    list_display = ["resource", "started_dt", "fetched", "rows_per_second", "api_p50", "api_p95", "api_p99",
+                    "db_seconds", "seconds", "run"]
+    list_filter = ["resource", "run__full", "run__sharded"]
+    readonly_fields = ["run"] + STAGE_FIELDS
+    date_hierarchy = "started_dt"
@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class SyncConfig(AppConfig):
+    name = 'read_comics.sync'
+    verbose_name = "Comicvine sync"
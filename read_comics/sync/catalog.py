@@ -0,0 +1,232 @@
+import json
+import tarfile
+import tempfile
+import time
+
+from django.apps import apps
+from django.db import connections, router, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django_extensions.db.fields import AutoSlugField
+
+from utils import logging
+from utils.models import _batches, get_comicvine_sync_models
+from utils.search import update_search_index
+from .models import SyncWatermark
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+SLUG_BATCH_SIZE = 5000
+
+
+class CatalogError(Exception):
+    pass
+
+
+def get_catalog_fields(model):
+    """
+    Exported fields: everything but pk and slugs, ``comicvine_id`` is the stable key
+    """
+    meta = model._meta
+    service_fields = [meta.get_field(name) for name in ("comicvine_matched", "is_deleted", "deleted_dt", "created_dt",
+                                                        "modified_dt", "sync_digest")]
+    return [meta.get_field("comicvine_id")] + model.get_sync_fields() + model.get_derived_fields() + service_fields
+
+
+def _get_connection(using):
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        raise CatalogError("Catalog export and import use COPY and require PostgreSQL")
+    return connection
+
+
+def _add_member(tar, name, fileobj):
+    info = tarfile.TarInfo(name)
+    info.size = fileobj.seek(0, 2)
+    info.mtime = int(time.time())
+    fileobj.seek(0)
+    tar.addfile(info, fileobj)
+
+
+@logging.logged(logger)
+def export_catalog(fileobj, models=None, using=None):
+    """
+    Writes tables of ComicvineSyncModel subclasses into tar.gz stream: ``manifest.json`` followed by
+    one CSV per model produced by ``COPY ... TO STDOUT``. Returns dict of model label -> row count.
+    Must not run inside a transaction, as it opens its own snapshot.
+    """
+    models = models or get_comicvine_sync_models()
+    using = using or router.db_for_read(models[0])
+    connection = _get_connection(using)
+    if connection.in_atomic_block:
+        raise CatalogError("Catalog export needs its own snapshot and can't run inside a transaction")
+    qn = connection.ops.quote_name
+    counts = {}
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        # All tables and watermarks from one snapshot
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        manifest = {
+            "format": CATALOG_FORMAT,
+            "exported_dt": timezone.now().isoformat(),
+            "watermarks": {
+                resource: last_updated.isoformat()
+                for resource, last_updated in SyncWatermark.objects.using(using).filter(
+                    last_updated__isnull=False
+                ).values_list("resource", "last_updated")
+            },
+            "tables": {
+                "%s.csv" % model._meta.label: {
+                    "model": model._meta.label,
+                    "columns": [f.column for f in get_catalog_fields(model)],
+                }
+                for model in models
+            },
+        }
+        with tarfile.open(fileobj=fileobj, mode="w|gz") as tar, tempfile.TemporaryFile() as data:
+            data.write(json.dumps(manifest, indent=2).encode("utf-8"))
+            _add_member(tar, MANIFEST_NAME, data)
+            for name, table in manifest["tables"].items():
+                model = apps.get_model(table["model"])
+                data.seek(0)
+                data.truncate()
+                cursor.copy_expert(
+                    "COPY (SELECT {columns} FROM {table} ORDER BY {comicvine_id}) TO STDOUT "
+                    "WITH (FORMAT csv, HEADER true)".format(
+                        columns=", ".join(qn(column) for column in table["columns"]),
+                        table=qn(model._meta.db_table),
+                        comicvine_id=qn(model._meta.get_field("comicvine_id").column),
+                    ),
+                    data
+                )
+                counts[table["model"]] = cursor.rowcount
+                _add_member(tar, name, data)
+    return counts
+
+
+def rebuild_slugs(model, pks, using=None):
+    """
+    Fills slugs of given rows with one query for clashes and one bulk update per batch
+    """
+    slug_fields = [f for f in model._meta.concrete_fields if isinstance(f, AutoSlugField)]
+    if not slug_fields:
+        return
+    populate_from = set()
+    for field in slug_fields:
+        names = field._populate_from
+        populate_from.update(names if isinstance(names, (list, tuple)) else (names,))
+    manager = model._default_manager.using(using)
+    for batch in _batches(pks, SLUG_BATCH_SIZE):
+        objects = list(manager.filter(pk__in=batch).only("pk", "comicvine_id", *populate_from))
+        rows = [dict({name: getattr(obj, name) for name in populate_from}, comicvine_id=obj.comicvine_id)
+                for obj in objects]
+        slugs = model._get_new_slugs(rows, using)
+        for obj in objects:
+            for field, field_slugs in slugs.items():
+                setattr(obj, field.attname, field_slugs[obj.comicvine_id])
+        manager.bulk_update(objects, [field.attname for field in slug_fields])
+
+
+def import_table(model, columns, fileobj, using):
+    """
+    Loads CSV into temporary table with ``COPY ... FROM STDIN`` and merges it into model table by
+    ``comicvine_id``. Existing rows are overwritten only if their sync digest or tombstone differs.
+    Locally filled fields are not exported, new rows get their defaults and existing rows keep them.
+    Returns (inserted pks, updated pks).
+    """
+    connection = _get_connection(using)
+    qn = connection.ops.quote_name
+    meta = model._meta
+    known_columns = {f.column for f in get_catalog_fields(model)}
+    unknown_columns = set(columns) - known_columns
+    if unknown_columns:
+        raise CatalogError("Unknown columns for %s: %s" % (meta.label, ", ".join(sorted(unknown_columns))))
+    if meta.get_field("comicvine_id").column not in columns:
+        raise CatalogError("No comicvine_id column for %s" % meta.label)
+
+    table = qn(meta.db_table)
+    staging = qn("import_%s" % meta.db_table)
+    slug_columns = [f.column for f in meta.concrete_fields if isinstance(f, AutoSlugField)]
+    local_fields = model.get_locally_filled_fields()
+    # Parameters are typed, as untyped NULL would be taken for text
+    local_values = ["%%s::%s" % f.db_type(connection) for f in local_fields]
+    update_columns = [f.column for f in model.get_sync_fields() + model.get_derived_fields()]
+    update_columns += [meta.get_field(name).column
+                       for name in ("sync_digest", "modified_dt", "is_deleted", "deleted_dt")]
+    column_list = ", ".join(qn(column) for column in columns)
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute("CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS SELECT {columns} FROM {table} "
+                       "WITH NO DATA".format(staging=staging, columns=column_list, table=table))
+        cursor.copy_expert(
+            "COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv, HEADER true)".format(
+                staging=staging, columns=column_list
+            ),
+            fileobj
+        )
+        # Slugs of new rows are filled afterwards in bulk
+        cursor.execute(
+            "INSERT INTO {table} ({columns}) SELECT {values} FROM {staging} "
+            "ON CONFLICT ({comicvine_id}) DO UPDATE SET {update} "
+            "WHERE {table}.{digest} IS DISTINCT FROM EXCLUDED.{digest} "
+            "OR {table}.{is_deleted} IS DISTINCT FROM EXCLUDED.{is_deleted} "
+            "RETURNING {pk}, xmax = 0".format(
+                table=table,
+                staging=staging,
+                columns=", ".join([column_list] + [qn(column) for column in slug_columns] +
+                                  [qn(f.column) for f in local_fields]),
+                values=", ".join([column_list] + ["''"] * len(slug_columns) + local_values),
+                comicvine_id=qn(meta.get_field("comicvine_id").column),
+                update=", ".join("{0} = EXCLUDED.{0}".format(qn(column))
+                                 for column in update_columns if column in columns),
+                digest=qn(meta.get_field("sync_digest").column),
+                is_deleted=qn(meta.get_field("is_deleted").column),
+                pk=qn(meta.pk.column),
+            ),
+            [f.get_default() for f in local_fields]
+        )
+        rows = cursor.fetchall()
+    inserted = [pk for pk, is_new in rows if is_new]
+    updated = [pk for pk, is_new in rows if not is_new]
+    return inserted, updated
+
+
+@logging.logged(logger)
+def import_catalog(fileobj, using=None):
+    """
+    Loads catalog written by ``export_catalog``, then rebuilds slugs of new rows and search entries of
+    changed rows in bulk. Sync watermarks are moved forward to exported ones, so following incremental
+    sync continues from the exporting node state. Returns dict of model label -> (inserted, updated).
+    """
+    using = using or router.db_for_write(SyncWatermark)
+    manifest = None
+    counts = {}
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+        for member in tar:
+            data = tar.extractfile(member)
+            if member.name == MANIFEST_NAME:
+                manifest = json.load(data)
+                if manifest.get("format") != CATALOG_FORMAT:
+                    raise CatalogError("Unsupported catalog format: %s" % manifest.get("format"))
+                continue
+            if manifest is None:
+                raise CatalogError("Catalog must start with %s" % MANIFEST_NAME)
+            table = manifest["tables"].get(member.name)
+            if table is None:
+                raise CatalogError("Unexpected catalog member: %s" % member.name)
+            model = apps.get_model(table["model"])
+            inserted, updated = import_table(model, table["columns"], data, using)
+            rebuild_slugs(model, inserted, using)
+            update_search_index(model, inserted + updated, using=using)
+            counts[model._meta.label] = (len(inserted), len(updated))
+            logger.info("%s: %d inserted, %d updated" % (model._meta.label, len(inserted), len(updated)))
+    if manifest is None:
+        raise CatalogError("Catalog is empty")
+
+    for resource, value in manifest["watermarks"].items():
+        last_updated = parse_datetime(value)
+        watermark, _ = SyncWatermark.objects.using(using).get_or_create(resource=resource)
+        if watermark.last_updated is None or watermark.last_updated < last_updated:
+            watermark.last_updated = last_updated
+            watermark.save(using=using)
+    return counts
@@ -0,0 +1,82 @@
+import datetime
+from collections import namedtuple
+
+import pytz
+import requests
+from django.conf import settings
+
+from utils import logging
+
+logger = logging.getLogger(__name__)
+
+COMICVINE_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+Page = namedtuple("Page", ["results", "offset", "total"])
+
+# Comicvine status codes: 1 - OK, 107 - rate limit exceeded
+STATUS_OK = 1
+STATUS_RATE_LIMIT = 107
+
+
+class ComicvineError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_datetime(value):
+    """
+    Comicvine datetime string -> aware datetime
+    """
+    if not value:
+        return None
+    naive = datetime.datetime.strptime(value[:19], COMICVINE_DATETIME_FORMAT)
+    return pytz.timezone(settings.COMICVINE_TIME_ZONE).localize(naive)
+
+
+def format_datetime(value):
+    """
+    Aware datetime -> Comicvine datetime string
+    """
+    return value.astimezone(pytz.timezone(settings.COMICVINE_TIME_ZONE)).strftime(COMICVINE_DATETIME_FORMAT)
+
+
+class ComicvineClient:
+    def __init__(self, api_url=None, api_key=None, timeout=30):
+        self.api_url = api_url or settings.COMICVINE_API_URL
+        self.api_key = api_key or settings.COMICVINE_API_KEY
+        self.timeout = timeout
+        self.session = requests.Session()
+        # Comicvine rejects requests with default python user agent
+        self.session.headers["User-Agent"] = "read_comics"
+
+    def get_params(self, offset=0, limit=None, sort=None, filters=None, field_list=None):
+        params = {
+            "api_key": self.api_key,
+            "format": "json",
+            "offset": offset,
+            "limit": limit or settings.COMICVINE_PAGE_SIZE,
+        }
+        if sort:
+            params["sort"] = sort
+        if filters:
+            params["filter"] = ",".join("%s:%s" % (k, v) for k, v in filters.items())
+        if field_list:
+            params["field_list"] = ",".join(field_list)
+        return params
+
+    def parse_response(self, data):
+        if data.get("status_code") != STATUS_OK:
+            raise ComicvineError("Comicvine error %s: %s" % (data.get("status_code"), data.get("error")),
+                                 data.get("status_code"))
+        return Page(data["results"], data["offset"], data["number_of_total_results"])
+
+    def list(self, endpoint, offset=0, limit=None, sort=None, filters=None, field_list=None):
+        """
+        Gets one page of Comicvine list endpoint (e.g. ``publishers``)
+        """
+        params = self.get_params(offset, limit, sort, filters, field_list)
+        logger.debug("Comicvine request %s offset %d" % (endpoint, offset))
+        response = self.session.get(self.api_url + endpoint + "/", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return self.parse_response(response.json())
@@ -0,0 +1,129 @@
+from collections import Counter
+
+from django.conf import settings
+from django.utils import timezone
+
+from utils import logging
+from .comicvine import ComicvineClient, format_datetime, parse_datetime
+from .fetcher import AsyncFetcher
+from .models import SyncWatermark
+from .staging import RawDocumentStore
+from .telemetry import SyncStats, record_stage
+
+logger = logging.getLogger(__name__)
+
+FAR_FUTURE = "2100-01-01 00:00:00"
+
+
+def write_documents(resource, documents, store=None):
+    """
+    Writes raw upstream documents into resource model. With staging store only documents whose
+    payload changed since last write reach Postgres.
+    """
+    changed = store.stage(resource, documents) if store else documents
+    result = resource.model.bulk_sync(resource.to_record(data) for data in changed)
+    if store:
+        store.mark_applied(resource, changed)
+    counts = Counter(fetched=len(documents), **result._asdict())
+    counts["unchanged"] += len(documents) - len(changed)
+    return counts
+
+
+def sync_batch(resource, documents, store=None, stats=None):
+    """
+    Writes batch of upstream documents and returns (counts, max date_last_updated).
+    Write time is added to ``stats`` if given.
+    """
+    stats = stats or SyncStats()
+    with stats.db_write():
+        counts = write_documents(resource, documents, store)
+    last_updated = max(filter(None, (parse_datetime(data.get("date_last_updated")) for data in documents)),
+                       default=None)
+    return counts, last_updated
+
+
+def document_batches(pages, batch_size):
+    """
+    Regroups upstream pages into write batches, yields (documents, upstream total)
+    """
+    batch, total = [], 0
+    for page in pages:
+        batch += page.results
+        total = page.total
+        if len(batch) >= batch_size:
+            yield batch, total
+            batch = []
+    if batch:
+        yield batch, total
+
+
+def iter_batches(resource, client, sort, filters, start=0, stop=None, stats=None):
+    """
+    Yields write batches of resource documents from offsets ``start``..``stop`` of upstream listing.
+    Request latencies are collected into ``stats`` if given.
+    """
+    fetcher = AsyncFetcher(client, latencies=stats.latencies if stats else None)
+    pages = fetcher.iter_pages(resource.endpoint, start=start, stop=stop, sort=sort, filters=filters,
+                               field_list=resource.api_fields)
+    return document_batches(pages, settings.COMICVINE_WRITE_BATCH_SIZE)
+
+
+def incremental_filters(since, until=None):
+    return {
+        "date_last_updated": "%s|%s" % (format_datetime(since), format_datetime(until) if until else FAR_FUTURE)
+    }
+
+
+@logging.logged(logger)
+def sync_resource(resource, full=False, client=None, store=None, run=None):
+    """
+    Syncs Comicvine resource into its model.
+
+    Incremental sync fetches only entities updated since resource watermark, oldest first, and moves
+    the watermark after every written batch, so interrupted sync resumes where it stopped.
+    Full sync fetches everything and moves the watermark only when finished.
+
+    Raw documents are staged in MongoDB when it is configured.
+    Telemetry is recorded as SyncStage of ``run`` if given.
+    """
+    started_dt = timezone.now()
+    stats = SyncStats()
+    client = client or ComicvineClient()
+    store = store or RawDocumentStore.from_settings()
+    watermark, _ = SyncWatermark.objects.get_or_create(resource=resource.name)
+
+    if full or watermark.last_updated is None:
+        sort, filters = "id:asc", None
+    else:
+        sort = "date_last_updated:asc"
+        filters = incremental_filters(watermark.last_updated)
+
+    totals = Counter(fetched=0, inserted=0, updated=0, unchanged=0)
+    last_updated = watermark.last_updated
+    for documents, total in iter_batches(resource, client, sort, filters, stats=stats):
+        counts, batch_last_updated = sync_batch(resource, documents, store, stats)
+        totals.update(counts)
+        if batch_last_updated and (last_updated is None or batch_last_updated > last_updated):
+            last_updated = batch_last_updated
+        if filters:
+            watermark.last_updated = last_updated
+            watermark.save()
+        logger.info("%s: synced %d of %d" % (resource, totals["fetched"], total))
+
+    watermark.last_updated = last_updated
+    watermark.save()
+    if run is not None:
+        record_stage(run, resource.name, totals, stats, started_dt)
+    return dict(totals)
+
+
+@logging.logged(logger)
+def rebuild_resource(resource, store):
+    """
+    Rewrites resource model from raw documents staged in MongoDB without calling Comicvine API
+    """
+    totals = Counter(fetched=0, inserted=0, updated=0, unchanged=0)
+    for documents in store.iter_documents(resource):
+        totals.update(write_documents(resource, documents))
+        store.mark_applied(resource, documents)
+    return dict(totals)
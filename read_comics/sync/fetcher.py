@@ -0,0 +1,191 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from utils import logging
+from .comicvine import STATUS_RATE_LIMIT, ComicvineClient, ComicvineError
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+# Upstream quota is per resource, so all workers fetching the same endpoint share one bucket
+RATE_LIMIT_KEY = "comicvine:rate:%s"
+
+
+def _truncate(page, end):
+    """
+    Drops page results past ``end`` offset
+    """
+    if page.offset + len(page.results) <= end:
+        return page
+    return page._replace(results=page.results[:max(end - page.offset, 0)])
+
+
+class SharedTokenBucket:
+    """
+    Token bucket kept in cache, so it limits all processes using the same ``key`` together.
+    Cache entry is guarded by short lived lock, acquisitions wait while another process holds it.
+    """
+    LOCK_TIMEOUT = 5
+    LOCK_RETRY_DELAY = 0.01
+
+    def __init__(self, key, rate, capacity=1, clock=time.time):
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+
+    def take(self):
+        """
+        Takes one token. Returns seconds to wait before the next try if there is none or None if taken.
+        """
+        lock_key = "%s:lock" % self.key
+        if not cache.add(lock_key, 1, self.LOCK_TIMEOUT):
+            return self.LOCK_RETRY_DELAY
+        try:
+            now = self.clock()
+            tokens, updated = cache.get(self.key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            wait = None if tokens >= 1 else (1 - tokens) / self.rate
+            if wait is None:
+                tokens -= 1
+            # Bucket is full again after this time, so entry may expire
+            cache.set(self.key, (tokens, now), self.capacity / self.rate + 1)
+            return wait
+        finally:
+            cache.delete(lock_key)
+
+    async def acquire(self):
+        while True:
+            wait = self.take()
+            if wait is None:
+                return
+            await asyncio.sleep(wait)
+
+
+def is_retryable(error):
+    if isinstance(error, ComicvineError):
+        return error.status_code == STATUS_RATE_LIMIT
+    if isinstance(error, requests.HTTPError):
+        status = error.response.status_code if error.response is not None else None
+        return status is None or status >= 500 or status in (420, 429)
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+class AsyncFetcher:
+    """
+    Fetches Comicvine list pages concurrently.
+
+    Requests are limited by token bucket shared by all workers (upstream quota), semaphore (concurrent
+    connections) and retried with exponential backoff. After the first page gives total count, following offsets are
+    requested ahead of time while pages are still handed out in order.
+    """
+
+    def __init__(self, client=None, concurrency=None, rate=None, burst=None, retries=None, backoff=None, prefetch=None,
+                 latencies=None):
+        self.client = client or ComicvineClient()
+        self.concurrency = concurrency or settings.COMICVINE_CONCURRENCY
+        self.rate = rate or settings.COMICVINE_REQUESTS_PER_HOUR / 3600
+        self.burst = burst or self.concurrency
+        self.retries = settings.COMICVINE_RETRIES if retries is None else retries
+        self.backoff = backoff or settings.COMICVINE_RETRY_BACKOFF
+        self.prefetch = prefetch or self.concurrency * 2
+        # Seconds per successful request, may be shared with caller's stats
+        self.latencies = [] if latencies is None else latencies
+
+    async def fetch(self, endpoint, offset, bucket, semaphore, executor, **kwargs):
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries + 1):
+            await bucket.acquire()
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    page = await loop.run_in_executor(executor, partial(self.client.list, endpoint, offset=offset,
+                                                                        **kwargs))
+                    self.latencies.append(time.monotonic() - started)
+                    return page
+                except Exception as e:
+                    if attempt == self.retries or not is_retryable(e):
+                        raise
+                    logger.warning("%s offset %d failed (%r), retry %d" % (endpoint, offset, e, attempt + 1))
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def pages(self, endpoint, start=0, stop=None, **kwargs):
+        """
+        Async generator of pages in offset order. Only entities from offsets ``start``..``stop`` are returned
+        """
+        bucket = SharedTokenBucket(RATE_LIMIT_KEY % endpoint, self.rate, self.burst)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            fetch = partial(self.fetch, endpoint, bucket=bucket, semaphore=semaphore, executor=executor, **kwargs)
+            first = await fetch(start)
+            end = first.total if stop is None else min(stop, first.total)
+            step = len(first.results)
+            yield _truncate(first, end)
+            if not step:
+                return
+            offsets = iter(range(first.offset + step, end, step))
+            pending = []
+            try:
+                for offset in offsets:
+                    pending.append(asyncio.ensure_future(fetch(offset)))
+                    if len(pending) >= self.prefetch:
+                        break
+                while pending:
+                    page = await pending.pop(0)
+                    offset = next(offsets, None)
+                    if offset is not None:
+                        pending.append(asyncio.ensure_future(fetch(offset)))
+                    yield _truncate(page, end)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def iter_pages(self, endpoint, **kwargs):
+        """
+        Yields pages in offset order while fetching runs in background thread, so caller may write
+        to database (which must not happen inside event loop) while next pages are downloading
+        """
+        pages = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+
+        async def produce():
+            loop = asyncio.get_running_loop()
+            async for page in self.pages(endpoint, **kwargs):
+                await loop.run_in_executor(None, pages.put, page)
+                if stop.is_set():
+                    return
+
+        def run():
+            try:
+                asyncio.run(produce())
+            except Exception as e:
+                pages.put(e)
+            else:
+                pages.put(_DONE)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            # Unblock producer waiting for free space in queue
+            while thread.is_alive():
+                try:
+                    pages.get(timeout=0.1)
+                except queue.Empty:
+                    pass
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from utils.models import get_comicvine_sync_models
+
+
+class Command(BaseCommand):
+    help = "Fills sync_digest of catalog rows without changing modified_dt."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--all", action="store_true", default=False,
+                            help="Recompute all digests, not only empty ones")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for model in get_comicvine_sync_models():
+            fields = [f.name for f in model.get_sync_fields()]
+            queryset = model._default_manager.order_by("pk")
+            if not options["all"]:
+                queryset = queryset.filter(sync_digest="")
+            updated = 0
+            last_pk = 0
+            while True:
+                batch = list(queryset.filter(pk__gt=last_pk).only("pk", "sync_digest", *fields)[:batch_size])
+                if not batch:
+                    break
+                changed = []
+                for obj in batch:
+                    digest = obj.get_sync_digest()
+                    if digest != obj.sync_digest:
+                        obj.sync_digest = digest
+                        changed.append(obj)
+                with transaction.atomic():
+                    model._default_manager.bulk_update(changed, ["sync_digest"])
+                updated += len(changed)
+                last_pk = batch[-1].pk
+            self.stdout.write("%s: %d digests updated" % (model._meta.label, updated))
@@ -0,0 +1,29 @@
+import sys
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from read_comics.sync.catalog import CatalogError, export_catalog
+
+
+class Command(BaseCommand):
+    help = "Exports Comicvine catalog tables into tar.gz file with PostgreSQL COPY."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Output file, - for stdout")
+        parser.add_argument("--model", action="append", dest="models", metavar="LABEL",
+                            help="Export only given model, e.g. publishers.Publisher")
+
+    def handle(self, *args, **options):
+        models = [apps.get_model(label) for label in options["models"]] if options["models"] else None
+        to_stdout = options["path"] == "-"
+        output = sys.stdout.buffer if to_stdout else open(options["path"], "wb")
+        try:
+            counts = export_catalog(output, models)
+        except CatalogError as e:
+            raise CommandError(str(e))
+        finally:
+            if not to_stdout:
+                output.close()
+        for label, count in counts.items():
+            self.stderr.write("%s: %d rows" % (label, count))
@@ -0,0 +1,25 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from read_comics.sync.catalog import CatalogError, import_catalog
+
+
+class Command(BaseCommand):
+    help = "Imports Comicvine catalog exported by export_catalog, rebuilding slugs and search index in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Catalog file, - for stdin")
+
+    def handle(self, *args, **options):
+        from_stdin = options["path"] == "-"
+        catalog = sys.stdin.buffer if from_stdin else open(options["path"], "rb")
+        try:
+            counts = import_catalog(catalog)
+        except CatalogError as e:
+            raise CommandError(str(e))
+        finally:
+            if not from_stdin:
+                catalog.close()
+        for label, (inserted, updated) in counts.items():
+            self.stdout.write("%s: %d inserted, %d updated" % (label, inserted, updated))
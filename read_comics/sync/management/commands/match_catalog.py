@@ -0,0 +1,36 @@
+import sys
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from ...matching import match_catalog
+
+
+class Command(BaseCommand):
+    help = "Matches names (one per line) against catalog names and aliases and marks matched rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", nargs="?", help="Names file, stdin by default")
+        parser.add_argument("--model", action="append", dest="models", metavar="LABEL",
+                            help="Match only against given model, e.g. characters.Character")
+        parser.add_argument("--threshold", type=float, default=0.6,
+                            help="Minimal trigram similarity of fuzzy matches")
+
+    def handle(self, *args, **options):
+        models = [apps.get_model(label) for label in options["models"]] if options["models"] else None
+        names_file = open(options["file"], encoding="utf-8") if options["file"] else sys.stdin
+        try:
+            names = (line.strip() for line in names_file)
+            _, report = match_catalog((name for name in names if name), models, options["threshold"])
+        finally:
+            if names_file is not sys.stdin:
+                names_file.close()
+
+        rate = report.matched / report.total if report.total else 0
+        throughput = report.total / report.match_seconds if report.match_seconds else 0
+        self.stdout.write("Index: %d names in %.2fs" % (report.index_size, report.index_seconds))
+        self.stdout.write("Matched: %d of %d (%.1f%%), %.0f names/s" % (
+            report.matched, report.total, rate * 100, throughput
+        ))
+        for label, updated in sorted(report.updated.items()):
+            self.stdout.write("%s: %d rows marked" % (label, updated))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from read_comics.sync.reconcile import ReconcileError, reconcile_resource
+from read_comics.sync.resources import RESOURCES
+
+
+class Command(BaseCommand):
+    help = "Soft deletes catalog rows whose entities are gone from Comicvine."
+
+    def add_arguments(self, parser):
+        parser.add_argument("resources", nargs="*", help="Resources to reconcile: %s" % ", ".join(RESOURCES))
+        parser.add_argument("--dry-run", action="store_true", default=False, help="Only count stale rows")
+        parser.add_argument("--max-ratio", type=float,
+                            help="Maximal share of rows to delete, COMICVINE_TOMBSTONE_MAX_RATIO by default")
+
+    def handle(self, *args, **options):
+        names = options["resources"] or list(RESOURCES)
+        unknown = set(names) - set(RESOURCES)
+        if unknown:
+            raise CommandError("Unknown resources: %s" % ", ".join(sorted(unknown)))
+        for name in names:
+            try:
+                result = reconcile_resource(RESOURCES[name], max_ratio=options["max_ratio"],
+                                            dry_run=options["dry_run"])
+            except ReconcileError as e:
+                raise CommandError(str(e))
+            self.stdout.write("%s: %d upstream, %d local, %d stale, %d deleted" % ((name,) + tuple(result)))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from read_comics.sync.engine import rebuild_resource, sync_resource
+from read_comics.sync.resources import RESOURCES
+from read_comics.sync.staging import RawDocumentStore
+from read_comics.sync.telemetry import recorded_run
+
+
+class Command(BaseCommand):
+    help = "Syncs Comicvine resources. Only entities changed since last sync are fetched unless --full is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument("resources", nargs="*", help="Resources to sync: %s" % ", ".join(RESOURCES))
+        parser.add_argument("--full", action="store_true", default=False, help="Refetch all entities")
+        parser.add_argument("--from-staging", action="store_true", default=False,
+                            help="Rebuild tables from raw documents staged in MongoDB instead of calling API")
+
+    def handle(self, *args, **options):
+        names = options["resources"] or list(RESOURCES)
+        unknown = set(names) - set(RESOURCES)
+        if unknown:
+            raise CommandError("Unknown resources: %s" % ", ".join(sorted(unknown)))
+        store = RawDocumentStore.from_settings()
+        if options["from_staging"] and store is None:
+            raise CommandError("MONGODB_URL is not set")
+        if options["from_staging"]:
+            for name in names:
+                self.write_totals(name, rebuild_resource(RESOURCES[name], store))
+            return
+        with recorded_run(options["full"]) as run:
+            for name in names:
+                self.write_totals(name, sync_resource(RESOURCES[name], full=options["full"], store=store, run=run))
+        for stage in run.stages.all():
+            self.stdout.write(
+                "{s.resource}: {s.rows_per_second:.1f} rows/s, {s.requests} requests, "
+                "API p50 {s.api_p50}s p95 {s.api_p95}s, DB writes {s.db_seconds:.2f}s".format(s=stage)
+            )
+
+    def write_totals(self, name, totals):
+        self.stdout.write("%s: %s" % (name, ", ".join("%s %d" % item for item in totals.items())))
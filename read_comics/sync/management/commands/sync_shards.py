@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from read_comics.sync.models import SyncShard
+from read_comics.sync.tasks import retry_shard
+
+
+class Command(BaseCommand):
+    help = "Shows progress of parallel sync run shards (latest run by default) and retries single shards."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--run", help="Run id")
+        parser.add_argument("--retry", nargs="+", type=int, metavar="SHARD_ID", help="Queue shards for retry")
+
+    def handle(self, *args, **options):
+        if options["retry"]:
+            for shard_id in options["retry"]:
+                if not SyncShard.objects.filter(pk=shard_id).exists():
+                    raise CommandError("Shard %d does not exist" % shard_id)
+                retry_shard.delay(shard_id)
+                self.stdout.write("Shard %d queued for retry" % shard_id)
+            return
+
+        run_id = options["run"]
+        if not run_id:
+            latest = SyncShard.objects.order_by("-created_dt").first()
+            if latest is None:
+                raise CommandError("No sync runs yet")
+            run_id = latest.run_id
+        self.stdout.write("Run %s" % run_id)
+        for shard in SyncShard.objects.filter(run_id=run_id):
+            self.stdout.write(
+                "#{s.pk} {s.resource}[{s.index}] {s.status}: offsets {s.offset}+{s.limit}, "
+                "ids {s.first_comicvine_id}..{s.last_comicvine_id}, fetched {s.fetched}, inserted {s.inserted}, "
+                "updated {s.updated}, unchanged {s.unchanged} {s.error}".format(s=shard)
+            )
@@ -0,0 +1,131 @@
+import re
+import time
+import unicodedata
+from array import array
+from collections import Counter, namedtuple
+
+from utils import logging
+from utils.models import get_comicvine_sync_models
+
+logger = logging.getLogger(__name__)
+
+Match = namedtuple("Match", ["name", "model", "pk", "score"])
+MatchReport = namedtuple("MatchReport", ["total", "matched", "index_size", "index_seconds", "match_seconds",
+                                         "updated"])
+
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(name):
+    """
+    Lowercase ascii words only: "The Amazing Spider-Man!" -> "the amazing spider man"
+    """
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM_RE.sub(" ", name.lower()).strip()
+
+
+def trigrams(normalized):
+    padded = "  %s " % normalized
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    In-memory index of catalog names and aliases: exact lookup by normalized name and
+    fuzzy lookup by trigram similarity. Entries are kept in flat arrays to stay compact
+    on large catalogs.
+    """
+
+    def __init__(self, models=None):
+        self.models = list(models or get_comicvine_sync_models())
+        self.exact = {}
+        self.postings = {}
+        self.entry_model = array("B")
+        self.entry_pk = array("L")
+        self.entry_size = array("H")
+
+    def __len__(self):
+        return len(self.entry_pk)
+
+    def add(self, model_index, pk, name):
+        normalized = normalize_name(name)
+        if not normalized:
+            return
+        entry = len(self.entry_pk)
+        grams = trigrams(normalized)
+        self.entry_model.append(model_index)
+        self.entry_pk.append(pk)
+        self.entry_size.append(min(len(grams), 0xFFFF))
+        self.exact.setdefault(normalized, []).append(entry)
+        for gram in grams:
+            self.postings.setdefault(gram, array("L")).append(entry)
+
+    def build(self):
+        for model_index, model in enumerate(self.models):
+            for pk, name, aliases in model._default_manager.live().values_list("pk", "name", "aliases").iterator():
+                for alias in [name] + (aliases or "").split("\n"):
+                    if alias:
+                        self.add(model_index, pk, alias)
+        return self
+
+    def _match(self, entry, name, score):
+        return Match(name, self.models[self.entry_model[entry]], self.entry_pk[entry], score)
+
+    def match(self, name, threshold=0.6, models=None):
+        """
+        Best matching entries for name: all exact matches or the most similar one with trigram
+        Jaccard similarity not less than ``threshold``
+        """
+        model_indexes = {i for i, m in enumerate(self.models) if models is None or m in models}
+        normalized = normalize_name(name)
+        if not normalized:
+            return []
+        exact = [e for e in self.exact.get(normalized, ()) if self.entry_model[e] in model_indexes]
+        if exact:
+            return [self._match(e, name, 1.0) for e in exact]
+
+        grams = trigrams(normalized)
+        common = Counter()
+        for gram in grams:
+            common.update(self.postings.get(gram, ()))
+        best, best_score = None, threshold
+        for entry, count in common.items():
+            if self.entry_model[entry] not in model_indexes:
+                continue
+            score = count / (len(grams) + self.entry_size[entry] - count)
+            if score >= best_score:
+                best, best_score = entry, score
+        return [self._match(best, name, best_score)] if best is not None else []
+
+
+@logging.logged(logger)
+def match_catalog(names, models=None, threshold=0.6, index=None):
+    """
+    Matches names against catalog names and aliases and sets ``comicvine_matched`` of matched rows
+    with one UPDATE per model. Returns (matches, MatchReport).
+    """
+    started = time.monotonic()
+    index = index or NameIndex(models).build()
+    index_seconds = time.monotonic() - started
+
+    started = time.monotonic()
+    matches = []
+    total = matched = 0
+    for name in names:
+        total += 1
+        name_matches = index.match(name, threshold, models)
+        if name_matches:
+            matched += 1
+            matches += name_matches
+    match_seconds = time.monotonic() - started
+
+    pks = {}
+    for m in matches:
+        pks.setdefault(m.model, set()).add(m.pk)
+    updated = {
+        model._meta.label: model._default_manager.filter(pk__in=model_pks).update(comicvine_matched=True)
+        for model, model_pks in pks.items()
+    }
+    report = MatchReport(total, matched, len(index), index_seconds, match_seconds, updated)
+    logger.info("Matched %d of %d names in %.2fs" % (matched, total, match_seconds))
+    return matches, report
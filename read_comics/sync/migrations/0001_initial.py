@@ -0,0 +1,23 @@
+# Generated by Django 3.0.2 on 2026-10-18 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncWatermark',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=100, unique=True)),
+                ('last_updated', models.DateTimeField(null=True)),
+                ('modified_dt', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.0.2 on 2026-10-18 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncShard',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.UUIDField(db_index=True)),
+                ('resource', models.CharField(max_length=100)),
+                ('index', models.PositiveIntegerField()),
+                ('full', models.BooleanField(default=False)),
+                ('since', models.DateTimeField(null=True)),
+                ('until', models.DateTimeField()),
+                ('offset', models.PositiveIntegerField()),
+                ('limit', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('fetched', models.PositiveIntegerField(default=0)),
+                ('inserted', models.PositiveIntegerField(default=0)),
+                ('updated', models.PositiveIntegerField(default=0)),
+                ('unchanged', models.PositiveIntegerField(default=0)),
+                ('first_comicvine_id', models.IntegerField(null=True)),
+                ('last_comicvine_id', models.IntegerField(null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_dt', models.DateTimeField(auto_now_add=True)),
+                ('started_dt', models.DateTimeField(null=True)),
+                ('finished_dt', models.DateTimeField(null=True)),
+            ],
+            options={
+                'ordering': ('created_dt', 'resource', 'index'),
+                'unique_together': {('run_id', 'resource', 'index')},
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 3.0.2 on 2026-10-18 14:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0002_syncshard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.UUIDField(default=uuid.uuid4, unique=True)),
+                ('full', models.BooleanField(default=False)),
+                ('sharded', models.BooleanField(default=False)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='running', max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('started_dt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_dt', models.DateTimeField(null=True)),
+            ],
+            options={
+                'ordering': ('-started_dt',),
+            },
+        ),
+        migrations.AddField(
+            model_name='syncshard',
+            name='api_latencies',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='syncshard',
+            name='db_seconds',
+            field=models.FloatField(default=0),
+        ),
+        migrations.CreateModel(
+            name='SyncStage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=100)),
+                ('fetched', models.PositiveIntegerField(default=0)),
+                ('inserted', models.PositiveIntegerField(default=0)),
+                ('updated', models.PositiveIntegerField(default=0)),
+                ('unchanged', models.PositiveIntegerField(default=0)),
+                ('seconds', models.FloatField(default=0)),
+                ('rows_per_second', models.FloatField(default=0)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('api_seconds', models.FloatField(default=0)),
+                ('api_p50', models.FloatField(null=True)),
+                ('api_p95', models.FloatField(null=True)),
+                ('api_p99', models.FloatField(null=True)),
+                ('db_seconds', models.FloatField(default=0)),
+                ('started_dt', models.DateTimeField()),
+                ('finished_dt', models.DateTimeField()),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stages', to='sync.SyncRun')),
+            ],
+            options={
+                'ordering': ('started_dt', 'resource'),
+                'unique_together': {('run', 'resource')},
+            },
+        ),
+    ]
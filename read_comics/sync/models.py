@@ -0,0 +1,135 @@
+import uuid
+
+from django.db import models
+from django.utils import timezone
+
+
+class SyncWatermark(models.Model):
+    """
+    Latest upstream ``date_last_updated`` already synced for resource
+    """
+    resource = models.CharField(max_length=100, unique=True)
+    last_updated = models.DateTimeField(null=True)
+
+    modified_dt = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return "[SyncWatermark] %s (%s)" % (self.resource, self.last_updated)
+
+
+class SyncShard(models.Model):
+    """
+    Part of resource sync run: window of upstream listing offsets, synced by one Celery task
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
+    run_id = models.UUIDField(db_index=True)
+    resource = models.CharField(max_length=100)
+    index = models.PositiveIntegerField()
+
+    full = models.BooleanField(default=False)
+    # Incremental shards sync entities updated between since and until
+    since = models.DateTimeField(null=True)
+    until = models.DateTimeField()
+    offset = models.PositiveIntegerField()
+    limit = models.PositiveIntegerField()
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    fetched = models.PositiveIntegerField(default=0)
+    inserted = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    first_comicvine_id = models.IntegerField(null=True)
+    last_comicvine_id = models.IntegerField(null=True)
+    error = models.TextField(blank=True)
+
+    # Raw timings for SyncStage of the run: request latencies in seconds, space separated
+    api_latencies = models.TextField(blank=True)
+    db_seconds = models.FloatField(default=0)
+
+    created_dt = models.DateTimeField(auto_now_add=True)
+    started_dt = models.DateTimeField(null=True)
+    finished_dt = models.DateTimeField(null=True)
+
+    class Meta:
+        unique_together = ("run_id", "resource", "index")
+        ordering = ("created_dt", "resource", "index")
+
+    def __str__(self):
+        return "[SyncShard] %s #%d (%s)" % (self.resource, self.index, self.status)
+
+
+class SyncRun(models.Model):
+    """
+    One sync of Comicvine resources, either sequential or split into shards
+    """
+    class Status(models.TextChoices):
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
+    run_id = models.UUIDField(unique=True, default=uuid.uuid4)
+    full = models.BooleanField(default=False)
+    sharded = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.RUNNING)
+    error = models.TextField(blank=True)
+
+    started_dt = models.DateTimeField(default=timezone.now)
+    finished_dt = models.DateTimeField(null=True)
+
+    class Meta:
+        ordering = ("-started_dt",)
+
+    def __str__(self):
+        return "[SyncRun] %s (%s)" % (self.run_id, self.status)
+
+    @property
+    def seconds(self):
+        if self.finished_dt is None:
+            return None
+        return (self.finished_dt - self.started_dt).total_seconds()
+
+    def finish(self, error=None):
+        self.status = self.Status.FAILED if error else self.Status.DONE
+        if error:
+            self.error = repr(error)
+        self.finished_dt = timezone.now()
+        self.save()
+
+
+class SyncStage(models.Model):
+    """
+    Telemetry of one resource sync within run: counts, throughput, API latency percentiles
+    and time spent writing to database
+    """
+    run = models.ForeignKey(SyncRun, on_delete=models.CASCADE, related_name="stages")
+    resource = models.CharField(max_length=100)
+
+    fetched = models.PositiveIntegerField(default=0)
+    inserted = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+
+    # All timings are in seconds
+    seconds = models.FloatField(default=0)
+    rows_per_second = models.FloatField(default=0)
+    requests = models.PositiveIntegerField(default=0)
+    api_seconds = models.FloatField(default=0)
+    api_p50 = models.FloatField(null=True)
+    api_p95 = models.FloatField(null=True)
+    api_p99 = models.FloatField(null=True)
+    db_seconds = models.FloatField(default=0)
+
+    started_dt = models.DateTimeField()
+    finished_dt = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("run", "resource")
+        ordering = ("started_dt", "resource")
+
+    def __str__(self):
+        return "[SyncStage] %s %s" % (self.resource, self.run.run_id)
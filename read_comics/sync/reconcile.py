@@ -0,0 +1,119 @@
+from array import array
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from utils import logging
+from utils.models import _batches
+from utils.search import remove_from_search_index
+from .comicvine import ComicvineClient
+from .fetcher import AsyncFetcher
+from .staging import RawDocumentStore
+
+logger = logging.getLogger(__name__)
+
+TOMBSTONE_BATCH_SIZE = 5000
+VERIFY_BATCH_SIZE = 100
+
+ReconcileResult = namedtuple("ReconcileResult", ["upstream", "local", "stale", "deleted"])
+
+
+class ReconcileError(Exception):
+    pass
+
+
+def fetch_upstream_ids(resource, client=None):
+    """
+    Sorted array of all upstream ids of resource, 4 bytes per id
+    """
+    ids = array("I")
+    total = 0
+    for page in AsyncFetcher(client or ComicvineClient()).iter_pages(resource.endpoint, sort="id:asc",
+                                                                     field_list=("id",)):
+        ids.extend(data["id"] for data in page.results)
+        total = page.total
+    if len(ids) < total:
+        raise ReconcileError("%s: got %d of %d upstream ids" % (resource, len(ids), total))
+    # Listing may shift while paging, so order is not guaranteed
+    return array("I", sorted(ids))
+
+
+def iter_missing(local_ids, upstream_ids):
+    """
+    Yields ids from sorted ``local_ids`` which are absent in sorted ``upstream_ids``, in one merge pass
+    """
+    upstream = iter(upstream_ids)
+    current = next(upstream, None)
+    for local_id in local_ids:
+        while current is not None and current < local_id:
+            current = next(upstream, None)
+        if current != local_id:
+            yield local_id
+
+
+def verify_missing(resource, comicvine_ids, client=None):
+    """
+    Ids of given ones which upstream doesn't return when asked for them by id. Offset listing misses
+    one live id for every entity deleted ahead of it while paging, so stale candidates are checked again.
+    """
+    client = client or ComicvineClient()
+    missing = array("I")
+    for batch in _batches(comicvine_ids, VERIFY_BATCH_SIZE):
+        page = client.list(resource.endpoint, limit=len(batch), filters={"id": "|".join(map(str, batch))},
+                           field_list=("id",))
+        found = {data["id"] for data in page.results}
+        missing.extend(comicvine_id for comicvine_id in batch if comicvine_id not in found)
+    return missing
+
+
+def tombstone(model, comicvine_ids, deleted_dt=None):
+    """
+    Soft deletes live rows with given comicvine ids and drops their search entries, in batches.
+    Returns count of deleted rows.
+    """
+    deleted_dt = deleted_dt or timezone.now()
+    deleted = 0
+    for batch in _batches(comicvine_ids, TOMBSTONE_BATCH_SIZE):
+        with transaction.atomic():
+            queryset = model._default_manager.live().filter(comicvine_id__in=batch)
+            pks = list(queryset.values_list("pk", flat=True))
+            deleted += model._default_manager.filter(pk__in=pks).update(is_deleted=True, deleted_dt=deleted_dt)
+            remove_from_search_index(model, pks)
+    return deleted
+
+
+@logging.logged(logger)
+def reconcile_resource(resource, client=None, max_ratio=None, dry_run=False, store=None):
+    """
+    Soft deletes resource rows whose entities are gone upstream.
+
+    Refuses to delete more than ``max_ratio`` of live rows (``COMICVINE_TOMBSTONE_MAX_RATIO`` by default),
+    as that more likely means broken upstream listing than mass deletion.
+    Rows created after upstream ids were fetched are kept, rows missing in listing are looked up by id first.
+    Staged documents of deleted rows lose their applied hash, so the rows are restored if the entities return.
+    """
+    max_ratio = settings.COMICVINE_TOMBSTONE_MAX_RATIO if max_ratio is None else max_ratio
+    started_dt = timezone.now()
+    client = client or ComicvineClient()
+    store = store or RawDocumentStore.from_settings()
+    upstream_ids = fetch_upstream_ids(resource, client)
+
+    local = resource.model._default_manager.live().filter(created_dt__lt=started_dt)
+    local_count = local.count()
+    local_ids = local.order_by("comicvine_id").values_list("comicvine_id", flat=True).iterator()
+    stale = verify_missing(resource, iter_missing(local_ids, upstream_ids), client)
+
+    logger.info("%s: %d upstream, %d local, %d stale" % (resource, len(upstream_ids), local_count, len(stale)))
+    if local_count and len(stale) / local_count > max_ratio:
+        raise ReconcileError("%s: %d of %d rows are stale, more than allowed %.1f%%" % (
+            resource, len(stale), local_count, max_ratio * 100
+        ))
+    if dry_run:
+        return ReconcileResult(len(upstream_ids), local_count, len(stale), 0)
+    if store:
+        # Before soft deletion, so interrupted reconciliation can't leave deleted rows marked as applied
+        store.forget_applied(resource, stale)
+    deleted = tombstone(resource.model, stale)
+    return ReconcileResult(len(upstream_ids), local_count, len(stale), deleted)
@@ -0,0 +1,82 @@
+from collections import OrderedDict
+
+from django.apps import apps
+
+
+def parse_date(value):
+    """
+    Comicvine sends dates either as ``YYYY-MM-DD ...`` strings or as ``{"date": "YYYY-MM-DD ..."}``
+    """
+    if isinstance(value, dict):
+        value = value.get("date")
+    if not value:
+        return None
+    return value[:10]
+
+
+class Resource:
+    """
+    Comicvine list endpoint synced into ComicvineSyncModel subclass
+    """
+    api_fields = ("id", "site_detail_url", "name", "aliases", "deck", "description", "image", "date_last_updated")
+
+    def __init__(self, name, model_label, endpoint, depends_on=()):
+        self.name = name
+        self.model_label = model_label
+        self.endpoint = endpoint
+        # Resources which must be synced before this one
+        self.depends_on = tuple(depends_on)
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def to_record(self, data):
+        """
+        Comicvine JSON -> ``ComicvineSyncModel.bulk_sync`` record
+        """
+        image = data.get("image") or {}
+        return {
+            "comicvine_id": data["id"],
+            "comicvine_url": data["site_detail_url"],
+            "name": data.get("name"),
+            "aliases": data.get("aliases"),
+            "short_description": data.get("deck"),
+            "html_description": data.get("description"),
+            "thumb_url": image.get("thumb_url"),
+            "image_url": image.get("original_url"),
+        }
+
+    def __str__(self):
+        return self.name
+
+
+class PersonResource(Resource):
+    api_fields = Resource.api_fields + ("birth", "death", "hometown", "country")
+
+    def to_record(self, data):
+        record = super().to_record(data)
+        record.update({
+            "birth_date": parse_date(data.get("birth")),
+            "death_date": parse_date(data.get("death")),
+            "hometown": data.get("hometown"),
+            "country": data.get("country"),
+        })
+        return record
+
+
+RESOURCES = OrderedDict(
+    (resource.name, resource) for resource in (
+        Resource("publishers", "publishers.Publisher", "publishers"),
+        PersonResource("people", "people.Person", "people"),
+        Resource("characters", "characters.Character", "characters", depends_on=("publishers",)),
+    )
+)
+
+
+def get_dependents(name):
+    return [resource for resource in RESOURCES.values() if name in resource.depends_on]
+
+
+def get_roots():
+    return [resource for resource in RESOURCES.values() if not resource.depends_on]
@@ -0,0 +1,148 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from utils import logging
+from .comicvine import ComicvineClient
+from .engine import incremental_filters, iter_batches, sync_batch
+from .models import SyncRun, SyncShard, SyncWatermark
+from .resources import RESOURCES, get_dependents
+from .staging import RawDocumentStore
+from .telemetry import SyncStats, record_stage
+
+logger = logging.getLogger(__name__)
+
+
+def get_query(shard):
+    """
+    Upstream listing (sort, filters) of shard
+    """
+    if shard.full or shard.since is None:
+        return "id:asc", None
+    return "date_last_updated:asc", incremental_filters(shard.since, shard.until)
+
+
+@logging.logged(logger)
+def plan_resource(run_id, resource, full, until, client=None):
+    """
+    Splits resource sync into shards of ``COMICVINE_SHARD_SIZE`` listing offsets.
+    Returns created shards or empty list if resource is already planned in this run.
+    """
+    if SyncShard.objects.filter(run_id=run_id, resource=resource.name).exists():
+        return []
+    client = client or ComicvineClient()
+    watermark = SyncWatermark.objects.filter(resource=resource.name).values_list("last_updated", flat=True).first()
+    since = None if full else watermark
+    shard = SyncShard(run_id=run_id, resource=resource.name, full=full, since=since, until=until)
+    sort, filters = get_query(shard)
+    total = client.list(resource.endpoint, limit=1, sort=sort, filters=filters, field_list=("id",)).total
+
+    size = settings.COMICVINE_SHARD_SIZE
+    shards = [
+        SyncShard(run_id=run_id, resource=resource.name, index=index, full=full, since=since, until=until,
+                  offset=offset, limit=size)
+        for index, offset in enumerate(range(0, max(total, 1), size))
+    ]
+    with transaction.atomic():
+        # Concurrently finished prerequisites may try to plan the same resource
+        _, created = SyncShard.objects.get_or_create(
+            run_id=run_id, resource=resource.name, index=0,
+            defaults={f.attname: getattr(shards[0], f.attname) for f in SyncShard._meta.concrete_fields
+                      if not f.primary_key}
+        )
+        if not created:
+            return []
+        SyncShard.objects.bulk_create(shards[1:])
+    return list(SyncShard.objects.filter(run_id=run_id, resource=resource.name))
+
+
+@logging.logged(logger)
+def sync_shard(shard, client=None, store=None):
+    """
+    Syncs shard offsets window, saving progress after each written batch
+    """
+    resource = RESOURCES[shard.resource]
+    client = client or ComicvineClient()
+    store = store or RawDocumentStore.from_settings()
+    sort, filters = get_query(shard)
+
+    shard.status = SyncShard.Status.RUNNING
+    shard.started_dt = timezone.now()
+    shard.finished_dt = None
+    shard.fetched = shard.inserted = shard.updated = shard.unchanged = 0
+    shard.first_comicvine_id = shard.last_comicvine_id = None
+    shard.error = ""
+    shard.api_latencies = ""
+    shard.db_seconds = 0
+    shard.save()
+    stats = SyncStats()
+    try:
+        for documents, _ in iter_batches(resource, client, sort, filters, start=shard.offset,
+                                         stop=shard.offset + shard.limit, stats=stats):
+            counts, _ = sync_batch(resource, documents, store, stats)
+            for key, value in counts.items():
+                setattr(shard, key, getattr(shard, key) + value)
+            ids = [document["id"] for document in documents]
+            ids += [i for i in (shard.first_comicvine_id, shard.last_comicvine_id) if i is not None]
+            shard.first_comicvine_id, shard.last_comicvine_id = min(ids), max(ids)
+            shard.api_latencies = stats.dump_latencies()
+            shard.db_seconds = stats.db_seconds
+            shard.save()
+    except Exception as e:
+        shard.status = SyncShard.Status.FAILED
+        shard.error = repr(e)
+        shard.finished_dt = timezone.now()
+        shard.save()
+        SyncRun.objects.filter(run_id=shard.run_id).update(status=SyncRun.Status.FAILED, error=shard.error)
+        raise
+    shard.status = SyncShard.Status.DONE
+    shard.finished_dt = timezone.now()
+    shard.save()
+    return shard
+
+
+def is_resource_done(run_id, resource_name):
+    shards = SyncShard.objects.filter(run_id=run_id, resource=resource_name)
+    return shards.exists() and not shards.exclude(status=SyncShard.Status.DONE).exists()
+
+
+def record_resource_stage(run_id, resource_name):
+    """
+    Records SyncStage of resource from its shards and finishes the run when all resources are done
+    """
+    run = SyncRun.objects.filter(run_id=run_id).first()
+    if run is None:
+        return None
+    shards = list(SyncShard.objects.filter(run_id=run_id, resource=resource_name))
+    counts = {key: sum(getattr(shard, key) for shard in shards)
+              for key in ("fetched", "inserted", "updated", "unchanged")}
+    stats = SyncStats(
+        latencies=[latency for shard in shards for latency in SyncStats.load_latencies(shard.api_latencies)],
+        db_seconds=sum(shard.db_seconds for shard in shards),
+    )
+    stage = record_stage(run, resource_name, counts, stats,
+                         started_dt=min(shard.started_dt for shard in shards),
+                         finished_dt=max(shard.finished_dt for shard in shards))
+    if all(is_resource_done(run_id, name) for name in RESOURCES):
+        run.finish()
+    return stage
+
+
+@logging.logged(logger)
+def finish_resource(run_id, resource_name):
+    """
+    Moves resource watermark and records its telemetry if all its shards are done.
+    Returns dependent resources whose prerequisites are all done, so they may start.
+    """
+    if not is_resource_done(run_id, resource_name):
+        return []
+    until = SyncShard.objects.filter(run_id=run_id, resource=resource_name).values_list("until", flat=True).first()
+    watermark, _ = SyncWatermark.objects.get_or_create(resource=resource_name)
+    if watermark.last_updated is None or watermark.last_updated < until:
+        watermark.last_updated = until
+        watermark.save()
+    record_resource_stage(run_id, resource_name)
+    return [
+        dependent for dependent in get_dependents(resource_name)
+        if all(is_resource_done(run_id, name) for name in dependent.depends_on)
+    ]
@@ -0,0 +1,95 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.utils import timezone
+from pymongo import MongoClient, UpdateOne
+
+STAGING_BATCH_SIZE = 1000
+
+
+def payload_hash(record):
+    """
+    Hash of normalized record, so changes in fields we don't store don't count
+    """
+    return hashlib.sha1(json.dumps(record, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class RawDocumentStore:
+    """
+    Raw Comicvine documents staged in MongoDB, one collection per resource, ``comicvine_id`` as ``_id``.
+
+    Each document keeps hash of its normalized payload (``hash``) and hash of payload last written
+    to Postgres (``applied_hash``). Only documents where they differ need to be written.
+    """
+
+    def __init__(self, database):
+        self.database = database
+
+    @classmethod
+    def from_settings(cls):
+        if not settings.MONGODB_URL:
+            return None
+        return cls(MongoClient(settings.MONGODB_URL)[settings.MONGODB_DATABASE])
+
+    def collection(self, resource):
+        return self.database["comicvine_%s" % resource.name]
+
+    def stage(self, resource, documents):
+        """
+        Stores raw documents and returns those whose normalized payload was not applied yet
+        """
+        collection = self.collection(resource)
+        hashes = {document["id"]: payload_hash(resource.to_record(document)) for document in documents}
+        applied = {
+            d["_id"]: d.get("applied_hash")
+            for d in collection.find({"_id": {"$in": list(hashes)}}, {"applied_hash": True})
+        }
+        now = timezone.now()
+        operations = [
+            UpdateOne(
+                {"_id": document["id"]},
+                {"$set": {"document": document, "hash": hashes[document["id"]], "fetched_dt": now}},
+                upsert=True
+            ) for document in documents
+        ]
+        if operations:
+            collection.bulk_write(operations, ordered=False)
+        return [document for document in documents if applied.get(document["id"]) != hashes[document["id"]]]
+
+    def mark_applied(self, resource, documents):
+        """
+        Marks staged documents as written to Postgres
+        """
+        collection = self.collection(resource)
+        operations = [
+            UpdateOne(
+                {"_id": document["id"]},
+                {"$set": {"applied_hash": payload_hash(resource.to_record(document))}}
+            ) for document in documents
+        ]
+        if operations:
+            collection.bulk_write(operations, ordered=False)
+
+    def forget_applied(self, resource, comicvine_ids):
+        """
+        Drops applied hashes of given documents, so they are written again when staged next time
+        (e.g. after their rows were soft deleted)
+        """
+        ids = [int(comicvine_id) for comicvine_id in comicvine_ids]
+        for start in range(0, len(ids), STAGING_BATCH_SIZE):
+            self.collection(resource).update_many({"_id": {"$in": ids[start:start + STAGING_BATCH_SIZE]}},
+                                                  {"$unset": {"applied_hash": ""}})
+
+    def iter_documents(self, resource, batch_size=STAGING_BATCH_SIZE):
+        """
+        Yields lists of staged raw documents
+        """
+        batch = []
+        for staged in self.collection(resource).find({}, {"document": True}).sort("_id").batch_size(batch_size):
+            batch.append(staged["document"])
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
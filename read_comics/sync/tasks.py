@@ -0,0 +1,82 @@
+import uuid
+
+from celery import chord
+from django.conf import settings
+from django.utils import timezone
+
+from config import celery_app
+from .engine import sync_resource
+from .models import SyncRun, SyncShard
+from .reconcile import reconcile_resource
+from .resources import RESOURCES, get_roots
+from .telemetry import recorded_run
+from . import scheduler
+
+SYNC_TIME_LIMITS = {
+    "time_limit": settings.COMICVINE_SYNC_TIME_LIMIT,
+    "soft_time_limit": settings.COMICVINE_SYNC_TIME_LIMIT - 60,
+}
+
+
+@celery_app.task(**SYNC_TIME_LIMITS)
+def sync(resource_name, full=False):
+    """Syncs one Comicvine resource (e.g. ``publishers``) sequentially."""
+    with recorded_run(full) as run:
+        return sync_resource(RESOURCES[resource_name], full=full, run=run)
+
+
+@celery_app.task(**SYNC_TIME_LIMITS)
+def sync_all(full=False):
+    """Syncs all Comicvine resources sequentially."""
+    with recorded_run(full) as run:
+        return {name: sync_resource(resource, full=full, run=run) for name, resource in RESOURCES.items()}
+
+
+def launch_resource(run_id, resource_name, full, until):
+    """
+    Plans resource shards and runs them in parallel, ``finish_resource`` runs when all of them succeed
+    """
+    shards = scheduler.plan_resource(run_id, RESOURCES[resource_name], full, until)
+    if shards:
+        chord(sync_shard.si(shard.pk) for shard in shards)(finish_resource.si(str(run_id), resource_name))
+
+
+@celery_app.task()
+def start_sync(full=False):
+    """
+    Syncs all Comicvine resources in parallel shards. Resources start as soon as resources they
+    depend on are synced. Nightly job runs it.
+    """
+    run_id = uuid.uuid4()
+    until = timezone.now()
+    SyncRun.objects.create(run_id=run_id, full=full, sharded=True, started_dt=until)
+    for resource in get_roots():
+        launch_resource(run_id, resource.name, full, until)
+    return str(run_id)
+
+
+@celery_app.task(**SYNC_TIME_LIMITS)
+def sync_shard(shard_id):
+    shard = scheduler.sync_shard(SyncShard.objects.get(pk=shard_id))
+    return {"fetched": shard.fetched, "inserted": shard.inserted, "updated": shard.updated,
+            "unchanged": shard.unchanged}
+
+
+@celery_app.task()
+def finish_resource(run_id, resource_name):
+    shard = SyncShard.objects.filter(run_id=run_id, resource=resource_name).first()
+    for dependent in scheduler.finish_resource(run_id, resource_name):
+        launch_resource(run_id, dependent.name, shard.full, shard.until)
+
+
+@celery_app.task(**SYNC_TIME_LIMITS)
+def retry_shard(shard_id):
+    """Resyncs single (failed or stuck) shard and continues the run if it was the last one."""
+    shard = scheduler.sync_shard(SyncShard.objects.get(pk=shard_id))
+    finish_resource(str(shard.run_id), shard.resource)
+
+
+@celery_app.task(**SYNC_TIME_LIMITS)
+def reconcile_all():
+    """Soft deletes catalog rows whose entities were deleted or merged upstream. Weekly job runs it."""
+    return {name: reconcile_resource(resource)._asdict() for name, resource in RESOURCES.items()}
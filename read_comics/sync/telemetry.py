@@ -0,0 +1,84 @@
+import math
+import time
+from contextlib import contextmanager
+
+from django.utils import timezone
+
+from .models import SyncRun, SyncStage
+
+
+def percentile(values, q):
+    """
+    Nearest-rank ``q`` percentile of values, None if there are no values
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(int(math.ceil(q / 100 * len(ordered))) - 1, 0)]
+
+
+class SyncStats:
+    """
+    Timings collected while syncing resource: API request latencies and database write time
+    """
+
+    def __init__(self, latencies=None, db_seconds=0.0):
+        self.latencies = list(latencies or [])
+        self.db_seconds = db_seconds
+
+    @contextmanager
+    def db_write(self):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.db_seconds += time.monotonic() - started
+
+    def dump_latencies(self):
+        return " ".join("%.4f" % latency for latency in self.latencies)
+
+    @classmethod
+    def load_latencies(cls, value):
+        return [float(latency) for latency in value.split()]
+
+
+def record_stage(run, resource_name, counts, stats, started_dt, finished_dt=None):
+    """
+    Creates or replaces SyncStage of resource in run
+    """
+    finished_dt = finished_dt or timezone.now()
+    seconds = (finished_dt - started_dt).total_seconds()
+    stage, _ = SyncStage.objects.update_or_create(
+        run=run, resource=resource_name,
+        defaults={
+            "fetched": counts.get("fetched", 0),
+            "inserted": counts.get("inserted", 0),
+            "updated": counts.get("updated", 0),
+            "unchanged": counts.get("unchanged", 0),
+            "seconds": seconds,
+            "rows_per_second": counts.get("fetched", 0) / seconds if seconds > 0 else 0,
+            "requests": len(stats.latencies),
+            "api_seconds": sum(stats.latencies),
+            "api_p50": percentile(stats.latencies, 50),
+            "api_p95": percentile(stats.latencies, 95),
+            "api_p99": percentile(stats.latencies, 99),
+            "db_seconds": stats.db_seconds,
+            "started_dt": started_dt,
+            "finished_dt": finished_dt,
+        }
+    )
+    return stage
+
+
+@contextmanager
+def recorded_run(full=False):
+    """
+    SyncRun of sequential sync, marked failed if the block raises
+    """
+    run = SyncRun.objects.create(full=full)
+    try:
+        yield run
+    except Exception as e:
+        run.finish(error=e)
+        raise
+    run.finish()
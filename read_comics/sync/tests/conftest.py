@@ -0,0 +1,56 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class StubComicvineHandler(BaseHTTPRequestHandler):
+    """Serves recorded Comicvine responses from ``fixtures/<endpoint>_<offset>.json``"""
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        endpoint = url.path.strip("/")
+        offset = int(parse_qs(url.query).get("offset", ["0"])[0])
+        server.requests.append((endpoint, offset))
+        if server.failures.get((endpoint, offset), 0) > 0:
+            server.failures[(endpoint, offset)] -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        path = os.path.join(FIXTURES_DIR, "%s_%d.json" % (endpoint, offset))
+        if not os.path.exists(path):
+            self.send_response(404)
+            self.end_headers()
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def comicvine_server():
+    """
+    Local stub of Comicvine API. ``failures`` maps (endpoint, offset) to count of 503 responses
+    before success, ``requests`` records served (endpoint, offset).
+    """
+    server = HTTPServer(("127.0.0.1", 0), StubComicvineHandler)
+    server.requests = []
+    server.failures = {}
+    server.url = "http://127.0.0.1:%d/" % server.server_port
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,39 @@
+from read_comics.sync.comicvine import Page
+
+
+def comicvine_publisher(comicvine_id, date_last_updated="2020-01-01 00:00:00", **kwargs):
+    data = {
+        "id": comicvine_id,
+        "site_detail_url": "https://comicvine.gamespot.com/publisher/4010-%d/" % comicvine_id,
+        "name": "Publisher %d" % comicvine_id,
+        "aliases": None,
+        "deck": "Deck",
+        "description": "<p>Description</p>",
+        "image": {
+            "thumb_url": "https://comicvine.gamespot.com/thumb/%d.png" % comicvine_id,
+            "original_url": "https://comicvine.gamespot.com/original/%d.png" % comicvine_id,
+        },
+        "date_last_updated": date_last_updated,
+    }
+    data.update(kwargs)
+    return data
+
+
+class FakeComicvineClient:
+    """Serves given entities as Comicvine list endpoint and records requests"""
+
+    def __init__(self, entities, page_size=2):
+        self.entities = entities
+        self.page_size = page_size
+        self.requests = []
+
+    def list(self, endpoint, offset=0, limit=None, sort=None, filters=None, field_list=None):
+        self.requests.append({"endpoint": endpoint, "offset": offset, "sort": sort, "filters": filters})
+        entities = self.entities
+        if filters and "date_last_updated" in filters:
+            start = filters["date_last_updated"].split("|")[0]
+            entities = [e for e in entities if e["date_last_updated"] >= start]
+        if filters and "id" in filters:
+            ids = {int(comicvine_id) for comicvine_id in filters["id"].split("|")}
+            entities = [e for e in entities if e["id"] in ids]
+        return Page(entities[offset:offset + self.page_size], offset, len(entities))
@@ -0,0 +1,75 @@
+import io
+import tarfile
+
+import pytest
+from django.db import connection, transaction
+from watson import search as watson
+
+from read_comics.publishers.models import Publisher
+from read_comics.sync.catalog import CatalogError, export_catalog, import_catalog
+from read_comics.sync.models import SyncWatermark
+from read_comics.utils.tests.factories import publisher_record
+
+pytestmark = [
+    # Export sets isolation level of its own transaction
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.skipif(connection.vendor != "postgresql", reason="COPY requires PostgreSQL"),
+]
+
+
+def test_export_import_roundtrip():
+    Publisher.bulk_sync([publisher_record(1, name="Marvel"), publisher_record(2, name="Marvel")])
+    SyncWatermark.objects.create(resource="publishers", last_updated="2020-01-01T00:00:00Z")
+    exported = dict(Publisher.objects.values_list("comicvine_id", "sync_digest"))
+    catalog = io.BytesIO()
+
+    assert export_catalog(catalog, [Publisher]) == {"publishers.Publisher": 2}
+
+    Publisher.objects.all().delete()
+    SyncWatermark.objects.all().delete()
+    catalog.seek(0)
+    assert import_catalog(catalog) == {"publishers.Publisher": (2, 0)}
+
+    assert dict(Publisher.objects.values_list("comicvine_id", "sync_digest")) == exported
+    assert sorted(Publisher.objects.values_list("slug", flat=True)) == ["Marvel", "Marvel-2"]
+    assert watson.filter(Publisher, "Marvel").count() == 2
+    assert SyncWatermark.objects.get(resource="publishers").last_updated.year == 2020
+
+
+def test_import_skips_unchanged_rows():
+    Publisher.bulk_sync([publisher_record(1), publisher_record(2)])
+    catalog = io.BytesIO()
+    export_catalog(catalog, [Publisher])
+    Publisher.bulk_sync([publisher_record(2, name="Renamed")])
+
+    catalog.seek(0)
+    assert import_catalog(catalog) == {"publishers.Publisher": (0, 1)}
+    assert Publisher.objects.get(comicvine_id=2).name == "Publisher 2"
+
+
+def test_import_fills_locally_filled_fields():
+    Publisher.bulk_sync([publisher_record(1), publisher_record(2)])
+    catalog = io.BytesIO()
+    export_catalog(catalog, [Publisher])
+    Publisher.objects.filter(comicvine_id=1).delete()
+    Publisher.objects.filter(comicvine_id=2).update(image_width=100, image_height=50, image_placeholder="data:,")
+    Publisher.bulk_sync([publisher_record(2, name="Renamed")])
+
+    catalog.seek(0)
+    assert import_catalog(catalog) == {"publishers.Publisher": (1, 1)}
+
+    values = Publisher.objects.order_by("comicvine_id").values_list("image_width", "image_height", "image_placeholder")
+    assert list(values) == [(None, None, ""), (100, 50, "data:,")]
+
+
+def test_import_rejects_empty_catalog():
+    empty = io.BytesIO()
+    tarfile.open(fileobj=empty, mode="w:gz").close()
+    empty.seek(0)
+    with pytest.raises(CatalogError):
+        import_catalog(empty)
+
+
+def test_export_refuses_to_run_in_transaction():
+    with transaction.atomic(), pytest.raises(CatalogError):
+        export_catalog(io.BytesIO(), [Publisher])
@@ -0,0 +1,19 @@
+import pytest
+from django.core.management import call_command
+
+from read_comics.publishers.models import Publisher
+from read_comics.utils.tests.factories import publisher_record
+
+pytestmark = pytest.mark.django_db
+
+
+def test_backfill_sync_digests():
+    Publisher.bulk_sync([publisher_record(1), publisher_record(2)])
+    expected = dict(Publisher.objects.values_list("pk", "sync_digest"))
+    modified = dict(Publisher.objects.values_list("pk", "modified_dt"))
+    Publisher.objects.update(sync_digest="")
+
+    call_command("backfill_sync_digests")
+
+    assert dict(Publisher.objects.values_list("pk", "sync_digest")) == expected
+    assert dict(Publisher.objects.values_list("pk", "modified_dt")) == modified
@@ -0,0 +1,47 @@
+import pytest
+
+from read_comics.publishers.models import Publisher
+from read_comics.sync.engine import sync_resource
+from read_comics.sync.models import SyncWatermark
+from read_comics.sync.resources import RESOURCES
+from read_comics.sync.tests.factories import FakeComicvineClient, comicvine_publisher
+
+pytestmark = pytest.mark.django_db
+
+
+def test_first_sync_is_full():
+    client = FakeComicvineClient([comicvine_publisher(i) for i in range(1, 6)])
+
+    totals = sync_resource(RESOURCES["publishers"], client=client)
+
+    assert totals == {"fetched": 5, "inserted": 5, "updated": 0, "unchanged": 0}
+    assert Publisher.objects.count() == 5
+    assert sorted(r["offset"] for r in client.requests) == [0, 2, 4]
+    assert client.requests[0]["filters"] is None
+    assert SyncWatermark.objects.get(resource="publishers").last_updated is not None
+
+
+def test_incremental_sync_fetches_only_updated():
+    entities = [comicvine_publisher(i) for i in range(1, 6)]
+    sync_resource(RESOURCES["publishers"], client=FakeComicvineClient(entities))
+    entities[2] = comicvine_publisher(3, date_last_updated="2020-02-01 00:00:00", name="Renamed")
+    client = FakeComicvineClient(entities)
+
+    totals = sync_resource(RESOURCES["publishers"], client=client)
+
+    assert client.requests[0]["filters"] == {"date_last_updated": "2020-01-01 00:00:00|2100-01-01 00:00:00"}
+    assert totals["updated"] == 1
+    assert Publisher.objects.get(comicvine_id=3).name == "Renamed"
+    watermark = SyncWatermark.objects.get(resource="publishers").last_updated
+    assert watermark.strftime("%Y-%m-%d") == "2020-02-01"
+
+
+def test_full_sync_ignores_watermark():
+    entities = [comicvine_publisher(i) for i in range(1, 3)]
+    sync_resource(RESOURCES["publishers"], client=FakeComicvineClient(entities))
+    client = FakeComicvineClient(entities)
+
+    totals = sync_resource(RESOURCES["publishers"], full=True, client=client)
+
+    assert client.requests[0]["filters"] is None
+    assert totals["unchanged"] == 2
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import pytest
+import requests
+from django.core.cache import cache
+
+from read_comics.publishers.models import Publisher
+from read_comics.sync.comicvine import ComicvineClient
+from read_comics.sync.engine import sync_resource
+from read_comics.sync.fetcher import AsyncFetcher, SharedTokenBucket
+from read_comics.sync.resources import RESOURCES
+
+
+def fetcher_for(server, **kwargs):
+    return AsyncFetcher(ComicvineClient(api_url=server.url, api_key="test"), rate=1000, backoff=0.01, **kwargs)
+
+
+def test_pages_in_offset_order(comicvine_server):
+    pages = list(fetcher_for(comicvine_server).iter_pages("publishers"))
+
+    assert [page.offset for page in pages] == [0, 2, 4]
+    assert [p["id"] for page in pages for p in page.results] == [10, 31, 364, 513, 1190]
+
+
+def test_retry_with_backoff(comicvine_server):
+    comicvine_server.failures[("publishers", 2)] = 2
+
+    pages = list(fetcher_for(comicvine_server).iter_pages("publishers"))
+
+    assert len(pages) == 3
+    assert comicvine_server.requests.count(("publishers", 2)) == 3
+
+
+def test_gives_up_after_retries(comicvine_server):
+    comicvine_server.failures[("publishers", 4)] = 5
+
+    with pytest.raises(requests.HTTPError):
+        list(fetcher_for(comicvine_server, retries=2).iter_pages("publishers"))
+
+
+def test_token_bucket_limits_rate():
+    cache.clear()
+    bucket = SharedTokenBucket("test", rate=20, capacity=1)
+
+    async def acquire(times):
+        for _ in range(times):
+            await bucket.acquire()
+
+    started = time.monotonic()
+    asyncio.run(acquire(5))
+
+    assert time.monotonic() - started >= 0.19
+
+
+def test_token_bucket_shared_by_key():
+    cache.clear()
+    buckets = [SharedTokenBucket("test", rate=20, capacity=1) for _ in range(2)]
+
+    async def acquire(bucket, times):
+        for _ in range(times):
+            await bucket.acquire()
+
+    async def acquire_all():
+        await asyncio.gather(*(acquire(bucket, 3) for bucket in buckets))
+
+    started = time.monotonic()
+    asyncio.run(acquire_all())
+
+    # Six tokens at the rate of one bucket, not three per bucket
+    assert time.monotonic() - started >= 0.24
+
+
+@pytest.mark.django_db
+def test_sync_from_stub_server(comicvine_server):
+    client = ComicvineClient(api_url=comicvine_server.url, api_key="test")
+
+    totals = sync_resource(RESOURCES["publishers"], client=client)
+
+    assert totals["inserted"] == 5
+    assert Publisher.objects.get(comicvine_id=513).name == "Dark Horse Comics"
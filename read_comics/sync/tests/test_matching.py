@@ -0,0 +1,69 @@
+import pytest
+from django.core.management import call_command
+
+from read_comics.characters.models import Character
+from read_comics.publishers.models import Publisher
+from read_comics.sync.matching import NameIndex, match_catalog, normalize_name
+from read_comics.utils.tests.factories import publisher_record
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def catalog():
+    Publisher.bulk_sync([
+        publisher_record(1, name="Marvel", aliases="Marvel Comics\nMarvel Entertainment"),
+        publisher_record(2, name="DC Comics", aliases="National Periodical Publications"),
+    ])
+    Character.bulk_sync([
+        publisher_record(10, name="Spider-Man", aliases="Spidey\nPeter Parker"),
+        publisher_record(11, name="Batman", aliases="Bruce Wayne"),
+    ])
+
+
+def test_normalize_name():
+    assert normalize_name("  The Amazing Spider-Man! ") == "the amazing spider man"
+    assert normalize_name("Pokémon") == "pokemon"
+
+
+def test_name_index_exact_and_fuzzy(catalog):
+    index = NameIndex([Publisher, Character]).build()
+    spider_man = Character.objects.get(comicvine_id=10)
+
+    (match,) = index.match("spidey")
+    assert (match.model, match.pk, match.score) == (Character, spider_man.pk, 1.0)
+    (match,) = index.match("Spider Man ")
+    assert match.pk == spider_man.pk
+    (match,) = index.match("Marvel Comic")
+    assert match.model == Publisher and 0.6 <= match.score < 1
+    assert index.match("Superman") == []
+    assert index.match("Batman", models=[Publisher]) == []
+
+
+def test_match_catalog(catalog):
+    matches, report = match_catalog(["Marvel", "Bruce Wayne", "Unknown", "spidey"])
+
+    assert len(matches) == 3
+    assert (report.total, report.matched) == (4, 3)
+    assert report.updated == {"publishers.Publisher": 1, "characters.Character": 2}
+    assert set(Publisher.objects.filter(comicvine_matched=True).values_list("comicvine_id", flat=True)) == {1}
+    assert set(Character.objects.filter(comicvine_matched=True).values_list("comicvine_id", flat=True)) == {10, 11}
+
+
+def test_match_catalog_models(catalog):
+    matches, report = match_catalog(["Marvel", "Batman"], models=[Publisher])
+
+    assert [(m.model, m.name) for m in matches] == [(Publisher, "Marvel")]
+    assert report.index_size == 5
+    assert report.updated == {"publishers.Publisher": 1}
+
+
+def test_match_catalog_command(catalog, tmp_path, capsys):
+    names = tmp_path / "names.txt"
+    names.write_text("Batman\nMarvel\n\n")
+
+    call_command("match_catalog", str(names), "--model", "characters.Character")
+
+    assert "Matched: 1 of 2 (50.0%)" in capsys.readouterr().out
+    assert not Publisher.objects.filter(comicvine_matched=True).exists()
+    assert Character.objects.get(comicvine_id=11).comicvine_matched
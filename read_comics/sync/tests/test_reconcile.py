@@ -0,0 +1,70 @@
+import pytest
+from watson import search as watson
+
+from read_comics.publishers.models import Publisher
+from read_comics.sync.reconcile import ReconcileError, iter_missing, reconcile_resource
+from read_comics.sync.resources import RESOURCES
+from read_comics.sync.tests.factories import FakeComicvineClient, comicvine_publisher
+from read_comics.utils.tests.factories import publisher_record
+
+pytestmark = pytest.mark.django_db
+
+
+def test_iter_missing():
+    assert list(iter_missing([1, 2, 5, 7, 9], [1, 3, 5, 6, 7])) == [2, 9]
+    assert list(iter_missing([1, 2], [])) == [1, 2]
+    assert list(iter_missing([], [1, 2])) == []
+
+
+def test_reconcile_soft_deletes_stale_rows():
+    Publisher.bulk_sync([publisher_record(i) for i in range(1, 6)])
+    client = FakeComicvineClient([comicvine_publisher(i) for i in (1, 2, 4, 5, 6)])
+
+    result = reconcile_resource(RESOURCES["publishers"], client=client, max_ratio=0.5)
+
+    assert result == (5, 5, 1, 1)
+    deleted = Publisher.objects.get(comicvine_id=3)
+    assert deleted.is_deleted and deleted.deleted_dt is not None
+    assert Publisher.objects.live().count() == 4
+    assert not watson.filter(Publisher, "Publisher 3").exists()
+    assert watson.filter(Publisher, "Publisher 4").exists()
+
+
+def test_reconcile_keeps_rows_skipped_by_shifted_listing():
+    Publisher.bulk_sync([publisher_record(i) for i in range(1, 6)])
+    client = FakeComicvineClient([comicvine_publisher(i) for i in (1, 2, 4, 5)])
+    list_page = client.list
+
+    def shifting_list(endpoint, offset=0, **kwargs):
+        # Entity deleted ahead of second page shifts id 4 to first page offsets
+        page = list_page(endpoint, offset, **kwargs)
+        if not kwargs.get("filters") and offset == 2:
+            return page._replace(results=page.results[1:], total=3)
+        return page
+
+    client.list = shifting_list
+
+    result = reconcile_resource(RESOURCES["publishers"], client=client, max_ratio=0.5)
+
+    assert result == (3, 5, 1, 1)
+    assert list(Publisher.objects.filter(is_deleted=True).values_list("comicvine_id", flat=True)) == [3]
+
+
+def test_reconcile_refuses_mass_deletion():
+    Publisher.bulk_sync([publisher_record(i) for i in range(1, 6)])
+    client = FakeComicvineClient([comicvine_publisher(1)])
+
+    with pytest.raises(ReconcileError):
+        reconcile_resource(RESOURCES["publishers"], client=client, max_ratio=0.5)
+    assert Publisher.objects.live().count() == 5
+
+
+def test_resynced_entity_is_restored():
+    Publisher.bulk_sync([publisher_record(1), publisher_record(2)])
+    reconcile_resource(RESOURCES["publishers"], client=FakeComicvineClient([comicvine_publisher(1)]), max_ratio=1)
+
+    result = Publisher.bulk_sync([publisher_record(2)])
+
+    assert result == (0, 1, 0)
+    assert not Publisher.objects.get(comicvine_id=2).is_deleted
+    assert watson.filter(Publisher, "Publisher 2").exists()
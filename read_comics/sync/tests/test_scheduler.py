@@ -0,0 +1,58 @@
+import pytest
+
+from read_comics.characters.models import Character
+from read_comics.people.models import Person
+from read_comics.publishers.models import Publisher
+from read_comics.sync import scheduler
+from read_comics.sync.models import SyncRun, SyncShard, SyncWatermark
+from read_comics.sync.tasks import start_sync
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def sync_settings(settings, comicvine_server):
+    settings.COMICVINE_API_URL = comicvine_server.url
+    settings.COMICVINE_SHARD_SIZE = 2
+    settings.COMICVINE_RETRY_BACKOFF = 0.01
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    return settings
+
+
+def test_start_sync_runs_all_shards(sync_settings, comicvine_server):
+    run_id = start_sync()
+
+    shards = SyncShard.objects.filter(run_id=run_id)
+    assert [(s.resource, s.offset) for s in shards.filter(resource="publishers").order_by("index")] == [
+        ("publishers", 0), ("publishers", 2), ("publishers", 4)
+    ]
+    assert not shards.exclude(status=SyncShard.Status.DONE).exists()
+    assert Publisher.objects.count() == 5
+    assert Person.objects.get(comicvine_id=40439).death_date.year == 2018
+    assert Character.objects.count() == 2
+    assert set(SyncWatermark.objects.values_list("resource", flat=True)) == {"publishers", "people", "characters"}
+
+    run = SyncRun.objects.get(run_id=run_id)
+    assert run.status == SyncRun.Status.DONE
+    stages = {stage.resource: stage for stage in run.stages.all()}
+    assert set(stages) == {"publishers", "people", "characters"}
+    assert (stages["publishers"].fetched, stages["publishers"].requests) == (5, 3)
+
+
+def test_dependents_wait_for_prerequisites(sync_settings, comicvine_server):
+    comicvine_server.failures[("publishers", 2)] = 100
+
+    with pytest.raises(Exception):
+        start_sync()
+
+    failed = SyncShard.objects.get(resource="publishers", index=1)
+    assert failed.status == SyncShard.Status.FAILED
+    assert SyncRun.objects.get(run_id=failed.run_id).status == SyncRun.Status.FAILED
+    assert not SyncShard.objects.filter(resource="characters").exists()
+    assert scheduler.finish_resource(failed.run_id, "publishers") == []
+
+    comicvine_server.failures.clear()
+    for shard in SyncShard.objects.filter(resource="publishers").exclude(status=SyncShard.Status.DONE):
+        scheduler.sync_shard(shard)
+
+    assert [r.name for r in scheduler.finish_resource(failed.run_id, "publishers")] == ["characters"]
@@ -0,0 +1,61 @@
+import mongomock
+import pytest
+
+from read_comics.publishers.models import Publisher
+from read_comics.sync.engine import rebuild_resource, sync_resource
+from read_comics.sync.reconcile import reconcile_resource
+from read_comics.sync.resources import RESOURCES
+from read_comics.sync.staging import RawDocumentStore
+from read_comics.sync.tests.factories import FakeComicvineClient, comicvine_publisher
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def store():
+    return RawDocumentStore(mongomock.MongoClient()["read_comics"])
+
+
+def test_stage_returns_only_changed(store):
+    resource = RESOURCES["publishers"]
+    documents = [comicvine_publisher(1), comicvine_publisher(2)]
+
+    assert store.stage(resource, documents) == documents
+    store.mark_applied(resource, documents)
+    assert store.stage(resource, documents) == []
+    # Fields we don't store don't count as change
+    assert store.stage(resource, [comicvine_publisher(1, api_detail_url="https://example.com")]) == []
+    changed = comicvine_publisher(2, name="Renamed")
+    assert store.stage(resource, [changed]) == [changed]
+
+
+def test_sync_skips_unchanged_documents(store):
+    entities = [comicvine_publisher(i) for i in range(1, 4)]
+    sync_resource(RESOURCES["publishers"], client=FakeComicvineClient(entities), store=store)
+
+    totals = sync_resource(RESOURCES["publishers"], full=True, client=FakeComicvineClient(entities), store=store)
+
+    assert totals == {"fetched": 3, "inserted": 0, "updated": 0, "unchanged": 3}
+
+
+def test_rebuild_from_staging(store):
+    entities = [comicvine_publisher(i) for i in range(1, 4)]
+    sync_resource(RESOURCES["publishers"], client=FakeComicvineClient(entities), store=store)
+    Publisher.objects.all().delete()
+
+    totals = rebuild_resource(RESOURCES["publishers"], store)
+
+    assert totals["inserted"] == 3
+    assert Publisher.objects.count() == 3
+
+
+def test_resynced_entity_is_restored_with_staging(store):
+    entities = [comicvine_publisher(1), comicvine_publisher(2)]
+    sync_resource(RESOURCES["publishers"], client=FakeComicvineClient(entities), store=store)
+    reconcile_resource(RESOURCES["publishers"], client=FakeComicvineClient(entities[:1]), max_ratio=1, store=store)
+    assert Publisher.objects.get(comicvine_id=2).is_deleted
+
+    totals = sync_resource(RESOURCES["publishers"], full=True, client=FakeComicvineClient(entities), store=store)
+
+    assert totals["updated"] == 1
+    assert not Publisher.objects.get(comicvine_id=2).is_deleted
@@ -0,0 +1,42 @@
+import pytest
+
+from read_comics.sync.engine import sync_resource
+from read_comics.sync.models import SyncRun
+from read_comics.sync.resources import RESOURCES
+from read_comics.sync.telemetry import percentile, recorded_run
+from read_comics.sync.tests.factories import FakeComicvineClient, comicvine_publisher
+
+pytestmark = pytest.mark.django_db
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile([5], 99) == 5
+
+
+def test_sequential_run_records_stage():
+    client = FakeComicvineClient([comicvine_publisher(i) for i in range(1, 6)])
+
+    with recorded_run() as run:
+        sync_resource(RESOURCES["publishers"], client=client, run=run)
+
+    run.refresh_from_db()
+    assert run.status == SyncRun.Status.DONE
+    assert run.seconds >= 0
+    stage = run.stages.get()
+    assert (stage.resource, stage.fetched, stage.inserted) == ("publishers", 5, 5)
+    assert stage.requests == 3
+    assert stage.api_p50 is not None and stage.api_p99 >= stage.api_p50
+    assert stage.db_seconds > 0 and stage.rows_per_second > 0
+
+
+def test_failed_run():
+    with pytest.raises(ValueError):
+        with recorded_run(full=True):
+            raise ValueError("boom")
+
+    run = SyncRun.objects.get()
+    assert run.status == SyncRun.Status.FAILED
+    assert "boom" in run.error
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.2 on 2026-10-18 14:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_auto_20200202_0142'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='_user_image_thumbs_ready',
+            field=models.BooleanField(default=True),
+        ),
+    ]
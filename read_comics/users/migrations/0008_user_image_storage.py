@@ -0,0 +1,21 @@
+# Generated by Django 3.0.2 on 2026-10-18 14:59
+
+from django.db import migrations
+import read_comics.images.storage
+import read_comics.users.models
+import utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_user_image_thumbs_ready'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='_user_image',
+            field=utils.fields.ThumbnailImageField(null=True, storage=read_comics.images.storage.ContentAddressedStorage(), upload_to=read_comics.users.models.get_user_image_name),
+        ),
+    ]
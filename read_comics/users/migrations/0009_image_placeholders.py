@@ -0,0 +1,36 @@
+# Generated by Django 3.0.2 on 2026-10-18 15:04
+
+from django.db import migrations, models
+import read_comics.images.storage
+import read_comics.users.models
+import utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_user_image_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='_user_image_height',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='_user_image_placeholder',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='_user_image_width',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='_user_image',
+            field=utils.fields.ThumbnailImageField(height_field='_user_image_height', null=True, storage=read_comics.images.storage.ContentAddressedStorage(), upload_to=read_comics.users.models.get_user_image_name, width_field='_user_image_width'),
+        ),
+    ]
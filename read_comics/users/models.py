@@ -3,6 +3,7 @@ from django.db import models
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 
+from read_comics.images.storage import ContentAddressedStorage
 from utils import logging
 from utils.fields import ThumbnailImageField
 
@@ -26,7 +27,15 @@ class User(AbstractUser):
     name = models.CharField(_("Full name"), blank=True, max_length=255)
     gender = models.CharField(_("Gender"), max_length=1, choices=Gender.choices, default=Gender.UNICORN)
     _user_image = ThumbnailImageField(null=True, upload_to=get_user_image_name,
-                                      thumb_width=40)
+                                      thumb_sizes=((40, None), (80, None)), thumb_formats=("avif", "webp"),
+                                      thumbs_ready_field="_user_image_thumbs_ready",
+                                      placeholder_field="_user_image_placeholder",
+                                      width_field="_user_image_width", height_field="_user_image_height",
+                                      storage=ContentAddressedStorage())
+    _user_image_thumbs_ready = models.BooleanField(default=True)
+    _user_image_width = models.PositiveIntegerField(null=True)
+    _user_image_height = models.PositiveIntegerField(null=True)
+    _user_image_placeholder = models.TextField(blank=True, default="")
     bio = models.CharField(_("Bio"), blank=True, max_length=1000)
     birth_date = models.DateField(_("Birth date"), null=True, blank=True)
     show_email = models.BooleanField(_("Show email in profile"), default=False)
@@ -49,6 +58,25 @@ class User(AbstractUser):
         else:
             return "/static/images/avatars/{0}_thumb.png".format(self.gender)
 
+    @property
+    def image_thumb_srcsets(self):
+        if self._user_image:
+            return self._user_image.srcsets
+        else:
+            return {}
+
+    @property
+    def image_width(self):
+        return self._user_image_width
+
+    @property
+    def image_height(self):
+        return self._user_image_height
+
+    @property
+    def image_placeholder(self):
+        return self._user_image_placeholder
+
     def __str__(self):
         return self.name or self.username.title()
 
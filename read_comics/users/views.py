@@ -12,6 +12,7 @@ import django_magnificent_messages as dmm
 
 from users.forms import UserInfoForm, ChangePasswordForm
 from utils import logging
+from utils.images import ImageTooLargeError
 from utils.view_mixins import BreadcrumbMixin
 
 User = get_user_model()
@@ -156,8 +157,11 @@ class UserChangePhotoView(LoginRequiredMixin, View):
     @logging.logged(logger)
     def post(self, request):
         user = request.user
-        user.user_image = request.FILES['file']
-        user.save()
+        user._user_image = request.FILES['file']
+        try:
+            user.save()
+        except ImageTooLargeError as e:
+            return JsonResponse(data={"error": str(e)}, status=400)
         return JsonResponse(data={"image_url": user.image_url})
 
 
@@ -168,7 +172,7 @@ class UserDeletePhotoView(LoginRequiredMixin, View):
     @logging.logged(logger)
     def post(self, request):
         user = request.user
-        user.user_image = None
+        user._user_image = None
         user.save()
         return JsonResponse(data={"image_url": user.image_url})
 
@@ -1,84 +1,269 @@
+import mimetypes
 from io import BytesIO
 
 from PIL import Image
+from django.conf import settings
 from django.core import checks
-from django.core.files.base import ContentFile
+from django.core.files import File
+from django.db import transaction
+from django.db.models import signals
 from django.db.models.fields.files import ImageField, ImageFieldFile
 
+from utils.images import ImageTooLargeError, encode_image, get_placeholder, open_image, resize_image
+
 __author__ = 'nonameitem'
 
 
-def _add_thumb(s):
+# Pillow format and save options of modern renditions by file extension
+THUMB_FORMATS = {
+    'avif': ('AVIF', {'quality': 60}),
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+}
+
+
+def _add_thumb(s, suffix='thumb', extension='png'):
     parts = s.split('.')
-    parts.insert(-1, 'thumb')
-    parts[-1] = 'png'
+    parts.insert(-1, suffix)
+    parts[-1] = extension
     return '.'.join(parts)
 
 
+def _get_thumb_suffix(index, size):
+    # First size keeps name of the single thumbnail fields used to have
+    if index == 0:
+        return 'thumb'
+    return 'thumb-%sx%s' % (size[0] or '', size[1] or '')
+
+
+def get_supported_formats(extensions):
+    """
+    Extensions of modern formats current Pillow build can write, AVIF needs its plugin
+    """
+    Image.init()
+    return [extension for extension in extensions if THUMB_FORMATS[extension][0] in Image.SAVE]
+
+
+def render_thumbnails(data, sizes, extensions=()):
+    """
+    Encoded thumbnails of image bytes for each (width, height) size, from one decode at reduced scale.
+    Yields (size index, extension, buffer): thumbnail in source format with None extension, then ones in
+    given modern formats.
+    """
+    img = open_image(BytesIO(data), sizes)
+    image_format = img.format
+    img.load()
+    for index, (width, height) in enumerate(sizes):
+        thumb = resize_image(img, width, height)
+        yield index, None, encode_image(thumb, image_format)
+        if extensions and thumb.mode not in ('RGB', 'RGBA'):
+            thumb = thumb.convert('RGBA' if 'transparency' in thumb.info or 'A' in thumb.mode else 'RGB')
+        for extension in extensions:
+            pillow_format, options = THUMB_FORMATS[extension]
+            yield index, extension, encode_image(thumb, pillow_format, **options)
+
+
 class ThumbnailImageFieldFile(ImageFieldFile):
     @property
     def thumb_name(self):
         return _add_thumb(self.name)
 
+    def get_thumb_name(self, index, extension=None):
+        return _add_thumb(self.name, _get_thumb_suffix(index, self.field.thumb_sizes[index]), extension or 'png')
+
+    @property
+    def thumb_names(self):
+        return [self.get_thumb_name(index, extension)
+                for index in range(len(self.field.thumb_sizes))
+                for extension in [None] + self.field.output_formats]
+
+    @property
+    def thumbs_ready(self):
+        ready_field = self.field.thumbs_ready_field
+        return ready_field is None or bool(getattr(self.instance, ready_field))
+
     @property
     def thumb_url(self):
-        return _add_thumb(self.url)
+        return self.get_thumb_url(0)
+
+    def get_thumb_url(self, index, extension=None):
+        """
+        Url of thumbnail of ``index``-th size in source or given modern format, original image url while
+        thumbnails are not rendered yet
+        """
+        if not self.thumbs_ready:
+            return self.url
+        return _add_thumb(self.url, _get_thumb_suffix(index, self.field.thumb_sizes[index]), extension or 'png')
+
+    @property
+    def srcsets(self):
+        """
+        Mime type -> ``srcset`` of thumbnails with declared width, in declared format order with source format
+        last, as ``<picture>`` takes first supported ``<source>``. Empty while thumbnails are not rendered yet.
+        """
+        if not self.thumbs_ready:
+            return {}
+        widths = [(index, width) for index, (width, _) in enumerate(self.field.thumb_sizes) if width]
+        source_type = mimetypes.guess_type(self.name)[0] or 'image/png'
+        srcsets = {}
+        for extension in self.field.output_formats + [None]:
+            mime_type = 'image/%s' % extension if extension else source_type
+            srcsets[mime_type] = ', '.join('%s %dw' % (self.get_thumb_url(index, extension), width)
+                                           for index, width in widths)
+        return srcsets
 
     def save(self, name, content, save=True):
+        # Refuses too large files and images by header, before they are stored or decoded
+        max_bytes = settings.IMAGE_MAX_UPLOAD_BYTES
+        if content.size > max_bytes:
+            raise ImageTooLargeError('Image of %d bytes is larger than %d bytes' % (content.size, max_bytes))
+        content.seek(0)
+        open_image(content)
+        content.seek(0)
+        # Thumbnails task reads stored original back. Upload is marked on instance, as saving replaces
+        # field file object.
+        self.instance.__dict__.setdefault('_pending_thumbnails', set()).add(self.field.attname)
+        if self.field.thumbs_ready_field:
+            setattr(self.instance, self.field.thumbs_ready_field, False)
+        if self.field.placeholder_field:
+            setattr(self.instance, self.field.placeholder_field, '')
+        # Reference counting storage counts every save, even of content this field already references
+        releasing = hasattr(self.storage, 'release') and self.instance.pk is not None
+        if releasing:
+            previous_name = type(self.instance)._default_manager.filter(pk=self.instance.pk).values_list(
+                self.field.attname, flat=True
+            ).first()
         super().save(name, content, save)
-        f = self.open()
-        img = Image.open(f)
-        image_format = img.format
-
-        if self.field.thumb_width and self.field.thumb_height:
-            img.thumbnail((self.field.thumb_width, self.field.thumb_height), Image.ANTIALIAS)
-        elif self.field.thumb_width:
-            new_width = self.field.thumb_width
-            new_height = int(new_width * img.height / img.width)
-            img = img.resize((new_width, new_height), Image.ANTIALIAS)
-        elif self.field.thumb_height:
-            new_height = self.field.thumb_height
-            new_width = int(new_height * img.width / img.height)
-            img = img.resize((new_width, new_height), Image.ANTIALIAS)
-
-        buffer = BytesIO()
-        img.save(buffer, image_format)
-        thumb_file = ContentFile(buffer.getvalue())
-        self.storage.save(self.thumb_name, thumb_file)
+        if releasing and previous_name == self.name:
+            self.storage.release(self.name)
+
+    def save_thumbnails(self, data):
+        for index, extension, thumb in render_thumbnails(data, self.field.thumb_sizes, self.field.output_formats):
+            thumb_name = self.get_thumb_name(index, extension)
+            thumb_storage = self.field.thumb_storage
+            # Stale thumbnail would make storage pick another name
+            if thumb_storage.exists(thumb_name):
+                thumb_storage.delete(thumb_name)
+            thumb_storage.save(thumb_name, File(thumb, thumb_name))
+
+    def get_placeholder(self):
+        """
+        Placeholder ``data:`` URI rendered from stored thumbnail of the first size
+        """
+        with self.field.thumb_storage.open(self.get_thumb_name(0)) as thumb:
+            return get_placeholder(Image.open(thumb))
+
+    def get_ready_values(self):
+        """
+        Values of ready and placeholder model fields once thumbnails are stored
+        """
+        values = {}
+        if self.field.thumbs_ready_field:
+            values[self.field.thumbs_ready_field] = True
+        if self.field.placeholder_field:
+            values[self.field.placeholder_field] = self.get_placeholder()
+        return values
+
+    def thumbs_exist(self):
+        # Thumbnails are written in order, the last one is there only if all are
+        return self.field.thumb_storage.exists(self.thumb_names[-1])
 
     def delete(self, save=True):
-        if self.storage.exists(self.thumb_name):
-            self.storage.delete(self.thumb_name)
+        name, thumb_names = self.name, self.thumb_names
+        if self.field.placeholder_field:
+            setattr(self.instance, self.field.placeholder_field, '')
         super().delete(save)
+        # Content addressed original may be still referenced by other rows, and so are its thumbnails
+        if name and not self.storage.exists(name):
+            for thumb_name in thumb_names:
+                if self.field.thumb_storage.exists(thumb_name):
+                    self.field.thumb_storage.delete(thumb_name)
 
 
 class ThumbnailImageField(ImageField):
+    """
+    ImageField with thumbnails of ``thumb_sizes`` ((width, height) pairs, either may be None), or of
+    single ``thumb_width`` x ``thumb_height`` size. Each thumbnail is written in source format and in every
+    supported one of ``thumb_formats`` (``THUMB_FORMATS`` extensions). Thumbnails are rendered by Celery task
+    after the row is saved, ``thumbs_ready_field`` names boolean model field telling if they are there yet.
+    ``placeholder_field`` names text model field which gets tiny preview ``data:`` URI along with thumbnails,
+    intrinsic size is kept by ImageField ``width_field`` and ``height_field``.
+    """
     attr_class = ThumbnailImageFieldFile
 
-    def __init__(self, thumb_width=None, thumb_height=None, *args, **kwargs):
+    def __init__(self, thumb_width=None, thumb_height=None, *args, thumb_sizes=None, thumb_formats=(),
+                 thumbs_ready_field=None, placeholder_field=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.thumb_width = thumb_width
         self.thumb_height = thumb_height
+        self.thumb_sizes = list(thumb_sizes or [(thumb_width, thumb_height)])
+        self.thumb_formats = tuple(thumb_formats)
+        self.thumbs_ready_field = thumbs_ready_field
+        self.placeholder_field = placeholder_field
+
+    @property
+    def output_formats(self):
+        return get_supported_formats(self.thumb_formats)
+
+    @property
+    def thumb_storage(self):
+        # Thumbnails are named after original, even if storage names originals by content
+        return getattr(self.storage, 'backend', self.storage)
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        if not cls._meta.abstract:
+            signals.post_save.connect(self.schedule_thumbnails, sender=cls)
+
+    def schedule_thumbnails(self, instance, **kwargs):
+        pending = instance.__dict__.get('_pending_thumbnails', set())
+        if self.attname not in pending:
+            return
+        pending.discard(self.attname)
+        file = getattr(instance, self.attname)
+        # Content stored before, with its thumbnails
+        if file.thumbs_exist():
+            values = file.get_ready_values()
+            if values:
+                for attname, value in values.items():
+                    setattr(instance, attname, value)
+                type(instance)._default_manager.filter(pk=instance.pk).update(**values)
+            return
+        from read_comics.utils.tasks import generate_thumbnails
+
+        name = file.name
+        transaction.on_commit(lambda: generate_thumbnails.delay(instance._meta.label, instance.pk, self.name, name))
 
     def check(self, **kwargs):
         return [
             *super().check(**kwargs),
             *self._check_thumb_size_attributes(**kwargs),
+            *self._check_thumb_formats(**kwargs),
         ]
 
-    def _check_thumb_size_attributes(self, **kwargs):
-        if self.thumb_width is None and self.thumb_height is None:
+    def _check_thumb_formats(self, **kwargs):
+        unknown = [extension for extension in self.thumb_formats if extension not in THUMB_FORMATS]
+        if unknown:
             return [
                 checks.Error(
-                    "ThumbnailImageField must define a 'thumb_width' or 'thumb_height' attribute.",
+                    "'thumb_formats' must be of %s." % ", ".join(THUMB_FORMATS),
                     obj=self,
-                    id='comics_db.E001',
+                    id='comics_db.E002',
                 )
             ]
-        else:
-            if self.thumb_width and (
-                    (not isinstance(self.thumb_width, int) or isinstance(self.thumb_width, bool) or
-                     self.thumb_width <= 0)):
+        return []
+
+    def _check_thumb_size_attributes(self, **kwargs):
+        for thumb_width, thumb_height in self.thumb_sizes:
+            if thumb_width is None and thumb_height is None:
+                return [
+                    checks.Error(
+                        "ThumbnailImageField must define a 'thumb_width' or 'thumb_height' attribute.",
+                        obj=self,
+                        id='comics_db.E001',
+                    )
+                ]
+            if thumb_width and (
+                    (not isinstance(thumb_width, int) or isinstance(thumb_width, bool) or thumb_width <= 0)):
                 return [
                     checks.Error(
                         "'thumb_width' must be a positive integer.",
@@ -86,8 +271,8 @@ class ThumbnailImageField(ImageField):
                         id='comics_db.E001',
                     )
                 ]
-            if self.thumb_height and ((not isinstance(self.thumb_height, int) or isinstance(self.thumb_height, bool) or
-                                       self.thumb_height <= 0)):
+            if thumb_height and ((not isinstance(thumb_height, int) or isinstance(thumb_height, bool) or
+                                  thumb_height <= 0)):
                 return [
                     checks.Error(
                         "'thumb_height' must be a positive integer.",
@@ -0,0 +1,64 @@
+from html.parser import HTMLParser
+
+BLOCK_TAGS = frozenset((
+    "address", "article", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption", "figure", "h1", "h2", "h3",
+    "h4", "h5", "h6", "hr", "li", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+))
+SKIP_TAGS = frozenset(("script", "style"))
+# Marks block element boundaries, newlines of source text are plain whitespace
+_BREAK = "\x00"
+
+PLAIN_TEXT_BATCH_SIZE = 1000
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append(_BREAK)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip = max(self.skip - 1, 0)
+        elif tag in BLOCK_TAGS:
+            self.parts.append(_BREAK)
+
+    def handle_data(self, data):
+        if not self.skip:
+            self.parts.append(data.replace(_BREAK, ""))
+
+
+def html_to_text(html):
+    """
+    Visible text of HTML in one parser pass (unlike ``strip_tags``, which reparses until output stops changing).
+    Block elements become line breaks, other whitespace is collapsed.
+    """
+    if not html:
+        return html
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    lines = (" ".join(line.split()) for line in "".join(parser.parts).split(_BREAK))
+    return "\n".join(line for line in lines if line)
+
+
+def fill_plain_descriptions(model, batch_size=PLAIN_TEXT_BATCH_SIZE):
+    """
+    Fills ``plain_description`` from ``html_description`` of all rows, works with historical models too
+    """
+    queryset = model._default_manager.order_by("pk").only("pk", "html_description")
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return
+        for obj in batch:
+            obj.plain_description = html_to_text(obj.html_description)
+        model._default_manager.bulk_update(batch, ["plain_description"])
+        last_pk = batch[-1].pk
@@ -0,0 +1,76 @@
+import base64
+from io import BytesIO
+
+from PIL import Image
+from django.conf import settings
+
+# Resize first shrinks image by integer factor with cheap box filter while it stays this many times
+# larger than target size, then resamples the rest with LANCZOS
+REDUCING_GAP = 3.0
+# Longer side of placeholder previews, browsers upscale them blurred
+PLACEHOLDER_SIZE = 16
+
+
+class ImageTooLargeError(ValueError):
+    pass
+
+
+def get_target_size(width, height, target_width=None, target_height=None):
+    """
+    Size of ``width`` x ``height`` image scaled to target width or height. Fitting into box of both doesn't upscale.
+    """
+    if target_width and target_height:
+        scale = min(target_width / width, target_height / height, 1)
+        return max(round(width * scale), 1), max(round(height * scale), 1)
+    if target_width:
+        return target_width, max(int(target_width * height / width), 1)
+    return max(int(target_height * width / height), 1), target_height
+
+
+def open_image(fileobj, sizes=(), max_pixels=None):
+    """
+    Opens image reading only its header. Images over ``max_pixels`` (``IMAGE_MAX_PIXELS`` by default) are refused
+    before anything is decoded. JPEG is set to decode at the smallest DCT scale still covering all target
+    ``sizes`` ((width, height) pairs, either may be None), so big photos are never decoded at full size.
+    """
+    img = Image.open(fileobj)
+    max_pixels = settings.IMAGE_MAX_PIXELS if max_pixels is None else max_pixels
+    if img.width * img.height > max_pixels:
+        raise ImageTooLargeError("Image of %dx%d pixels is larger than %d pixels" % (img.width, img.height, max_pixels))
+    if sizes and img.format == "JPEG":
+        targets = [get_target_size(img.width, img.height, *size) for size in sizes]
+        img.draft(img.mode, (max(width for width, _ in targets), max(height for _, height in targets)))
+    return img
+
+
+def resize_image(img, width=None, height=None):
+    size = get_target_size(img.width, img.height, width, height)
+    if size == img.size:
+        return img
+    return img.resize(size, Image.LANCZOS, reducing_gap=REDUCING_GAP)
+
+
+def encode_image(img, image_format, **options):
+    """
+    Encodes image into buffer rewound to start, which storage can read without copying it to bytes first
+    """
+    buffer = BytesIO()
+    img.save(buffer, image_format, **options)
+    buffer.seek(0)
+    return buffer
+
+
+def get_placeholder(img):
+    """
+    Tiny preview of image as ``data:`` URI of a couple hundred bytes, which pages inline to fill image box
+    while image loads. WebP if Pillow can write it, JPEG otherwise.
+    """
+    Image.init()
+    if "WEBP" in Image.SAVE:
+        image_format, options = "WEBP", {"quality": 30}
+        mode = "RGBA" if "A" in img.mode or "transparency" in img.info else "RGB"
+    else:
+        image_format, options, mode = "JPEG", {"quality": 40}, "RGB"
+    preview = resize_image(img.convert(mode), PLACEHOLDER_SIZE, PLACEHOLDER_SIZE)
+    buffer = encode_image(preview, image_format, **options)
+    return "data:image/%s;base64,%s" % (image_format.lower(), base64.b64encode(buffer.getvalue()).decode("ascii"))
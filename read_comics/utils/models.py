@@ -1,22 +1,76 @@
-from django.db import models
+import hashlib
+import json
+from collections import namedtuple
+from itertools import islice
+
+from django.apps import apps
+from django.db import connections, models, router, transaction
 from django.utils import timezone
-from model_utils import FieldTracker
+from django_extensions.db.fields import AutoSlugField
 from slugify import slugify
 
+from utils.html import html_to_text
+from utils.search import update_search_index
+from utils.signals import bulk_synced
+
+BULK_SYNC_BATCH_SIZE = 500
+
+BulkSyncResult = namedtuple("BulkSyncResult", ["inserted", "updated", "unchanged"])
+
 
 def slugify_function(content):
     return slugify(content, lowercase=False)
 
 
+def get_comicvine_sync_models():
+    return [model for model in apps.get_models() if issubclass(model, ComicvineSyncModel)]
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class ComicvineSyncQuerySet(models.QuerySet):
+    def live(self):
+        """
+        Rows not removed upstream
+        """
+        return self.filter(is_deleted=False)
+
+
 class ComicvineSyncModel(models.Model):
     comicvine_id = models.IntegerField(unique=True)
     comicvine_url = models.URLField(max_length=1000)
     comicvine_matched = models.BooleanField(default=False)
 
+    # Tombstone of entity deleted or merged upstream
+    is_deleted = models.BooleanField(default=False, db_index=True)
+    deleted_dt = models.DateTimeField(null=True)
+
     created_dt = models.DateTimeField(auto_now_add=True)
     modified_dt = models.DateTimeField(auto_now_add=True)
 
-    tracker = FieldTracker()
+    # Hash of sync fields values, so change detection needs neither loading nor tracking all fields
+    sync_digest = models.CharField(max_length=40, default="", db_index=True)
+
+    SERVICE_FIELDS = ("comicvine_id", "comicvine_matched", "is_deleted", "deleted_dt", "created_dt", "modified_dt",
+                      "sync_digest")
+
+    # Fields computed from sync fields on write: name -> (source field name, function).
+    # They are left out of records and sync digest, as they change only with their source.
+    DERIVED_FIELDS = {
+        "plain_description": ("html_description", html_to_text),
+    }
+
+    # Fields filled locally from other sources than Comicvine, which sync inserts with their defaults only
+    LOCAL_FIELDS = ("image_width", "image_height", "image_placeholder")
+
+    objects = ComicvineSyncQuerySet.as_manager()
 
     class Meta:
         abstract = True
@@ -26,6 +80,194 @@ class ComicvineSyncModel(models.Model):
 
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
         self.pre_save(force_insert, force_update, using, update_fields)
-        if self.tracker.changed():
+        for field in self.get_derived_fields():
+            source, function = self.DERIVED_FIELDS[field.name]
+            setattr(self, field.attname, function(getattr(self, source)))
+        digest = self.get_sync_digest()
+        if digest != self.sync_digest:
+            self.sync_digest = digest
             self.modified_dt = timezone.now()
-        self.save(force_insert, force_update, using, update_fields)
+            if update_fields is not None:
+                update_fields = set(update_fields) | {"sync_digest", "modified_dt"}
+                update_fields |= {f.name for f in self.get_derived_fields()}
+        super().save(force_insert, force_update, using, update_fields)
+
+    def get_sync_digest(self):
+        return self.compute_sync_digest({f.name: getattr(self, f.attname) for f in self.get_sync_fields()})
+
+    @classmethod
+    def get_sync_fields(cls):
+        """
+        Fields filled from Comicvine data. Changes of these fields bump ``modified_dt``.
+        """
+        return [
+            f for f in cls._meta.concrete_fields
+            if not f.primary_key and f.name not in cls.SERVICE_FIELDS and f.name not in cls.DERIVED_FIELDS
+            and f.name not in cls.LOCAL_FIELDS and not isinstance(f, AutoSlugField)
+        ]
+
+    @classmethod
+    def get_derived_fields(cls):
+        return [f for f in cls._meta.concrete_fields if f.name in cls.DERIVED_FIELDS]
+
+    @classmethod
+    def get_locally_filled_fields(cls):
+        return [f for f in cls._meta.concrete_fields if f.name in cls.LOCAL_FIELDS]
+
+    @classmethod
+    def compute_sync_digest(cls, values):
+        """
+        Digest of sync fields ``values`` (dict of field name -> python value)
+        """
+        data = [values.get(f.name) for f in cls.get_sync_fields()]
+        return hashlib.sha1(json.dumps(data, default=str).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def bulk_sync(cls, records, batch_size=BULK_SYNC_BATCH_SIZE, using=None, index=True):
+        """
+        Inserts or updates rows from ``records`` (dicts of field name -> value, ``comicvine_id`` is required)
+        with batched ``INSERT ... ON CONFLICT (comicvine_id) DO UPDATE``.
+
+        Rows are updated (and ``modified_dt`` bumped) only if some of sync fields actually changed.
+        Change detection compares stored ``sync_digest`` only, so unchanged rows are not sent to database at all.
+        Sync fields missing in record are set to field default. Soft deleted rows are restored.
+        With ``index=False`` search entries are left for a following bulk index rebuild.
+
+        Returns ``BulkSyncResult`` with inserted, updated and unchanged rows count.
+        """
+        using = using or router.db_for_write(cls)
+        inserted = updated = unchanged = 0
+        for batch in _batches(records, batch_size):
+            # Last record wins if upstream sent same entity twice
+            rows = {}
+            for record in batch:
+                row = cls._prepare_row(record)
+                rows[row["comicvine_id"]] = row
+            with transaction.atomic(using=using):
+                digests, deleted = {}, set()
+                for comicvine_id, digest, is_deleted in cls._default_manager.using(using).filter(
+                    comicvine_id__in=rows.keys()
+                ).values_list("comicvine_id", "sync_digest", "is_deleted"):
+                    digests[comicvine_id] = digest
+                    if is_deleted:
+                        deleted.add(comicvine_id)
+                changed_rows = [row for comicvine_id, row in rows.items()
+                                if digests.get(comicvine_id) != row["sync_digest"] or comicvine_id in deleted]
+                changed = cls._upsert_rows(changed_rows, digests, using) if changed_rows else {}
+                if index:
+                    update_search_index(cls, changed.values(), using=using)
+            if changed:
+                bulk_synced.send(sender=cls, pks=list(changed.values()))
+            new = len(rows) - len(digests)
+            inserted += new
+            updated += len(changed) - new
+            unchanged += len(rows) - len(changed)
+        return BulkSyncResult(inserted, updated, unchanged)
+
+    @classmethod
+    def _prepare_row(cls, record):
+        """
+        Record -> dict of python values of all sync fields with their digest
+        """
+        sync_fields = cls.get_sync_fields()
+        unknown_fields = set(record) - {f.name for f in sync_fields} - {"comicvine_id"}
+        if unknown_fields:
+            raise ValueError("Unknown fields for %s bulk sync: %s" % (cls.__name__, ", ".join(sorted(unknown_fields))))
+        row = {
+            f.name: f.to_python(record[f.name]) if f.name in record else f.get_default()
+            for f in sync_fields
+        }
+        row["sync_digest"] = cls.compute_sync_digest(row)
+        for field in cls.get_derived_fields():
+            source, function = cls.DERIVED_FIELDS[field.name]
+            row[field.name] = function(row[source])
+        row["comicvine_id"] = record["comicvine_id"]
+        return row
+
+    @classmethod
+    def _get_new_slugs(cls, rows, using):
+        """
+        Slugs for rows that will be inserted. Clashing slugs get ``comicvine_id`` suffix, so uniqueness
+        is ensured with one query per batch instead of query per row.
+        """
+        slug_fields = [f for f in cls._meta.concrete_fields if isinstance(f, AutoSlugField)]
+        slugs = {}
+        for field in slug_fields:
+            populate_from = field._populate_from
+            if not isinstance(populate_from, (list, tuple)):
+                populate_from = (populate_from,)
+            base_slugs = {}
+            for row in rows:
+                content = field.separator.join(str(row.get(name) or "") for name in populate_from)
+                base_slugs[row["comicvine_id"]] = field.slugify_func(content, field.slugify_function)[:field.max_length]
+            taken = set(
+                cls._default_manager.using(using).filter(
+                    **{"%s__in" % field.attname: set(base_slugs.values())}
+                ).values_list(field.attname, flat=True)
+            )
+            field_slugs = {}
+            for comicvine_id, slug in base_slugs.items():
+                if not slug or slug in taken:
+                    suffix = "%s%d" % (field.separator, comicvine_id)
+                    slug = slug[:field.max_length - len(suffix)] + suffix
+                taken.add(slug)
+                field_slugs[comicvine_id] = slug
+            slugs[field] = field_slugs
+        return slugs
+
+    @classmethod
+    def _upsert_rows(cls, rows, existing, using):
+        """
+        Upserts prepared rows and returns dict ``comicvine_id -> pk`` of inserted and changed rows.
+        """
+        connection = connections[using]
+        qn = connection.ops.quote_name
+        meta = cls._meta
+        now = timezone.now()
+
+        sync_fields = cls.get_sync_fields() + cls.get_derived_fields() + [meta.get_field("sync_digest")]
+        slugs = cls._get_new_slugs([r for r in rows if r["comicvine_id"] not in existing], using)
+        service_values = {
+            meta.get_field("comicvine_matched"): False,
+            meta.get_field("is_deleted"): False,
+            meta.get_field("deleted_dt"): None,
+            meta.get_field("created_dt"): now,
+            meta.get_field("modified_dt"): now,
+        }
+        service_values.update((field, field.get_default()) for field in cls.get_locally_filled_fields())
+        insert_fields = [meta.get_field("comicvine_id")] + sync_fields + list(slugs) + list(service_values)
+        # Restores soft deleted rows as well
+        update_fields = sync_fields + [meta.get_field(name) for name in ("modified_dt", "is_deleted", "deleted_dt")]
+
+        params = []
+        for row in rows:
+            comicvine_id = row["comicvine_id"]
+            values = [comicvine_id]
+            values += [row[field.name] for field in sync_fields]
+            # Slugs of existing rows are not updated, so any value will do
+            values += [slugs[field].get(comicvine_id, "") for field in slugs]
+            values += list(service_values.values())
+            params += [f.get_db_prep_save(v, connection) for f, v in zip(insert_fields, values)]
+
+        distinct_from = "IS DISTINCT FROM" if connection.vendor == "postgresql" else "IS NOT"
+        table = qn(meta.db_table)
+        sql = (
+            "INSERT INTO {table} ({columns}) VALUES {values} "
+            "ON CONFLICT ({comicvine_id}) DO UPDATE SET {update} "
+            "WHERE {changed} OR {table}.{is_deleted} "
+            "RETURNING {comicvine_id}, {pk}"
+        ).format(
+            table=table,
+            columns=", ".join(qn(f.column) for f in insert_fields),
+            values=", ".join(["(%s)" % ", ".join(["%s"] * len(insert_fields))] * len(rows)),
+            comicvine_id=qn(meta.get_field("comicvine_id").column),
+            update=", ".join("{0} = EXCLUDED.{0}".format(qn(f.column)) for f in update_fields),
+            changed="{table}.{column} {op} EXCLUDED.{column}".format(
+                table=table, column=qn(meta.get_field("sync_digest").column), op=distinct_from
+            ),
+            is_deleted=qn(meta.get_field("is_deleted").column),
+            pk=qn(meta.pk.column),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return dict(cursor.fetchall())
@@ -0,0 +1,22 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.db import connections
+
+
+def run_chunks(function, chunks, workers=None):
+    """
+    Yields results of ``function(*chunk)`` for every chunk as they complete, in a pool of ``workers``
+    forked processes (CPU count by default, 0 runs chunks in order in current process)
+    """
+    if workers == 0:
+        for chunk in chunks:
+            yield function(*chunk)
+        return
+    # Forked workers inherit configured Django but must open their own database connections
+    connections.close_all()
+    with ProcessPoolExecutor(workers or os.cpu_count(), mp_context=multiprocessing.get_context("fork")) as pool:
+        futures = [pool.submit(function, *chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,59 @@
+from itertools import chain
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from watson import search as watson
+from watson.models import SearchEntry
+
+from utils.signals import search_entries_changed
+
+SEARCH_INDEX_BATCH_SIZE = 500
+
+
+def update_search_index(model, pks, using=None):
+    """
+    Refreshes watson search entries for given rows. Needed after bulk writes, as they don't send post_save.
+    In deferred ``SEARCH_INDEX_MODE`` rows are only queued for indexing by Celery worker.
+    """
+    if settings.SEARCH_INDEX_MODE == "deferred":
+        from read_comics.search.deferred import mark_dirty
+
+        mark_dirty(model, pks, using=using)
+    else:
+        refresh_search_entries(model, pks, using=using)
+
+
+def refresh_search_entries(model, pks, using=None):
+    """
+    Refreshes watson search entries for given rows right away. Rows outside of registered live queryset are skipped.
+    """
+    engine = watson.default_search_engine
+    pks = list(pks)
+    if not pks or not engine.is_registered(model):
+        return
+    queryset = engine.get_adapter(model).get_live_queryset()
+    if queryset is None:
+        queryset = model._default_manager.all()
+    for i in range(0, len(pks), SEARCH_INDEX_BATCH_SIZE):
+        objects = queryset.using(using).filter(pk__in=pks[i:i + SEARCH_INDEX_BATCH_SIZE])
+        watson._bulk_save_search_entries(
+            list(chain.from_iterable(engine._update_obj_index_iter(obj) for obj in objects))
+        )
+    search_entries_changed.send(sender=model, pks=pks)
+
+
+def remove_from_search_index(model, pks, using=None):
+    """
+    Deletes watson search entries of given rows with one query per batch
+    """
+    engine = watson.default_search_engine
+    pks = list(pks)
+    if not pks or not engine.is_registered(model):
+        return
+    content_type = ContentType.objects.db_manager(using).get_for_model(model)
+    for i in range(0, len(pks), SEARCH_INDEX_BATCH_SIZE):
+        SearchEntry.objects.using(using).filter(
+            engine_slug=engine._engine_slug, content_type=content_type,
+            object_id_int__in=pks[i:i + SEARCH_INDEX_BATCH_SIZE]
+        ).delete()
+    search_entries_changed.send(sender=model, pks=pks)
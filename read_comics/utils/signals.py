@@ -0,0 +1,8 @@
+from django.dispatch import Signal
+
+# Sent by ComicvineSyncModel.bulk_sync after a batch changed some rows, with ``pks`` of changed rows
+bulk_synced = Signal()
+
+# Sent after search entries of ``sender`` model rows were written or removed in bulk, with ``pks`` of these
+# rows or None if all entries were rebuilt
+search_entries_changed = Signal()
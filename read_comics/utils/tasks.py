@@ -0,0 +1,22 @@
+from django.apps import apps
+
+from config import celery_app
+
+
+@celery_app.task()
+def generate_thumbnails(model_label, pk, field_name, name):
+    """
+    Renders thumbnails of ThumbnailImageField from its stored original ``name``, marks them ready and stores
+    placeholder.
+    Does nothing if the image was replaced or removed since upload.
+    """
+    model = apps.get_model(model_label)
+    instance = model._default_manager.filter(pk=pk, **{field_name: name}).first()
+    if instance is None:
+        return
+    file = getattr(instance, field_name)
+    with file.storage.open(name) as original:
+        file.save_thumbnails(original.read())
+    values = file.get_ready_values()
+    if values:
+        model._default_manager.filter(pk=pk, **{field_name: name}).update(**values)
@@ -0,0 +1,22 @@
+from io import BytesIO
+
+from PIL import Image
+
+
+def publisher_record(comicvine_id, **kwargs):
+    record = {
+        "comicvine_id": comicvine_id,
+        "comicvine_url": "https://comicvine.gamespot.com/publisher/4010-%d/" % comicvine_id,
+        "name": "Publisher %d" % comicvine_id,
+        "aliases": "",
+        "short_description": "",
+        "html_description": "<p>Publisher</p>",
+    }
+    record.update(kwargs)
+    return record
+
+
+def image_bytes(width=200, height=100, image_format="PNG", color="red"):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, image_format)
+    return buffer.getvalue()
@@ -0,0 +1,76 @@
+import pytest
+from PIL import Image
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+from read_comics.users.tests.factories import UserFactory
+from read_comics.utils.fields import render_thumbnails
+from read_comics.utils.tests.factories import image_bytes
+
+
+def test_render_thumbnails():
+    thumbs = render_thumbnails(image_bytes(), [(40, None), (None, 20), (50, 50)])
+
+    assert [Image.open(thumb).size for _, _, thumb in thumbs] == [(40, 20), (40, 20), (50, 25)]
+
+
+def test_render_thumbnails_formats():
+    thumbs = list(render_thumbnails(image_bytes(image_format="JPEG"), [(40, None), (80, None)], ["webp"]))
+
+    assert [(index, extension, Image.open(thumb).format) for index, extension, thumb in thumbs] == [
+        (0, None, "JPEG"), (0, "webp", "WEBP"), (1, None, "JPEG"), (1, "webp", "WEBP"),
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_thumbnails_rendered_after_commit(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
+    user = UserFactory()
+
+    with transaction.atomic():
+        user._user_image.save("avatar.png", ContentFile(image_bytes()))
+        assert user.image_thumb_url == user.image_url
+        assert user.image_thumb_srcsets == {}
+        assert not user._user_image.storage.exists(user._user_image.thumb_name)
+
+    user.refresh_from_db()
+    image = user._user_image
+    assert user.image_thumb_url.endswith(".thumb.png")
+    assert image.get_thumb_url(1).endswith(".thumb-80x.png")
+    assert [Image.open(image.storage.open(image.get_thumb_name(index))).size for index in (0, 1)] == [
+        (40, 20), (80, 40)
+    ]
+    assert image.storage.exists(image.get_thumb_name(1, "webp"))
+    assert user.image_thumb_srcsets["image/webp"] == "%s 40w, %s 80w" % (
+        image.get_thumb_url(0, "webp"), image.get_thumb_url(1, "webp")
+    )
+    assert list(user.image_thumb_srcsets)[-1] == "image/png"
+    assert (user.image_width, user.image_height) == (200, 100)
+    assert user.image_placeholder.startswith("data:image/")
+
+    thumb_names = image.thumb_names
+    image.delete()
+    assert not any(image.storage.exists(name) for name in thumb_names)
+    user.refresh_from_db()
+    assert (user.image_width, user.image_height, user.image_placeholder) == (None, None, "")
+
+
+@pytest.mark.django_db
+def test_too_large_image_refused(settings):
+    settings.IMAGE_MAX_PIXELS = 100 * 100
+    user = UserFactory()
+
+    with pytest.raises(ValueError, match="larger than 10000 pixels"):
+        user._user_image.save("avatar.png", ContentFile(image_bytes()))
+    assert not user._user_image
+
+
+@pytest.mark.django_db
+def test_too_large_upload_refused(settings):
+    settings.IMAGE_MAX_UPLOAD_BYTES = 100
+    user = UserFactory()
+
+    with pytest.raises(ValueError, match="larger than 100 bytes"):
+        user._user_image.save("avatar.png", ContentFile(image_bytes()))
+    assert not user._user_image
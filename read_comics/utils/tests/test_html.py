@@ -0,0 +1,19 @@
+from read_comics.utils.html import html_to_text
+
+
+def test_html_to_text():
+    html = (
+        "<h2>Origin</h2><p>Peter&nbsp;Parker was bitten by a <b>radioactive</b>\n   spider.</p>"
+        "<script>alert(1)</script><ul><li>One</li><li>Two &amp; three</li></ul>"
+        "<figure><img src='x.png'><figcaption>Cover</figcaption></figure>"
+    )
+
+    assert html_to_text(html) == (
+        "Origin\nPeter Parker was bitten by a radioactive spider.\nOne\nTwo & three\nCover"
+    )
+
+
+def test_html_to_text_empty():
+    assert html_to_text(None) is None
+    assert html_to_text("") == ""
+    assert html_to_text("plain") == "plain"
@@ -0,0 +1,55 @@
+import base64
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from read_comics.utils.images import (
+    ImageTooLargeError, get_placeholder, get_target_size, open_image, resize_image
+)
+
+
+def image_file(width, height, image_format="JPEG"):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), "green").save(buffer, image_format)
+    buffer.seek(0)
+    return buffer
+
+
+def test_get_target_size():
+    assert get_target_size(400, 200, 100) == (100, 50)
+    assert get_target_size(400, 200, None, 50) == (100, 50)
+    assert get_target_size(400, 200, 100, 100) == (100, 50)
+    assert get_target_size(40, 20, 100, 100) == (40, 20)
+
+
+def test_open_image_refuses_before_decoding(settings):
+    settings.IMAGE_MAX_PIXELS = 1000
+
+    with pytest.raises(ImageTooLargeError):
+        open_image(image_file(100, 100))
+
+
+def test_open_image_drafts_jpeg():
+    img = open_image(image_file(2000, 1000), [(100, None), (200, None)])
+    img.load()
+
+    # Smallest DCT scale (1/8) still covering 200x100
+    assert img.size == (250, 125)
+    assert resize_image(img, 200).size == (200, 100)
+
+
+def test_open_image_keeps_other_formats():
+    img = open_image(image_file(2000, 1000, "PNG"), [(100, None)])
+
+    assert img.size == (2000, 1000)
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "P"])
+def test_get_placeholder(mode):
+    placeholder = get_placeholder(Image.new(mode, (400, 200)))
+
+    assert placeholder.startswith("data:image/")
+    assert len(placeholder) < 500
+    data = base64.b64decode(placeholder.split(",", 1)[1])
+    assert Image.open(BytesIO(data)).size == (16, 8)
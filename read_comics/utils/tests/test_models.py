@@ -0,0 +1,69 @@
+import pytest
+
+from read_comics.publishers.models import Publisher
+from read_comics.utils.tests.factories import publisher_record
+
+pytestmark = pytest.mark.django_db
+
+
+class TestBulkSync:
+    def test_insert(self):
+        result = Publisher.bulk_sync([publisher_record(1), publisher_record(2)])
+
+        assert result == (2, 0, 0)
+        assert Publisher.objects.count() == 2
+        assert Publisher.objects.get(comicvine_id=1).slug == "Publisher-1"
+
+    def test_update_only_changed(self):
+        Publisher.bulk_sync([publisher_record(1), publisher_record(2)])
+        modified_dt = Publisher.objects.get(comicvine_id=1).modified_dt
+
+        result = Publisher.bulk_sync([publisher_record(1), publisher_record(2, name="Renamed"), publisher_record(3)])
+
+        assert result == (1, 1, 1)
+        assert Publisher.objects.get(comicvine_id=1).modified_dt == modified_dt
+        assert Publisher.objects.get(comicvine_id=2).name == "Renamed"
+        assert Publisher.objects.get(comicvine_id=2).modified_dt > modified_dt
+
+    def test_keeps_locally_filled_fields(self):
+        Publisher.bulk_sync([publisher_record(1)])
+        Publisher.objects.update(image_width=100, image_height=50, image_placeholder="data:image/webp;base64,")
+
+        Publisher.bulk_sync([publisher_record(1, name="Renamed")])
+
+        publisher = Publisher.objects.get()
+        assert publisher.name == "Renamed"
+        assert (publisher.image_width, publisher.image_height) == (100, 50)
+        assert publisher.image_placeholder == "data:image/webp;base64,"
+
+    def test_clashing_slugs(self):
+        Publisher.bulk_sync([publisher_record(1, name="Marvel"), publisher_record(2, name="Marvel")])
+
+        assert set(Publisher.objects.values_list("slug", flat=True)) == {"Marvel", "Marvel-2"}
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError):
+            Publisher.bulk_sync([publisher_record(1, publisher="Marvel")])
+
+    def test_save_bumps_modified_dt_only_on_change(self):
+        Publisher.bulk_sync([publisher_record(1)])
+        publisher = Publisher.objects.get(comicvine_id=1)
+        modified_dt = publisher.modified_dt
+
+        publisher.save()
+        assert Publisher.objects.get(pk=publisher.pk).modified_dt == modified_dt
+
+        publisher.name = "Renamed"
+        publisher.save()
+        assert Publisher.objects.get(pk=publisher.pk).modified_dt > modified_dt
+        assert Publisher.bulk_sync([publisher_record(1, name="Renamed")]) == (0, 0, 1)
+
+    def test_plain_description_is_derived(self):
+        Publisher.bulk_sync([publisher_record(1, html_description="<p>First</p><p>Second</p>")])
+        publisher = Publisher.objects.get(comicvine_id=1)
+        assert publisher.plain_description == "First\nSecond"
+
+        publisher.html_description = "<p>Changed</p>"
+        publisher.save()
+        assert Publisher.objects.get(pk=publisher.pk).plain_description == "Changed"
+        assert Publisher.bulk_sync([publisher_record(1, html_description="<p>Changed</p>")]) == (0, 0, 1)
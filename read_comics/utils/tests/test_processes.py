@@ -0,0 +1,9 @@
+from read_comics.utils.processes import run_chunks
+
+
+def test_run_chunks_in_current_process():
+    assert list(run_chunks(pow, [(2, 3), (3, 2)], workers=0)) == [8, 9]
+
+
+def test_run_chunks_in_pool():
+    assert sorted(run_chunks(pow, [(2, 3), (3, 2), (2, 2)], workers=2)) == [4, 8, 9]